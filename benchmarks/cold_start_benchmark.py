@@ -0,0 +1,172 @@
+"""
+file_name = cold_start_benchmark.py
+Created On: 2026/10/18
+Lasted Updated: 2026/10/18
+Description: Benchmark of the cold start of the routine manager. Every measurement runs
+    in a fresh interpreter: the time until the routines of the routine list are
+    registered, the import of main, --list, and the import of every routine module,
+    which the routine manager defers until the first run of the routine.
+    Run with: python -m benchmarks.cold_start_benchmark --repeats 10
+Edit Log:
+2026/10/18
+    - Created file
+"""
+
+# STANDARD LIBRARY IMPORTS
+from argparse import ArgumentParser
+from datetime import datetime, timezone
+from json import dumps
+from os.path import abspath, dirname
+from platform import platform, python_version
+from statistics import median
+from subprocess import run
+import sys
+from time import perf_counter, time
+from typing import Dict, List, TypedDict
+
+# THIRD PARTY LIBRARY IMPORTS
+
+# LOCAL LIBRARY IMPORTS
+from src.routines.routine_list import routine_list
+
+REPOSITORY_PATH: str = dirname(dirname(abspath(__file__)))
+
+# Prints the seconds since the wall clock time in argv[1] once the routines are
+# registered, and exits before the scheduled first runs import any routine
+REGISTER_SCRIPT: str = """
+import sys
+from asyncio import run
+from os import _exit
+from time import time
+from main import routine_list
+from src.routine_manager import RoutineManager
+from src.routines.routine_registry import select_routines
+
+async def register():
+    routine_manager = RoutineManager(queued_logging=True)
+    await routine_manager.register_routines(select_routines(routine_list))
+    print(time() - float(sys.argv[1]), flush=True)
+    _exit(0)
+
+run(register())
+"""
+
+# Prints the seconds the import of the routine named in argv[1] takes
+LOAD_ROUTINE_SCRIPT: str = """
+import sys
+from time import perf_counter
+from src.routines.routine_list import routine_list
+from src.routines.routine_registry import load_routine
+
+routine_entry = next(entry for entry in routine_list if entry["name"] == sys.argv[1])
+start = perf_counter()
+load_routine(routine_entry)
+print(perf_counter() - start)
+"""
+
+
+class TimingResult(TypedDict):
+    """The seconds of every repeat of a measurement and their median."""
+
+    median_seconds: float
+    seconds: List[float]
+
+
+def time_process(arguments: List[str]) -> float:
+    """Run a Python process to completion and return its wall clock seconds."""
+    start: float = perf_counter()
+    run(
+        [sys.executable, *arguments],
+        cwd=REPOSITORY_PATH,
+        capture_output=True,
+        check=True,
+    )
+
+    return perf_counter() - start
+
+
+def time_reported(arguments: List[str]) -> float:
+    """Run a Python process that prints the seconds it measured and return them."""
+    result = run(
+        [sys.executable, *arguments],
+        cwd=REPOSITORY_PATH,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def to_timing_result(seconds: List[float]) -> TimingResult:
+    return {"median_seconds": median(seconds), "seconds": seconds}
+
+
+def get_git_commit() -> str | None:
+    """The commit the benchmark runs on, if it runs inside a git checkout."""
+    result = run(
+        ["git", "rev-parse", "HEAD"],
+        cwd=REPOSITORY_PATH,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+
+    return result.stdout.strip() if result.returncode == 0 else None
+
+
+def main() -> None:
+    """Run every measurement the given number of times and write the results as JSON."""
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument("--repeats", type=int, default=10)
+    parser.add_argument("--output", help="The JSON file to write, stdout by default")
+    arguments = parser.parse_args()
+    repeats: range = range(arguments.repeats)
+
+    results: Dict[str, TimingResult] = {
+        "interpreter": to_timing_result(
+            [time_process(["-c", "pass"]) for _ in repeats]
+        ),
+        "import_main": to_timing_result(
+            [time_process(["-c", "import main"]) for _ in repeats]
+        ),
+        "list": to_timing_result(
+            [time_process(["main.py", "--list"]) for _ in repeats]
+        ),
+        # From before the interpreter starts until the routines are registered
+        "register_routines": to_timing_result(
+            [time_reported(["-c", REGISTER_SCRIPT, str(time())]) for _ in repeats]
+        ),
+    }
+    routine_imports: Dict[str, TimingResult] = {
+        routine_entry["name"]: to_timing_result(
+            [
+                time_reported(["-c", LOAD_ROUTINE_SCRIPT, routine_entry["name"]])
+                for _ in repeats
+            ]
+        )
+        for routine_entry in routine_list
+    }
+
+    report: str = dumps(
+        {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "git_commit": get_git_commit(),
+            "python_version": python_version(),
+            "platform": platform(),
+            "arguments": vars(arguments),
+            "results": results,
+            "routine_imports": routine_imports,
+        },
+        indent=2,
+    )
+
+    if arguments.output is None:
+        print(report)
+    else:
+        with open(arguments.output, "w", encoding="UTF-8") as file:
+            file.write(report + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+"""
+file_name = force_graph_benchmark.py
+Created On: 2026/10/18
+Lasted Updated: 2026/10/18
+Description: Benchmark of the force graph pipeline on synthetic vaults. Every stage of
+    a cold build, an unchanged run and an incremental run is timed, with the peak
+    memory of a cold build, and the results are written as JSON to compare runs.
+    Run with: python -m benchmarks.force_graph_benchmark --scales 1000 10000 100000
+Edit Log:
+2026/10/18
+    - Created file
+"""
+
+# STANDARD LIBRARY IMPORTS
+from argparse import ArgumentParser
+from contextlib import redirect_stdout
+from datetime import datetime, timezone
+from io import StringIO
+from json import dumps
+from os import walk
+from os.path import join, relpath
+from platform import platform, python_version
+from resource import RUSAGE_SELF, getrusage
+from subprocess import run
+from tempfile import TemporaryDirectory
+from time import perf_counter
+import tracemalloc
+from typing import Dict, List, TypedDict
+
+# THIRD PARTY LIBRARY IMPORTS
+from asyncio import run as run_async
+
+# LOCAL LIBRARY IMPORTS
+from benchmarks.vault_generator import (
+    DEFAULT_VAULT_SHAPE,
+    VaultShape,
+    VaultSummary,
+    generate_vault,
+    modify_notes,
+)
+from src.routines.force_graph_updater.force_graph import ForceGraph
+from src.routines.force_graph_updater.link_extractor import DEFAULT_PARALLEL_THRESHOLD
+from src.routines.state_store import StateStore
+
+
+class ScenarioResult(TypedDict):
+    """The timings of a single update of the force graph."""
+
+    seconds: float
+    # The seconds of every phase of ForceGraph.update_force_graph_json
+    phases: Dict[str, float]
+
+
+class ScaleResult(TypedDict):
+    """The results of every scenario on a vault of one size."""
+
+    vault: VaultSummary
+    generate_seconds: float
+    scenarios: Dict[str, ScenarioResult]
+    # The peak of the Python heap during a cold build, traced by tracemalloc
+    peak_traced_memory_kib: float
+    # The high-water mark of the resident memory of the benchmark process so far
+    max_rss_kib: int
+
+
+def run_update(force_graph: ForceGraph) -> ScenarioResult:
+    """Run one update of the force graph and return its timings."""
+
+    start: float = perf_counter()
+
+    # The force graph reports its progress with print, keep the output machine-readable
+    with redirect_stdout(StringIO()):
+        run_async(force_graph.update_force_graph_json())
+
+    return {
+        "seconds": perf_counter() - start,
+        "phases": force_graph.last_phase_durations,
+    }
+
+
+def benchmark_scale(
+    shape: VaultShape,
+    modified_ratio: float,
+    extraction_workers: int | None,
+    parallel_threshold: int,
+) -> ScaleResult:
+    """Generate a vault of the given shape and benchmark the force graph on it."""
+
+    with TemporaryDirectory() as directory:
+        vault_path: str = join(directory, "vault")
+        output_path: str = join(directory, "graph")
+
+        start: float = perf_counter()
+        vault_summary: VaultSummary = generate_vault(vault_path, shape)
+        generate_seconds: float = perf_counter() - start
+
+        def create_force_graph(state_name: str) -> ForceGraph:
+            return ForceGraph(
+                output_path,
+                vault_path,
+                extraction_workers,
+                parallel_threshold,
+                state_store=StateStore(join(directory, f"{state_name}.sqlite3")),
+            )
+
+        force_graph: ForceGraph = create_force_graph("state")
+        scenarios: Dict[str, ScenarioResult] = {
+            "cold": run_update(force_graph),
+            "unchanged": run_update(force_graph),
+        }
+
+        note_paths: List[str] = sorted(
+            relpath(join(root, name), vault_path)
+            for root, _, names in walk(vault_path)
+            for name in names
+            if name.endswith(".md")
+        )
+        modify_notes(
+            vault_path,
+            note_paths[: max(1, int(len(note_paths) * modified_ratio))],
+            shape["seed"],
+        )
+        scenarios["incremental"] = run_update(force_graph)
+
+        # Traced separately, tracemalloc slows every allocation down
+        tracemalloc.start()
+        run_update(create_force_graph("traced_state"))
+        _, peak_size = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    return {
+        "vault": vault_summary,
+        "generate_seconds": generate_seconds,
+        "scenarios": scenarios,
+        "peak_traced_memory_kib": peak_size / 1024,
+        "max_rss_kib": getrusage(RUSAGE_SELF).ru_maxrss,
+    }
+
+
+def get_git_commit() -> str | None:
+    """The commit the benchmark runs on, if it runs inside a git checkout."""
+
+    result = run(
+        ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=False
+    )
+
+    return result.stdout.strip() if result.returncode == 0 else None
+
+
+def main() -> None:
+    """Run the benchmark on every scale and write the results as JSON."""
+
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument("--scales", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument(
+        "--links-per-note", type=int, default=DEFAULT_VAULT_SHAPE["links_per_note"]
+    )
+    parser.add_argument(
+        "--attachment-ratio",
+        type=float,
+        default=DEFAULT_VAULT_SHAPE["attachment_ratio"],
+    )
+    parser.add_argument(
+        "--alias-ratio", type=float, default=DEFAULT_VAULT_SHAPE["alias_ratio"]
+    )
+    parser.add_argument(
+        "--heading-link-ratio",
+        type=float,
+        default=DEFAULT_VAULT_SHAPE["heading_link_ratio"],
+    )
+    parser.add_argument(
+        "--folder-depth", type=int, default=DEFAULT_VAULT_SHAPE["folder_depth"]
+    )
+    parser.add_argument("--modified-ratio", type=float, default=0.01)
+    parser.add_argument("--extraction-workers", type=int, default=None)
+    parser.add_argument(
+        "--parallel-threshold", type=int, default=DEFAULT_PARALLEL_THRESHOLD
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="The JSON file to write, stdout by default")
+    arguments = parser.parse_args()
+
+    results: Dict[str, ScaleResult] = {}
+
+    for scale in arguments.scales:
+        shape: VaultShape = {
+            **DEFAULT_VAULT_SHAPE,
+            "notes": scale,
+            "links_per_note": arguments.links_per_note,
+            "attachment_ratio": arguments.attachment_ratio,
+            "alias_ratio": arguments.alias_ratio,
+            "heading_link_ratio": arguments.heading_link_ratio,
+            "folder_depth": arguments.folder_depth,
+            "seed": arguments.seed,
+        }
+        results[str(scale)] = benchmark_scale(
+            shape,
+            arguments.modified_ratio,
+            arguments.extraction_workers,
+            arguments.parallel_threshold,
+        )
+
+    report: str = dumps(
+        {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "git_commit": get_git_commit(),
+            "python_version": python_version(),
+            "platform": platform(),
+            "arguments": vars(arguments),
+            "results": results,
+        },
+        indent=2,
+    )
+
+    if arguments.output is None:
+        print(report)
+    else:
+        with open(arguments.output, "w", encoding="UTF-8") as file:
+            file.write(report + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""
+file_name = link_extractor_benchmark.py
+Created On: 2026/10/18
+Lasted Updated: 2026/10/18
+Description: Micro-benchmark of the compiled whole-file link extractor against the
+    previous per-line, per-character extractor on a synthetic vault.
+    Run with: python -m benchmarks.link_extractor_benchmark --notes 50000
+Edit Log:
+2026/10/18
+    - Created file
+    - Generate the notes with the shared synthetic vault generator
+    - Time a note with a long line of unclosed links
+"""
+
+# STANDARD LIBRARY IMPORTS
+from argparse import ArgumentParser
+from os import walk
+from os.path import join
+from re import findall
+from tempfile import TemporaryDirectory
+from time import perf_counter
+from typing import Callable, List, Set
+
+# THIRD PARTY LIBRARY IMPORTS
+
+# LOCAL LIBRARY IMPORTS
+from benchmarks.vault_generator import DEFAULT_VAULT_SHAPE, generate_vault
+from src.routines.force_graph_updater.link_extractor import extract_note_data
+
+
+def legacy_extract_links(path_to_file: str) -> Set[str]:
+    """The per-line extractor that was used before the compiled pattern."""
+
+    links: Set[str] = set()
+
+    with open(path_to_file, "r", encoding="UTF-8") as md_file:
+        for line in md_file:
+            for match in findall(r"\[\[(.*?)\]\]", line):
+                actual_link: str = ""
+                previous_character: str = ""
+
+                for character in match:
+                    if (
+                        previous_character != "\\"
+                        and character == "#"
+                        or character == "|"
+                    ):
+                        break
+
+                    actual_link += character
+                    previous_character = character
+
+                actual_link = actual_link.strip()
+
+                if actual_link:
+                    links.add(actual_link)
+
+    return links
+
+
+def write_synthetic_notes(
+    directory: str, note_count: int, links_per_note: int
+) -> List[str]:
+    """Write a synthetic vault of note_count notes and return the note paths."""
+
+    generate_vault(
+        directory,
+        {**DEFAULT_VAULT_SHAPE, "notes": note_count, "links_per_note": links_per_note},
+    )
+
+    return [
+        join(root, name)
+        for root, _, names in walk(directory)
+        for name in names
+        if name.endswith(".md")
+    ]
+
+
+def write_unclosed_link_note(directory: str, repeats: int) -> str:
+    """
+    Write a note with a long line of unclosed links, the worst case for a link pattern
+    that backtracks, and return its path.
+    """
+
+    path: str = join(directory, "Unclosed links.md")
+
+    with open(path, "w", encoding="UTF-8") as file:
+        file.write("[[x " * repeats + "\n" + "[[" + "x" * 8 * repeats + "\n[[Closed]]")
+
+    return path
+
+
+def time_extractor(extractor: Callable[[str], object], paths: List[str]) -> float:
+    """Return the seconds it takes to run the extractor over every path."""
+
+    start: float = perf_counter()
+
+    for path in paths:
+        extractor(path)
+
+    return perf_counter() - start
+
+
+def main() -> None:
+    """Run the benchmark and print the timings of both extractors."""
+
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument("--notes", type=int, default=50000)
+    parser.add_argument("--links-per-note", type=int, default=20)
+    parser.add_argument("--unclosed-links", type=int, default=1000)
+    arguments = parser.parse_args()
+
+    with TemporaryDirectory() as directory:
+        paths: List[str] = write_synthetic_notes(
+            directory, arguments.notes, arguments.links_per_note
+        )
+
+        for path in paths[:100]:
+            assert legacy_extract_links(path) == extract_note_data(path)["links"]
+
+        legacy_seconds: float = time_extractor(legacy_extract_links, paths)
+        compiled_seconds: float = time_extractor(extract_note_data, paths)
+
+        unclosed_path: str = write_unclosed_link_note(
+            directory, arguments.unclosed_links
+        )
+        assert legacy_extract_links(unclosed_path) == {"Closed"}
+        assert extract_note_data(unclosed_path)["links"] == {"Closed"}
+
+        legacy_unclosed_seconds: float = time_extractor(
+            legacy_extract_links, [unclosed_path]
+        )
+        compiled_unclosed_seconds: float = time_extractor(
+            extract_note_data, [unclosed_path]
+        )
+
+    print(f"notes: {arguments.notes}, links per note: {arguments.links_per_note}")
+    print(f"legacy per-line extractor: {legacy_seconds:.3f}s")
+    print(f"compiled whole-file extractor: {compiled_seconds:.3f}s")
+    print(f"speedup: {legacy_seconds / compiled_seconds:.2f}x")
+    print(f"unclosed links: {arguments.unclosed_links}")
+    print(f"legacy per-line extractor: {legacy_unclosed_seconds:.3f}s")
+    print(f"compiled whole-file extractor: {compiled_unclosed_seconds:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+"""
+file_name = vault_generator.py
+Created On: 2026/10/18
+Lasted Updated: 2026/10/18
+Description: Generates synthetic Obsidian vaults for benchmarks, with nested folders,
+    attachments, aliases and plain, heading, aliased and embed links.
+    Run with: python -m benchmarks.vault_generator /tmp/vault --notes 10000
+Edit Log:
+2026/10/18
+    - Created file
+"""
+
+# STANDARD LIBRARY IMPORTS
+from argparse import ArgumentParser
+from os import makedirs, utime
+from os.path import join
+from random import Random
+from time import time
+from typing import List, TypedDict
+
+# THIRD PARTY LIBRARY IMPORTS
+
+# LOCAL LIBRARY IMPORTS
+
+WORDS: List[str] = [
+    "lorem",
+    "ipsum",
+    "dolor",
+    "sit",
+    "amet",
+    "vault",
+    "graph",
+    "note",
+    "link",
+    "idea",
+]
+
+
+class VaultShape(TypedDict):
+    """The shape of a synthetic vault."""
+
+    notes: int
+    links_per_note: int
+    # The share of notes with an attachment next to them, and with aliases
+    attachment_ratio: float
+    alias_ratio: float
+    # The share of links that point to a heading of the note
+    heading_link_ratio: float
+    folder_depth: int
+    folders_per_level: int
+    seed: int
+
+
+class VaultSummary(TypedDict):
+    """What was written to a synthetic vault."""
+
+    notes: int
+    attachments: int
+    links: int
+    folders: int
+
+
+DEFAULT_VAULT_SHAPE: VaultShape = {
+    "notes": 1000,
+    "links_per_note": 10,
+    "attachment_ratio": 0.1,
+    "alias_ratio": 0.2,
+    "heading_link_ratio": 0.2,
+    "folder_depth": 3,
+    "folders_per_level": 4,
+    "seed": 0,
+}
+
+
+def note_name(index: int) -> str:
+    """The name of the note with the given index."""
+    return f"Note {index}"
+
+
+def generate_vault(directory: str, shape: VaultShape) -> VaultSummary:
+    """
+    Write a synthetic vault into the directory. The same shape always produces the same
+    vault. Links point to random notes by name, to their aliases, to headings and to
+    attachments, so every lookup of the note resolver is exercised.
+
+    Args:
+        directory: The root directory of the vault, created if it does not exist.
+        shape: The shape of the vault.
+    """
+
+    random = Random(shape["seed"])
+    folders: List[str] = [""]
+    level: List[str] = [""]
+
+    for _ in range(shape["folder_depth"]):
+        level = [
+            join(parent, f"Folder {index}")
+            for parent in level
+            for index in range(shape["folders_per_level"])
+        ]
+        folders += level
+
+    for folder in folders:
+        makedirs(join(directory, folder), exist_ok=True)
+
+    # Ignored by the force graph, but still part of a real vault walk
+    makedirs(join(directory, ".obsidian"), exist_ok=True)
+
+    with open(join(directory, ".obsidian", "app.json"), "w", encoding="UTF-8") as file:
+        file.write("{}")
+
+    has_alias: List[bool] = [
+        random.random() < shape["alias_ratio"] for _ in range(shape["notes"])
+    ]
+    attachment_count: int = 0
+    link_count: int = 0
+
+    for index in range(shape["notes"]):
+        folder: str = random.choice(folders)
+        lines: List[str] = []
+
+        if has_alias[index]:
+            lines += ["---", "aliases:", f"  - Alias {index}", "---"]
+
+        lines.append(f"# {note_name(index)}")
+
+        if random.random() < shape["attachment_ratio"]:
+            attachment_name: str = f"Attachment {index}.png"
+
+            with open(join(directory, folder, attachment_name), "wb") as file:
+                file.write(b"\x89PNG\r\n\x1a\n")
+
+            lines.append(f"![[{attachment_name}]]")
+            attachment_count += 1
+            link_count += 1
+
+        for link_index in range(shape["links_per_note"]):
+            target: int = random.randrange(shape["notes"])
+            link: str = f"Alias {target}" if has_alias[target] else note_name(target)
+
+            if random.random() < shape["heading_link_ratio"]:
+                link = f"{note_name(target)}#Heading {link_index % 5}"
+            elif link_index % 4 == 3:
+                link = f"{link}|shown text"
+
+            prose: str = " ".join(random.choice(WORDS) for _ in range(12))
+            lines.append(f"{prose} [[{link}]] {prose}")
+
+            if link_index % 5 == 0:
+                lines.append(f"## Heading {link_index // 5}")
+
+        link_count += shape["links_per_note"]
+
+        with open(
+            join(directory, folder, f"{note_name(index)}.md"), "w", encoding="UTF-8"
+        ) as file:
+            file.write("\n".join(lines))
+
+    return {
+        "notes": shape["notes"],
+        "attachments": attachment_count,
+        "links": link_count,
+        "folders": len(folders),
+    }
+
+
+def modify_notes(directory: str, paths: List[str], seed: int = 0) -> None:
+    """
+    Append a link to every given note and move its modification time forward, so the
+    change is seen even on filesystems with a coarse mtime resolution.
+
+    Args:
+        directory: The root directory of the vault.
+        paths: The paths of the notes, relative to the vault.
+        seed: The seed of the appended links.
+    """
+
+    random = Random(seed)
+    modified_time: float = time() + 1
+
+    for path in paths:
+        with open(join(directory, path), "a", encoding="UTF-8") as file:
+            file.write(f"\nadded [[{note_name(random.randrange(len(paths)))}]]")
+
+        utime(join(directory, path), (modified_time, modified_time))
+
+
+def main() -> None:
+    """Write a synthetic vault and print its summary."""
+
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument("directory")
+
+    for key, value in DEFAULT_VAULT_SHAPE.items():
+        parser.add_argument(
+            f"--{key.replace('_', '-')}", type=type(value), default=value
+        )
+
+    arguments = parser.parse_args()
+    shape: VaultShape = {
+        key: getattr(arguments, key) for key in DEFAULT_VAULT_SHAPE  # type: ignore
+    }
+
+    print(generate_vault(arguments.directory, shape))
+
+
+if __name__ == "__main__":
+    main()
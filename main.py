@@ -1,14 +1,22 @@
 """
 file_name = main.py
 Created On: 2024/06/26
-Lasted Updated: 2024/06/26
+Lasted Updated: 2026/10/18
 Description: _FILL OUT HERE_
 Edit Log:
 2024/06/26
     - Created file
+2026/10/18
+    - Shut the routine manager and its executors down on exit
+    - Limit the disk-heavy resource group to 2 routines at once
+    - Write the routine logs from the background thread of the routine manager
+    - Serve the routine metrics on localhost for Prometheus
+    - Register the routines of the registry, with --only and --list arguments
 """
 
 # STANDARD LIBRARY IMPORTS
+from argparse import ArgumentParser, Namespace
+from typing import Dict, List
 
 # THIRD PARTY LIBRARY IMPORTS
 from asyncio import run, sleep
@@ -16,17 +24,67 @@ from asyncio import run, sleep
 # LOCAL LIBRARY IMPORTS
 from src.routine_manager import RoutineManager
 from src.routines.routine_list import routine_list
+from src.routines.routine_registry import RoutineEntry, select_routines
 
+# The number of routines of each resource group that run at once
+RESOURCE_GROUP_LIMITS: Dict[str, int] = {"disk-heavy": 2}
+
+# The local port of the Prometheus metrics endpoint, None to not serve the metrics
+METRICS_PORT: int | None = 9464
 
-async def main_task() -> None:
-    """Main task to setup and run the routine manager."""
-    routine_manager: RoutineManager = RoutineManager()
 
-    await routine_manager.register_tasks(tasks=routine_list)
-    await routine_manager.run_tasks()
+async def main_task(routine_entries: List[RoutineEntry]) -> None:
+    """Main task to setup and run the routine manager."""
+    async with RoutineManager(
+        resource_group_limits=RESOURCE_GROUP_LIMITS,
+        queued_logging=True,
+        metrics_port=METRICS_PORT,
+    ) as routine_manager:
+        await routine_manager.register_routines(routine_entries)
+        await routine_manager.run_tasks()
 
     await sleep(1)
 
 
+def parse_arguments() -> Namespace:
+    """Parse the command line arguments."""
+    parser = ArgumentParser(description="Run the routines of the routine list.")
+    parser.add_argument(
+        "--only",
+        nargs="+",
+        metavar="TASK_NAME",
+        help="Only run these routines, disabled routines included",
+    )
+    parser.add_argument(
+        "--list",
+        action="store_true",
+        help="List the routines and whether they are enabled, then exit",
+    )
+
+    return parser.parse_args()
+
+
+def print_routines(routine_entries: List[RoutineEntry]) -> None:
+    """Print every routine of the routine list, without importing any of them."""
+    for routine_entry in routine_entries:
+        status: str = "enabled" if routine_entry.get("enabled", True) else "disabled"
+        print(
+            f"{routine_entry['name']} ({status}): "
+            f"{routine_entry.get('description', routine_entry['entry_point'])}"
+        )
+
+
 if __name__ == "__main__":
-    run(main_task())
+    arguments: Namespace = parse_arguments()
+
+    if arguments.list:
+        print_routines(routine_list)
+    else:
+        try:
+            selected_routines: List[RoutineEntry] = select_routines(
+                routine_list, arguments.only
+            )
+        except ValueError as e:
+            raise SystemExit(str(e)) from e
+
+        run(main_task(selected_routines))
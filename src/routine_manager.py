@@ -1,44 +1,537 @@
 """
-file_name = routine_scheduler.py
+file_name = routine_manager.py
 Created On: 2024/06/26
-Lasted Updated: 2024/06/26
+Lasted Updated: 2026/10/18
 Description: _FILL OUT HERE_
 Edit Log:
 2024/06/26
     - Created file
+2026/10/18
+    - Schedule every routine from a single dispatcher over a min-heap of deadlines
+    - Own the bounded thread and process executors that blocking routines run on
+    - Enforce run timeouts, overlap policies and resource group limits
+    - Own the queued logging that writes the log files of every routine
+    - Record scheduling lag and serve the routine metrics over HTTP
+    - Register routines by registry entry and import them on their first run
+    - Only import the process pool once a process routine needs it
+    - Keep dispatching when the next run of a routine cannot be scheduled
+    - Name this file in the header
 """
 
 # STANDARD LIBRARY IMPORTS
-from typing import Callable, List, TypedDict
+from concurrent.futures import Executor, ThreadPoolExecutor
+from contextlib import nullcontext
+from heapq import heappop, heappush, nsmallest
+from itertools import count
+from logging import Logger, getLogger
+from math import ceil
+from time import monotonic, time
+from typing import AsyncContextManager, Callable, Dict, Iterator, List, Set, Tuple
+from typing import TypedDict
 
 # THIRD PARTY LIBRARY IMPORTS
-from asyncio import create_task, Task, CancelledError, gather
+from asyncio import create_task, Event, Task, CancelledError, gather, wait_for
+from asyncio import current_task, get_running_loop, Semaphore, to_thread
+from asyncio import TimeoutError as AsyncTimeoutError
 
 # LOCAL LIBRARY IMPORTS
+from src.routines.directory_watcher import DirectoryWatcher
+from src.routines.routine_decorator import ExecutionMode, RoutineDecorator, Seconds
+from src.routines.routine_logging import QueuedRoutineLogging
+from src.routines.routine_metrics import (
+    DEFAULT_METRICS_HOST,
+    MetricsServer,
+    get_metrics_registry,
+)
+from src.routines.routine_registry import RoutineEntry, load_routine
+from src.routines.routine_scheduler import RoutineScheduler
+
+# The number of routines of a resource group that run at once, unless configured
+DEFAULT_RESOURCE_GROUP_LIMIT: int = 1
+
+
+class UpcomingRun(TypedDict):
+    """A scheduled run of a routine."""
+
+    task_name: str
+    run_at: float
+
+
+class ScheduledRoutine:
+    """
+    The scheduling state of a single registered routine. A routine registered by its
+    registry entry has no routine function and decorator until it is loaded.
+    """
+
+    __slots__ = (
+        "task_name",
+        "routine_entry",
+        "routine_function",
+        "routine_decorator",
+        "deadline",
+        "sequence",
+        "running_tasks",
+        "rerun_requested",
+    )
+
+    def __init__(
+        self, task_name: str, routine_entry: RoutineEntry | None = None
+    ) -> None:
+        self.task_name = task_name
+        self.routine_entry = routine_entry
+        self.routine_function: Callable | None = None
+        self.routine_decorator: RoutineDecorator | None = None
+        self.deadline: float = 0
+        self.sequence: int = -1
+        self.running_tasks: Set[Task] = set()
+        self.rerun_requested: bool = False
+
+
+# (deadline on the monotonic clock, insertion order, routine)
+HeapEntry = Tuple[float, int, ScheduledRoutine]
 
 
 class RoutineManager:
-    def __init__(self) -> None:
+    """
+    Runs the registered routines. Decorated routines are scheduled by a single
+    dispatcher task over a min-heap of their next deadlines on the monotonic clock.
+    Interval routines run at a fixed rate: the next deadline is derived from the
+    previous deadline, not from when the run finished, so runtime does not add drift.
+    Rescheduling pushes a new heap entry and leaves the old one to be skipped, which
+    keeps every reschedule O(log n).
+
+    Blocking routines run on a bounded thread or process executor shared by every
+    routine. The thread executor is also the event loop default executor, so the
+    to_thread calls of async routines share the same bound.
+
+    A run that is due while the previous run is going follows the overlap policy of
+    the routine, and runs of routines in the same resource group wait on a shared
+    semaphore before they start. The run timeout starts once the semaphore is taken.
+
+    Routines registered by their registry entry are imported on a worker thread when
+    their first run is due, so starting the manager does not wait for any routine
+    module and the modules of routines that are not registered are never imported.
+
+    With queued logging, the loggers of the registered routines only put records on
+    a queue and one background thread of the manager writes every log file, as text
+    or as JSON lines.
+
+    Every run is counted in the metrics registry, and with a metrics port the manager
+    serves them in the Prometheus text format on http://<metrics_host>:<port>/metrics.
+    """
+
+    def __init__(
+        self,
+        max_thread_workers: int | None = None,
+        max_process_workers: int | None = None,
+        resource_group_limits: Dict[str, int] | None = None,
+        queued_logging: bool = False,
+        json_logs: bool = False,
+        metrics_port: int | None = None,
+        metrics_host: str = DEFAULT_METRICS_HOST,
+    ) -> None:
         self.tasks: List[Task] = []
+        self._heap: List[HeapEntry] = []
+        self._sequence: Iterator[int] = count()
+        self._scheduled_routines: Dict[str, ScheduledRoutine] = {}
+        self._wakeup: Event = Event()
+        self._dispatcher_task: Task | None = None
+        self._max_thread_workers = max_thread_workers
+        self._max_process_workers = max_process_workers
+        self._executors: Dict[ExecutionMode, Executor] = {}
+        self._resource_group_limits: Dict[str, int] = resource_group_limits or {}
+        self._resource_groups: Dict[str, Semaphore] = {}
+        self._queued_logging: QueuedRoutineLogging | None = (
+            QueuedRoutineLogging(json_logs) if queued_logging else None
+        )
+        self._metrics_server: MetricsServer | None = (
+            MetricsServer(get_metrics_registry(), metrics_port, metrics_host)
+            if metrics_port is not None
+            else None
+        )
+        self._is_metrics_server_started: bool = False
 
     async def register_tasks(self, tasks: List[Callable]) -> None:
-        """Register the tasks to the task list."""
+        """
+        Register the tasks to the task list. Routines decorated with RoutineDecorator
+        are scheduled to run immediately, other tasks are started as they are.
+        """
+        await self._start()
+
         for task in tasks:
-            created_task = create_task(task())
-            self.tasks.append(created_task)
+            routine_decorator: RoutineDecorator | None = getattr(
+                task, "routine_decorator", None
+            )
+
+            if routine_decorator is None:
+                self.tasks.append(create_task(task()))
+                continue
+
+            scheduled_routine = ScheduledRoutine(routine_decorator.task_name)
+            self._scheduled_routines[routine_decorator.task_name] = scheduled_routine
+            self._set_routine_function(scheduled_routine, task)
+            self._schedule(scheduled_routine, monotonic())
+
+        self._start_dispatcher()
+
+    async def register_routines(self, routine_entries: List[RoutineEntry]) -> None:
+        """
+        Register routines by their registry entries. Every routine is scheduled to run
+        immediately, its module is imported once that run is due.
+
+        Raises:
+            ValueError: If a routine with the same name is already registered.
+        """
+        await self._start()
+
+        for routine_entry in routine_entries:
+            if routine_entry["name"] in self._scheduled_routines:
+                raise ValueError(f"Task name {routine_entry['name']} already exists.")
+
+            scheduled_routine = ScheduledRoutine(routine_entry["name"], routine_entry)
+            self._scheduled_routines[routine_entry["name"]] = scheduled_routine
+            self._schedule(scheduled_routine, monotonic())
+
+        self._start_dispatcher()
 
     async def run_tasks(self):
         """Run all the tasks in the task list."""
 
         await gather(*self.tasks)
 
+    def trigger(self, task_name: str) -> None:
+        """Run a registered routine as soon as possible."""
+        scheduled_routine: ScheduledRoutine = self._scheduled_routines[task_name]
+        routine_decorator: RoutineDecorator | None = scheduled_routine.routine_decorator
+
+        # A routine that is being loaded runs as soon as it is loaded
+        if routine_decorator is None and scheduled_routine.running_tasks:
+            return
+
+        if (
+            routine_decorator is not None
+            and scheduled_routine.running_tasks
+            and routine_decorator.overlap_policy != "allow"
+        ):
+            scheduled_routine.rerun_requested = True
+            return
+
+        self._schedule(scheduled_routine, monotonic())
+
+    def upcoming_runs(self, limit: int = 10) -> List[UpcomingRun]:
+        """Get the next scheduled runs, soonest first, as wall clock timestamps."""
+        offset: float = time() - monotonic()
+
+        return [
+            {
+                "task_name": scheduled_routine.task_name,
+                "run_at": deadline + offset,
+            }
+            for deadline, _, scheduled_routine in nsmallest(
+                limit,
+                (entry for entry in self._heap if self._is_current(entry)),
+            )
+        ]
+
+    async def __aenter__(self) -> "RoutineManager":
+        return self
+
     async def __aexit__(self, exc_type, exc, tb):
         """Cancel all the tasks if the context manager is exited."""
-        for task in self.tasks:
-            self._cancel_task(task)
-            await task
+        await self.shutdown()
+
+    async def shutdown(self) -> None:
+        """
+        Cancel the dispatcher, the watchers and every running routine, then shut the
+        executors down. Queued executor work is cancelled, work that already started
+        in a thread or process cannot be interrupted and is waited for.
+        """
+        running_tasks: List[Task] = [
+            running_task
+            for scheduled_routine in self._scheduled_routines.values()
+            for running_task in scheduled_routine.running_tasks
+        ]
+
+        for task in self.tasks + running_tasks:
+            await self._cancel_task(task)
+
+        if self._metrics_server is not None:
+            await self._metrics_server.close()
+
+        process_executor: Executor | None = self._executors.pop("process", None)
+
+        if process_executor is not None:
+            await to_thread(process_executor.shutdown, wait=True, cancel_futures=True)
+
+        # The thread executor is the default executor, it cannot join its own threads
+        thread_executor: Executor | None = self._executors.pop("thread", None)
+
+        if thread_executor is not None:
+            thread_executor.shutdown(wait=False, cancel_futures=True)
+            await get_running_loop().shutdown_default_executor()
+
+        # Stopped last so the routines that were still finishing are logged, the
+        # default executor is gone so this briefly blocks while the queue drains
+        if self._queued_logging is not None:
+            self._queued_logging.stop()
 
     # PRIVATE METHODS START HERE
+    async def _start(self) -> None:
+        """Set up what every registered routine shares, on the first registration."""
+        # Set up the shared thread executor as the default executor before anything
+        # calls to_thread
+        self._get_executor("thread")
+
+        if self._metrics_server is not None and not self._is_metrics_server_started:
+            await self._metrics_server.start()
+            self._is_metrics_server_started = True
+
+    def _start_dispatcher(self) -> None:
+        """Start the dispatcher once there is a routine to schedule."""
+        if self._dispatcher_task is None and self._scheduled_routines:
+            self._dispatcher_task = create_task(self._dispatch())
+            self.tasks.append(self._dispatcher_task)
+
+    def _set_routine_function(
+        self, scheduled_routine: ScheduledRoutine, routine_function: Callable
+    ) -> None:
+        """Set the decorated function of a routine up to run and be watched."""
+        routine_decorator: RoutineDecorator = getattr(
+            routine_function, "routine_decorator"
+        )
+        scheduled_routine.routine_function = routine_function
+        scheduled_routine.routine_decorator = routine_decorator
+
+        if self._queued_logging is not None:
+            self._queued_logging.start()
+            routine_decorator.use_log_handler(self._queued_logging.handler)
+
+        if "watch" in routine_decorator.routine_metadata:
+            self.tasks.append(create_task(self._watch_routine(scheduled_routine)))
+
+    async def _load_routine(self, scheduled_routine: ScheduledRoutine) -> None:
+        """
+        Import a routine registered by its registry entry on a worker thread and run it
+        once it is loaded. A routine that fails to load is logged and not scheduled
+        again.
+        """
+        routine_entry: RoutineEntry | None = scheduled_routine.routine_entry
+        assert routine_entry is not None
+
+        try:
+            routine_function: Callable = await to_thread(load_routine, routine_entry)
+        except Exception:  # pylint: disable=broad-exception-caught
+            logger: Logger = getLogger(routine_entry["name"])
+
+            # The routine has no decorator to set its logger up, log to its file anyway
+            if self._queued_logging is not None and not logger.handlers:
+                self._queued_logging.start()
+                logger.addHandler(self._queued_logging.handler)
+
+            logger.exception(
+                "Failed to load the routine from %s", routine_entry["entry_point"]
+            )
+            return
+        finally:
+            scheduled_routine.running_tasks.discard(current_task())  # type: ignore[arg-type]
+
+        self._set_routine_function(scheduled_routine, routine_function)
+        self._schedule(scheduled_routine, monotonic())
+
+    def _schedule(self, scheduled_routine: ScheduledRoutine, deadline: float) -> None:
+        """Set the next deadline of a routine, waking the dispatcher if it is sooner."""
+        scheduled_routine.deadline = deadline
+        scheduled_routine.sequence = next(self._sequence)
+        heappush(self._heap, (deadline, scheduled_routine.sequence, scheduled_routine))
+
+        if self._heap[0][2] is scheduled_routine:
+            self._wakeup.set()
+
+    @staticmethod
+    def _is_current(entry: HeapEntry) -> bool:
+        """Whether a heap entry is the latest deadline of its routine."""
+        return entry[1] == entry[2].sequence
+
+    def _next_deadline(self, scheduled_routine: ScheduledRoutine, now: float) -> float:
+        """Get the deadline after the one that is being dispatched."""
+        routine_decorator: RoutineDecorator | None = scheduled_routine.routine_decorator
+        assert routine_decorator is not None
+        interval: int | RoutineScheduler = routine_decorator.routine_metadata[
+            "interval"
+        ]
+
+        if isinstance(interval, RoutineScheduler) or interval <= 0:
+            return now + routine_decorator.get_seconds_to_run()
+
+        next_deadline: float = scheduled_routine.deadline + interval
+
+        # Skip the runs that were missed instead of running them back to back
+        if next_deadline <= now:
+            next_deadline += ceil((now - next_deadline) / interval) * interval
+
+        return next_deadline
+
+    async def _dispatch(self) -> None:
+        """Start every routine whose deadline passed, sleeping until the next one."""
+        while True:
+            while self._heap and not self._is_current(self._heap[0]):
+                heappop(self._heap)
+
+            if not self._heap:
+                await self._wakeup.wait()
+                self._wakeup.clear()
+                continue
+
+            delay: float = self._heap[0][0] - monotonic()
+
+            if delay > 0:
+                try:
+                    await wait_for(self._wakeup.wait(), delay)
+                except AsyncTimeoutError:
+                    pass
+
+                self._wakeup.clear()
+                continue
+
+            deadline, _, scheduled_routine = heappop(self._heap)
+            now: float = monotonic()
+            routine_decorator: RoutineDecorator | None = (
+                scheduled_routine.routine_decorator
+            )
+
+            # The routine is scheduled again by its own metadata once it is loaded
+            if routine_decorator is None:
+                if not scheduled_routine.running_tasks:
+                    scheduled_routine.running_tasks.add(
+                        create_task(self._load_routine(scheduled_routine))
+                    )
+
+                continue
+
+            get_metrics_registry().record_schedule_lag(
+                routine_decorator.task_name, now - deadline
+            )
+
+            if (
+                not scheduled_routine.running_tasks
+                or routine_decorator.overlap_policy == "allow"
+            ):
+                scheduled_routine.running_tasks.add(
+                    create_task(self._run_routine(scheduled_routine))
+                )
+            elif routine_decorator.overlap_policy == "queue":
+                routine_decorator.logger.info(
+                    "Previous run is still going, queueing this run"
+                )
+                scheduled_routine.rerun_requested = True
+            else:
+                routine_decorator.logger.warning(
+                    "Previous run is still going, skipping this run"
+                )
+
+            # A routine that cannot be scheduled stops, the dispatcher keeps going
+            try:
+                next_deadline: float = self._next_deadline(scheduled_routine, now)
+            except Exception:  # pylint: disable=broad-exception-caught
+                routine_decorator.logger.exception(
+                    "Failed to schedule the next run, the routine will not run again"
+                )
+                continue
+
+            self._schedule(scheduled_routine, next_deadline)
+
+    async def _run_routine(self, scheduled_routine: ScheduledRoutine) -> None:
+        """
+        Run a routine once within its resource group and timeout, a failed run is
+        logged and does not stop the schedule.
+        """
+        routine_decorator: RoutineDecorator | None = scheduled_routine.routine_decorator
+        routine_function: Callable | None = scheduled_routine.routine_function
+        assert routine_decorator is not None and routine_function is not None
+        timeout: Seconds | None = routine_decorator.routine_metadata.get("timeout")
+
+        try:
+            async with self._get_resource_group(
+                routine_decorator.routine_metadata.get("resource_group")
+            ):
+                await wait_for(
+                    routine_function(
+                        self._get_executor(routine_decorator.execution_mode)
+                    ),
+                    timeout,
+                )
+        except AsyncTimeoutError:
+            routine_decorator.logger.error(
+                "Routine timed out after %s seconds", timeout
+            )
+        except CancelledError:
+            raise
+        except Exception:  # pylint: disable=broad-exception-caught
+            routine_decorator.logger.exception("Routine failed")
+        finally:
+            scheduled_routine.running_tasks.discard(current_task())  # type: ignore[arg-type]
+
+        if scheduled_routine.rerun_requested and not scheduled_routine.running_tasks:
+            scheduled_routine.rerun_requested = False
+            self._schedule(scheduled_routine, monotonic())
+
+    def _get_executor(self, execution_mode: ExecutionMode) -> Executor | None:
+        """Get the executor of an execution mode, creating it on first use."""
+        if execution_mode == "async":
+            return None
+
+        if execution_mode not in self._executors:
+            if execution_mode == "thread":
+                thread_executor = ThreadPoolExecutor(
+                    self._max_thread_workers, thread_name_prefix="routine"
+                )
+                get_running_loop().set_default_executor(thread_executor)
+                self._executors[execution_mode] = thread_executor
+            else:
+                # Imported here, the process pool pulls in multiprocessing, which most
+                # runs of the manager do not need
+                from concurrent.futures import (  # pylint: disable=import-outside-toplevel
+                    ProcessPoolExecutor,
+                )
+
+                self._executors[execution_mode] = ProcessPoolExecutor(
+                    self._max_process_workers
+                )
+
+        return self._executors[execution_mode]
+
+    def _get_resource_group(
+        self, resource_group: str | None
+    ) -> AsyncContextManager[object]:
+        """Get the semaphore of a resource group, creating it on first use."""
+        if resource_group is None:
+            return nullcontext()
+
+        if resource_group not in self._resource_groups:
+            self._resource_groups[resource_group] = Semaphore(
+                self._resource_group_limits.get(
+                    resource_group, DEFAULT_RESOURCE_GROUP_LIMIT
+                )
+            )
+
+        return self._resource_groups[resource_group]
+
+    async def _watch_routine(self, scheduled_routine: ScheduledRoutine) -> None:
+        """Trigger a routine every time one of its watched directories changes."""
+        routine_decorator: RoutineDecorator | None = scheduled_routine.routine_decorator
+        assert routine_decorator is not None
+        watcher: DirectoryWatcher | None = routine_decorator.start_watcher()
+
+        if watcher is None:
+            return
+
+        try:
+            while True:
+                if await routine_decorator.wait_for_watched_changes(watcher):
+                    self.trigger(routine_decorator.task_name)
+        finally:
+            watcher.close()
+
     async def _cancel_task(self, task: Task) -> bool:
         """Cancel the task if it's not done yet."""
         if not task.done():
@@ -0,0 +1,246 @@
+"""
+file_name = directory_watcher.py
+Created On: 2026/10/18
+Lasted Updated: 2026/10/18
+Description: Watches directory trees for changes through Linux inotify, so routines can
+    run when something changed instead of polling on a fixed interval.
+Edit Log:
+2026/10/18
+    - Created file
+    - Cap the debounce at max_wait after the first event of a change
+"""
+
+# STANDARD LIBRARY IMPORTS
+from ctypes import CDLL, c_char_p, c_int, c_uint32, get_errno
+from ctypes.util import find_library
+from os import close, fsdecode, fsencode, read, scandir, strerror
+from os.path import join
+from struct import Struct
+from sys import platform
+from typing import Dict, Iterable, List, Set
+
+# THIRD PARTY LIBRARY IMPORTS
+from asyncio import Event, TimeoutError as AsyncTimeoutError, get_running_loop
+from asyncio import sleep, wait_for
+
+# LOCAL LIBRARY IMPORTS
+
+# See inotify(7)
+IN_CLOSE_WRITE: int = 0x00000008
+IN_MOVED_FROM: int = 0x00000040
+IN_MOVED_TO: int = 0x00000080
+IN_CREATE: int = 0x00000100
+IN_DELETE: int = 0x00000200
+IN_DELETE_SELF: int = 0x00000400
+IN_MOVE_SELF: int = 0x00000800
+IN_IGNORED: int = 0x00008000
+IN_ISDIR: int = 0x40000000
+IN_NONBLOCK: int = 0o4000
+IN_CLOEXEC: int = 0o2000000
+
+WATCH_MASK: int = (
+    IN_CLOSE_WRITE
+    | IN_CREATE
+    | IN_DELETE
+    | IN_MOVED_FROM
+    | IN_MOVED_TO
+    | IN_DELETE_SELF
+    | IN_MOVE_SELF
+)
+
+# struct inotify_event { int wd; uint32_t mask; uint32_t cookie; uint32_t len; }
+INOTIFY_EVENT: Struct = Struct("iIII")
+
+READ_BUFFER_SIZE: int = 64 * 1024
+
+
+class DirectoryWatcherError(Exception):
+    """Raised when inotify is unavailable or a directory can not be watched."""
+
+
+class DirectoryWatcher:
+    """
+    Recursively watches directory trees with inotify. Events are debounced: once a
+    change arrives, the watcher waits until no event has been seen for the debounce
+    period so that a burst of writes, like a git pull, only triggers a single run. A
+    directory that is written without pause, like by a sync client or an editor that
+    saves every few seconds, still triggers once max_wait passed since the first event.
+    """
+
+    def __init__(
+        self,
+        ignored_names: Iterable[str] = (),
+        debounce: float = 5,
+        max_wait: float = 60,
+    ) -> None:
+        """
+        Args:
+            ignored_names: The names of the files and directories that are not watched.
+            debounce: The seconds without an event after which a change is reported.
+            max_wait: The seconds after the first event of a change after which it is
+            reported, even if events keep arriving.
+        """
+
+        self._ignored_names: Set[str] = set(ignored_names)
+        self._debounce = debounce
+        self._max_wait = max(max_wait, debounce)
+        self._libc: CDLL | None = None
+        self._file_descriptor: int = -1
+        self._watched_directories: Dict[int, str] = {}
+        self._root_paths: Set[str] = set()
+        self._changed: Event = Event()
+        self._first_event_time: float = 0
+        self._last_event_time: float = 0
+
+    @staticmethod
+    def is_supported() -> bool:
+        """Whether inotify is available on this platform."""
+        return platform.startswith("linux") and find_library("c") is not None
+
+    def start(self) -> None:
+        """Create the inotify instance and start reading its events on the event loop."""
+        if not self.is_supported():
+            raise DirectoryWatcherError("inotify is only available on Linux")
+
+        self._libc = CDLL(find_library("c"), use_errno=True)
+        self._libc.inotify_init1.argtypes = [c_int]
+        self._libc.inotify_add_watch.argtypes = [c_int, c_char_p, c_uint32]
+
+        self._file_descriptor = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+
+        if self._file_descriptor < 0:
+            raise DirectoryWatcherError(strerror(get_errno()))
+
+        get_running_loop().add_reader(self._file_descriptor, self._read_events)
+
+    def watch(self, paths: Iterable[str]) -> None:
+        """
+        Recursively watch the given directory trees. Paths that are already watched are
+        skipped, so this can be called before every wait to pick up new paths.
+
+        Args:
+            paths: The root directories to watch.
+        """
+
+        for path in set(paths) - self._root_paths:
+            self._add_watch_recursively(path)
+            self._root_paths.add(path)
+
+    async def wait_for_changes(self, timeout: float) -> bool:
+        """
+        Wait until a debounced change is seen or the timeout elapses.
+
+        Args:
+            timeout: The maximum number of seconds to wait.
+
+        Returns:
+            True if something changed, False if the timeout elapsed first.
+        """
+
+        try:
+            await wait_for(self._changed.wait(), timeout)
+        except AsyncTimeoutError:
+            return False
+
+        loop = get_running_loop()
+        deadline: float = self._first_event_time + self._max_wait
+
+        while (quiet_time := loop.time() - self._last_event_time) < self._debounce:
+            if loop.time() >= deadline:
+                break
+
+            await sleep(min(self._debounce - quiet_time, deadline - loop.time()))
+
+        self._changed.clear()
+
+        return True
+
+    def close(self) -> None:
+        """Stop reading events and close the inotify instance."""
+        if self._file_descriptor < 0:
+            return
+
+        get_running_loop().remove_reader(self._file_descriptor)
+        close(self._file_descriptor)
+        self._file_descriptor = -1
+        self._watched_directories = {}
+        self._root_paths = set()
+
+    # PRIVATE METHODS START HERE
+    def _add_watch_recursively(self, path: str) -> None:
+        """Watch a directory and every directory below it that is not ignored."""
+        assert self._libc is not None
+
+        directories_to_watch: List[str] = [path]
+
+        while directories_to_watch:
+            directory_path: str = directories_to_watch.pop()
+            watch_descriptor: int = self._libc.inotify_add_watch(
+                self._file_descriptor, fsencode(directory_path), WATCH_MASK
+            )
+
+            if watch_descriptor < 0:
+                raise DirectoryWatcherError(
+                    f"Can not watch {directory_path}: {strerror(get_errno())}"
+                )
+
+            self._watched_directories[watch_descriptor] = directory_path
+
+            try:
+                with scandir(directory_path) as entries:
+                    for entry in entries:
+                        if entry.name not in self._ignored_names and entry.is_dir(
+                            follow_symlinks=False
+                        ):
+                            directories_to_watch.append(entry.path)
+            except FileNotFoundError:
+                continue
+
+    def _read_events(self) -> None:
+        """Drain the pending inotify events, watching newly created directories."""
+        try:
+            buffer: bytes = read(self._file_descriptor, READ_BUFFER_SIZE)
+        except BlockingIOError:
+            return
+
+        has_relevant_event: bool = False
+        offset: int = 0
+
+        while offset < len(buffer):
+            watch_descriptor, mask, _, name_length = INOTIFY_EVENT.unpack_from(
+                buffer, offset
+            )
+            name_start: int = offset + INOTIFY_EVENT.size
+            name: str = fsdecode(
+                buffer[name_start : name_start + name_length].rstrip(b"\0")
+            )
+            offset = name_start + name_length
+
+            if mask & IN_IGNORED:
+                self._watched_directories.pop(watch_descriptor, None)
+                continue
+
+            if name in self._ignored_names:
+                continue
+
+            has_relevant_event = True
+            directory_path: str | None = self._watched_directories.get(watch_descriptor)
+
+            if (
+                mask & IN_ISDIR
+                and mask & (IN_CREATE | IN_MOVED_TO)
+                and directory_path is not None
+            ):
+                try:
+                    self._add_watch_recursively(join(directory_path, name))
+                except DirectoryWatcherError as e:
+                    print(f"Failed to watch new directory: {e}")
+
+        # A queue overflow arrives without a name and also counts as a change
+        if has_relevant_event:
+            self._last_event_time = get_running_loop().time()
+
+            if not self._changed.is_set():
+                self._first_event_time = self._last_event_time
+
+            self._changed.set()
@@ -0,0 +1,288 @@
+"""
+file_name = binary_graph.py
+Created On: 2026/10/18
+Lasted Updated: 2026/10/18
+Description: A compact binary force graph format with an interned string table, nodes
+    as integer indices and links as packed source/target pairs. The sections are
+    aligned so a reader can mmap the file and use the arrays without copying.
+Edit Log:
+2026/10/18
+    - Created file
+"""
+
+# STANDARD LIBRARY IMPORTS
+from array import array
+from mmap import ACCESS_READ, mmap
+from struct import Struct
+from sys import byteorder
+from typing import Dict, Iterable, Iterator, List, Tuple, TypedDict
+
+# THIRD PARTY LIBRARY IMPORTS
+
+# LOCAL LIBRARY IMPORTS
+from src.routines.force_graph_updater.graph_writer import open_atomic
+
+BINARY_GRAPH_MAGIC: bytes = b"FGRB"
+BINARY_GRAPH_VERSION: int = 1
+BINARY_GRAPH_EXTENSION: str = ".fgb"
+
+# magic, version, flags, string count, node count, link count,
+# string offsets offset, string data offset, node names offset, node values offset,
+# links offset. Every number is little-endian.
+BINARY_GRAPH_HEADER: Struct = Struct("<4sHHIIIQQQQQ")
+
+SECTION_ALIGNMENT: int = 8
+
+
+class BinaryGraphError(Exception):
+    """Raised when a file is not a binary graph of a supported version."""
+
+
+class BinaryGraphNode(TypedDict):
+    """A node of a binary graph, as it appears in the force graph JSON file."""
+
+    id: str
+    name: str
+    val: int
+
+
+class BinaryGraphLink(TypedDict):
+    """A link of a binary graph, as it appears in the force graph JSON file."""
+
+    source: str
+    target: str
+
+
+class BinaryGraphData(TypedDict):
+    """The content of a binary graph in the shape of the force graph JSON file."""
+
+    nodes: List[BinaryGraphNode]
+    links: List[BinaryGraphLink]
+
+
+def write_binary_graph(
+    output_path: str,
+    nodes: Iterable[Tuple[str, int]],
+    links: Iterable[Tuple[str, str]],
+) -> None:
+    """
+    Writes a binary graph, atomically replacing the output path.
+
+    Args:
+        output_path: The path of the binary graph file.
+        nodes: The name and value of every node. A node with the same name as an
+        earlier node reuses the interned name.
+        links: The source and target name of every link, both must be node names.
+    """
+
+    strings: Dict[str, int] = {}
+    node_names: array = array("I")
+    node_values: array = array("i")
+
+    for name, value in nodes:
+        node_names.append(strings.setdefault(name, len(strings)))
+        node_values.append(value)
+
+    link_pairs: array = array("I")
+
+    for source, target in links:
+        link_pairs.append(strings[source])
+        link_pairs.append(strings[target])
+
+    encoded_strings: List[bytes] = [string.encode("utf-8") for string in strings]
+    string_offsets: array = array("I", [0])
+
+    for encoded_string in encoded_strings:
+        string_offsets.append(string_offsets[-1] + len(encoded_string))
+
+    sections: List[bytes] = [
+        _to_little_endian(string_offsets),
+        b"".join(encoded_strings),
+        _to_little_endian(node_names),
+        _to_little_endian(node_values),
+        _to_little_endian(link_pairs),
+    ]
+    section_offsets: List[int] = []
+    offset: int = BINARY_GRAPH_HEADER.size
+
+    for section in sections:
+        offset = _align(offset)
+        section_offsets.append(offset)
+        offset += len(section)
+
+    with open_atomic(output_path) as output_file:
+        output_file.write(
+            BINARY_GRAPH_HEADER.pack(
+                BINARY_GRAPH_MAGIC,
+                BINARY_GRAPH_VERSION,
+                0,
+                len(strings),
+                len(node_names),
+                len(link_pairs) // 2,
+                *section_offsets,
+            )
+        )
+        position: int = BINARY_GRAPH_HEADER.size
+
+        for section_offset, section in zip(section_offsets, sections):
+            output_file.write(b"\0" * (section_offset - position))
+            output_file.write(section)
+            position = section_offset + len(section)
+
+
+class BinaryGraphReader:
+    """
+    Reads a binary graph through mmap. The string offsets, node and link arrays are
+    memoryviews over the mapped file, strings are only decoded when they are read.
+
+    Usage:
+        with BinaryGraphReader("vault.fgb") as graph:
+            for source, target in graph.links():
+                ...
+    """
+
+    def __init__(self, path: str) -> None:
+        self._path = path
+        self._mmap: mmap | None = None
+        self._views: List[memoryview] = []
+        self.string_count: int = 0
+        self.node_count: int = 0
+        self.link_count: int = 0
+
+    def __enter__(self) -> "BinaryGraphReader":
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def open(self) -> None:
+        """Map the file and validate its header."""
+        with open(self._path, "rb") as file:
+            self._mmap = mmap(file.fileno(), 0, access=ACCESS_READ)
+
+        if len(self._mmap) < BINARY_GRAPH_HEADER.size:
+            self.close()
+            raise BinaryGraphError(f"{self._path} is too small to be a binary graph")
+
+        (
+            magic,
+            version,
+            _,
+            self.string_count,
+            self.node_count,
+            self.link_count,
+            string_offsets_offset,
+            string_data_offset,
+            node_names_offset,
+            node_values_offset,
+            links_offset,
+        ) = BINARY_GRAPH_HEADER.unpack_from(self._mmap)
+
+        if magic != BINARY_GRAPH_MAGIC or version != BINARY_GRAPH_VERSION:
+            self.close()
+            raise BinaryGraphError(
+                f"{self._path} is not a version {BINARY_GRAPH_VERSION} binary graph"
+            )
+
+        data: memoryview = memoryview(self._mmap)
+        self._views = [
+            data,
+            data[string_offsets_offset:string_data_offset],
+            data[string_data_offset:node_names_offset],
+            data[node_names_offset:node_values_offset],
+            data[node_values_offset:links_offset],
+            data[links_offset:],
+        ]
+        self._string_offsets = self._cast(self._views[1], "I", self.string_count + 1)
+        self._string_data = self._views[2]
+        self._node_names = self._cast(self._views[3], "I", self.node_count)
+        self._node_values = self._cast(self._views[4], "i", self.node_count)
+        self._link_pairs = self._cast(self._views[5], "I", self.link_count * 2)
+
+    def close(self) -> None:
+        """Release the memoryviews and unmap the file."""
+        for view in reversed(self._views):
+            view.release()
+
+        self._views = []
+
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    def string(self, index: int) -> str:
+        """Decode an interned string."""
+        start: int = self._string_offsets[index]
+        end: int = self._string_offsets[index + 1]
+
+        return str(self._string_data[start:end], "utf-8")
+
+    def nodes(self) -> Iterator[Tuple[str, int]]:
+        """Yields the name and value of every node."""
+        for index in range(self.node_count):
+            yield self.string(self._node_names[index]), self._node_values[index]
+
+    def links(self) -> Iterator[Tuple[str, str]]:
+        """Yields the source and target name of every link."""
+        for index in range(0, self.link_count * 2, 2):
+            yield (
+                self.string(self._link_pairs[index]),
+                self.string(self._link_pairs[index + 1]),
+            )
+
+    def to_graph_data(self) -> BinaryGraphData:
+        """Convert the graph to the structure of the force graph JSON file."""
+        return {
+            "nodes": [
+                {"id": name, "name": name, "val": value} for name, value in self.nodes()
+            ],
+            "links": [
+                {"source": source, "target": target} for source, target in self.links()
+            ],
+        }
+
+    # PRIVATE METHODS START HERE
+    def _cast(self, section: memoryview, type_code: str, length: int):
+        """Cast a section to an array of 32 bit numbers in the native byte order."""
+        view: memoryview = section[: length * 4]
+        self._views.append(view)
+
+        if byteorder == "little":
+            cast_view: memoryview = view.cast(type_code)
+            self._views.append(cast_view)
+            return cast_view
+
+        swapped_array: array = array(type_code, view)
+        swapped_array.byteswap()
+        return swapped_array
+
+
+def read_binary_graph(path: str) -> BinaryGraphData:
+    """
+    Read a binary graph in the structure of the force graph JSON file.
+
+    Args:
+        path: The path of the binary graph file.
+    """
+
+    with BinaryGraphReader(path) as graph:
+        return graph.to_graph_data()
+
+
+# PRIVATE FUNCTIONS START HERE
+def _align(offset: int) -> int:
+    """Round the offset up to the section alignment."""
+    return -(-offset // SECTION_ALIGNMENT) * SECTION_ALIGNMENT
+
+
+def _to_little_endian(numbers: array) -> bytes:
+    """Get the bytes of an array of 32 bit numbers in little-endian byte order."""
+    assert numbers.itemsize == 4
+
+    if byteorder == "little":
+        return numbers.tobytes()
+
+    swapped_numbers: array = array(numbers.typecode, numbers)
+    swapped_numbers.byteswap()
+    return swapped_numbers.tobytes()
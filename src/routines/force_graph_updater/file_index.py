@@ -0,0 +1,196 @@
+"""
+file_name = file_index.py
+Created On: 2026/10/18
+Lasted Updated: 2026/10/18
+Description: A persisted per-file index of the markdown notes in a vault, used to
+    only re-parse the notes that were added, modified or deleted since the last run.
+Edit Log:
+2026/10/18
+    - Created file
+    - Store the frontmatter aliases of every note
+    - Split refreshing into diff and apply so the extraction can run elsewhere
+    - Diff against the stats collected by the vault scan instead of stat-ing again
+    - Persist the index in the state store, only writing the changed files
+    - Keep the loaded index warm in memory between runs
+"""
+
+# STANDARD LIBRARY IMPORTS
+from typing import Dict, List, Set, Tuple, TypedDict
+
+# THIRD PARTY LIBRARY IMPORTS
+
+# LOCAL LIBRARY IMPORTS
+from src.routines.state_store import FileIndexRow, StateStore
+
+
+# The modification time and size of a file
+FileStat = Tuple[float, int]
+
+
+class ExtractedNoteData(TypedDict):
+    """The data extracted from the content of a single markdown file."""
+
+    links: Set[str]
+    aliases: Set[str]
+
+
+class FileIndexEntry(TypedDict):
+    """The indexed data of a single markdown file."""
+
+    mtime: float
+    size: int
+    links: List[str]
+    aliases: List[str]
+
+
+class FileIndexDiff(TypedDict):
+    """The paths that changed between two refreshes of the file index."""
+
+    added: Set[str]
+    modified: Set[str]
+    removed: Set[str]
+
+
+class FileIndex:
+    """
+    A per-file index of path, modification time, size and the raw links extracted
+    from every markdown file of a vault. The links are stored unresolved so that a
+    note created later still resolves links of notes that were not re-parsed.
+    """
+
+    version: int = 2
+
+    def __init__(self, state_store: StateStore, namespace: str) -> None:
+        self._state_store = state_store
+        self._namespace = namespace
+        self._entries: Dict[str, FileIndexEntry] = {}
+        self._pending_stats: Dict[str, FileStat] = {}
+        self._changed_paths: Set[str] = set()
+        self._removed_paths: Set[str] = set()
+        self._is_loaded: bool = False
+
+    @property
+    def is_loaded(self) -> bool:
+        """Whether the index is loaded, a loaded index stays current until unloaded."""
+        return self._is_loaded
+
+    @property
+    def entries(self) -> Dict[str, FileIndexEntry]:
+        """The indexed files, keyed by their path."""
+        return self._entries
+
+    def load(self) -> None:
+        """Load the index from the state store, starting over if its version changed."""
+        self._entries = {}
+        self._changed_paths = set()
+        self._removed_paths = set()
+        self._is_loaded = True
+
+        if (
+            self._state_store.get_value("file_index_versions", self._namespace)
+            != self.version
+        ):
+            self._state_store.clear_file_index(self._namespace)
+            self._state_store.set_value(
+                "file_index_versions", self._namespace, self.version
+            )
+            return
+
+        for path, row in self._state_store.load_file_index(self._namespace).items():
+            self._entries[path] = {
+                "mtime": row["mtime"],
+                "size": row["size"],
+                "links": row["data"]["links"],
+                "aliases": row["data"]["aliases"],
+            }
+
+    def unload(self) -> None:
+        """Drop the in-memory index, so the next load starts from the state store."""
+        self._entries = {}
+        self._pending_stats = {}
+        self._changed_paths = set()
+        self._removed_paths = set()
+        self._is_loaded = False
+
+    def save(self) -> None:
+        """Write the files that changed since the last load or save to the state store."""
+        upserts: Dict[str, FileIndexRow] = {}
+
+        for path in self._changed_paths:
+            entry: FileIndexEntry = self._entries[path]
+            upserts[path] = {
+                "mtime": entry["mtime"],
+                "size": entry["size"],
+                "data": {"links": entry["links"], "aliases": entry["aliases"]},
+            }
+
+        self._state_store.update_file_index(
+            self._namespace, upserts, self._removed_paths
+        )
+        self._changed_paths = set()
+        self._removed_paths = set()
+
+    def diff(self, markdown_file_stats: Dict[str, FileStat]) -> FileIndexDiff:
+        """
+        Compare the index with the markdown files currently in the vault.
+
+        Args:
+            markdown_file_stats: The modification time and size of every markdown file
+            currently in the vault, keyed by its path.
+
+        Returns:
+            The paths that were added, modified and removed since the last refresh.
+        """
+
+        diff: FileIndexDiff = {"added": set(), "modified": set(), "removed": set()}
+        self._pending_stats = {}
+
+        for path, (mtime, size) in markdown_file_stats.items():
+            entry: FileIndexEntry | None = self._entries.get(path)
+
+            if entry is None:
+                diff["added"].add(path)
+            elif entry["mtime"] != mtime or entry["size"] != size:
+                diff["modified"].add(path)
+            else:
+                continue
+
+            self._pending_stats[path] = (mtime, size)
+
+        diff["removed"] = set(self._entries) - set(markdown_file_stats)
+
+        return diff
+
+    def apply(
+        self, diff: FileIndexDiff, note_data: Dict[str, ExtractedNoteData]
+    ) -> None:
+        """
+        Apply a diff to the index.
+
+        Args:
+            diff: The diff returned by the last call to diff.
+            note_data: The extracted data of every added and modified file.
+        """
+
+        for path in diff["added"] | diff["modified"]:
+            self._changed_paths.add(path)
+            self._removed_paths.discard(path)
+            mtime, size = self._pending_stats[path]
+            self._entries[path] = {
+                "mtime": mtime,
+                "size": size,
+                "links": sorted(note_data[path]["links"]),
+                "aliases": sorted(note_data[path]["aliases"]),
+            }
+
+        for path in diff["removed"]:
+            self._removed_paths.add(path)
+            self._changed_paths.discard(path)
+            del self._entries[path]
+
+        self._pending_stats = {}
+
+    @staticmethod
+    def has_changes(diff: FileIndexDiff) -> bool:
+        """Whether the diff contains any added, modified or removed file."""
+        return bool(diff["added"] or diff["modified"] or diff["removed"])
@@ -1,31 +1,87 @@
 """
 file_name = force_graph.py
 Created On: 2024/06/26
-Lasted Updated: 2024/06/26
+Lasted Updated: 2026/10/18
 Description: _FILL OUT HERE_
 Edit Log:
 2024/06/26
     - Created file
+2026/10/18
+    - Only re-parse added or modified notes using a persisted per-file index
+    - Resolve links through a hash index of note names, paths and aliases
+    - Extract links on a worker thread or across a process pool for large vaults
+    - Pull the vault with asyncio subprocesses and skip the rebuild if HEAD is unchanged
+    - Detect changes and discover files in a single scandir walk of the vault
+    - Stream the nodes and links into an atomically replaced JSON file
+    - Optional compact binary graph output alongside the JSON file
+    - Keep timestamps and file indexes in the shared sqlite state store
+    - Time every phase of an update
+    - Keep the file index in memory between updates of a long-lived instance
+    - Weigh nodes by PageRank and add their degrees, resolving every link only once
+    - Version the output and write the delta to every version next to it
+    - Keep a queryable index of the links, backlinks, broken links and orphans
+    - Only skip a run when HEAD is the commit of the last successful build
+    - Skip a run only when there are no local changes either
+    - Run the index, resolve and state store work on worker threads
+    - Leave logging the phase durations to the routine
+    - Only resolve the links of modified notes while the notes and files are the same
+    - Skip the scan when HEAD is the last built commit and git reports a clean worktree
 """
 
 # STANDARD LIBRARY IMPORTS
-from json import dump, load, JSONDecodeError
-from os import listdir, walk, remove
-from os.path import isdir, join, exists, getmtime, abspath, dirname
-from re import findall
-from subprocess import run, CalledProcessError
-from typing import Dict, List, Set, Tuple, TypedDict
+from array import array
+from os import scandir
+from os.path import exists
+from typing import Dict, Iterator, List, Set, Tuple, TypedDict
 
 # THIRD PARTY LIBRARY IMPORTS
+from asyncio import Semaphore, to_thread
 
 # LOCAL LIBRARY IMPORTS
-
-
-class GetAllFilesResult(TypedDict):
-    """The result of the get_all_files method"""
+from src.routines.force_graph_updater.binary_graph import (
+    BINARY_GRAPH_EXTENSION,
+    write_binary_graph,
+)
+from src.routines.force_graph_updater.file_index import (
+    ExtractedNoteData,
+    FileIndex,
+    FileIndexDiff,
+    FileStat,
+)
+from src.routines.force_graph_updater.git_sync import (
+    DEFAULT_GIT_TIMEOUT,
+    GitCommandError,
+    GitPullResult,
+    get_worktree_changes,
+    pull_repository,
+)
+from src.routines.force_graph_updater.graph_delta import (
+    DEFAULT_DELTA_COMPACTION_SIZE,
+    DEFAULT_DELTA_HISTORY,
+    GraphDeltaLog,
+)
+from src.routines.force_graph_updater.graph_metrics import (
+    GraphAdjacency,
+    NodeMetrics,
+)
+from src.routines.force_graph_updater.graph_writer import write_graph_json
+from src.routines.force_graph_updater.link_extractor import (
+    DEFAULT_PARALLEL_THRESHOLD,
+    extract_notes,
+)
+from src.routines.force_graph_updater.link_index import LinkIndex, LinkIndexDiff
+from src.routines.force_graph_updater.note_resolver import NoteResolver
+from src.routines.routine_profiling import PhaseTimer
+from src.routines.state_store import StateStore, get_state_store
+
+
+class VaultScanResult(TypedDict):
+    """The result of the scan_vault method"""
 
     md_files: Dict[str, str]
+    md_file_stats: Dict[str, FileStat]
     other_files: Set[Tuple[str, str]]
+    latest_mod_time: float
 
 
 class ForceGraphNodeData(TypedDict):
@@ -33,7 +89,44 @@ class ForceGraphNodeData(TypedDict):
 
     id: str
     name: str
+    # The size of the node, its PageRank scaled so that an average node is 10
     val: int
+    # The number of links to and from the note
+    in_degree: int
+    out_degree: int
+    # The PageRank relative to an average node, which has a PageRank of 1
+    pagerank: float
+
+
+class ForceGraphLinkData(TypedDict):
+    """The data structure of a link in the force graph JSON file."""
+
+    source: str
+    target: str
+
+
+class ResolvedGraph(TypedDict):
+    """The nodes of the vault and their resolved links as integer node ids."""
+
+    # The distinct node names, indexed by node id
+    node_names: List[str]
+    # The node id of every node of the output, notes with the same name share an id
+    node_ids: array
+    # The nodes with an id below the note count are notes, the rest are other files
+    note_count: int
+    link_sources: array
+    link_targets: array
+    # The link targets that resolve to neither a note nor a file, keyed by node id
+    broken_links: Dict[int, Set[str]]
+
+
+class ResolvedNoteLinks(TypedDict):
+    """The resolved links of a note, valid while no note, alias or file changes."""
+
+    # The names of the notes the note links to, each at most once
+    targets: List[str]
+    # The link targets that resolve to neither a note nor a file
+    broken_links: Set[str]
 
 
 class AddForcegraphResult(TypedDict):
@@ -50,244 +143,594 @@ class ForceGraph:
     files_to_ignore: Set[str] = {".DS_Store", "Budgeting Sheet.md", "Todo.md"}
 
     def __init__(
-        self, force_graph_json_path: str, obsidian_directory_path: str
+        self,
+        force_graph_json_path: str,
+        obsidian_directory_path: str,
+        extraction_workers: int | None = None,
+        parallel_threshold: int = DEFAULT_PARALLEL_THRESHOLD,
+        git_timeout: float = DEFAULT_GIT_TIMEOUT,
+        git_semaphore: Semaphore | None = None,
+        output_compression: str | None = None,
+        binary_output: bool = False,
+        state_store: StateStore | None = None,
+        delta_history: int = DEFAULT_DELTA_HISTORY,
+        delta_compaction_size: int = DEFAULT_DELTA_COMPACTION_SIZE,
     ) -> None:
+        """
+        Args:
+            delta_history: The number of versions a client can fall behind and still
+            patch its graph with the written deltas, 0 to not write deltas.
+            delta_compaction_size: The number of single version deltas merged at a
+            time.
+        """
+
         self._force_graph_json_path = force_graph_json_path
         self._obsidian_directory_path = obsidian_directory_path
-
-    def update_force_graph_json(self) -> None:
+        self._extraction_workers = extraction_workers
+        self._parallel_threshold = parallel_threshold
+        self._git_timeout = git_timeout
+        self._git_semaphore = git_semaphore
+        self._output_compression = output_compression
+        self._binary_output = binary_output
+        self._state_store = state_store or get_state_store()
+        self._file_index = FileIndex(self._state_store, force_graph_json_path)
+        self._delta_log: GraphDeltaLog | None = (
+            GraphDeltaLog(
+                force_graph_json_path + ".json", delta_history, delta_compaction_size
+            )
+            if delta_history
+            else None
+        )
+        self._link_index = LinkIndex()
+        self._last_phase_durations: Dict[str, float] = {}
+        # The note resolver of the last update with the notes and other files it was
+        # built from, and the resolved links of every note, keyed by path
+        self._note_resolver: NoteResolver | None = None
+        self._resolved_files: Tuple[Dict[str, str], Set[Tuple[str, str]]] | None = None
+        self._resolved_notes: Dict[str, ResolvedNoteLinks] = {}
+
+    async def update_force_graph_json(self) -> None:
         """
         Updates the force graph JSON file with the current state of the Obsidian
         """
 
-        def add_to_force_graph(force_graph: Dict[str, list], file_data, index=0):
-            if isinstance(file_data, dict):
-                file_data = file_data.items()
+        phase_timer = PhaseTimer()
 
-            for full_path, file_name in file_data:  # pylint: disable=unused-variable
-                current_object = {"id": file_name, "name": file_name, "val": index}
+        try:
+            await self._update_force_graph_json(phase_timer)
+        except BaseException:
+            # The warm index may be ahead of the written output, start over from the
+            # persisted state so the next update rebuilds what this one did not write
+            self._file_index.unload()
+            self._note_resolver = None
+            self._resolved_files = None
+
+            if self._delta_log is not None:
+                self._delta_log.unload()
+
+            raise
+        finally:
+            self._last_phase_durations = phase_timer.durations
+
+    @property
+    def obsidian_directory_path(self) -> str:
+        """The path of the vault."""
+        return self._obsidian_directory_path
+
+    @property
+    def force_graph_json_path(self) -> str:
+        """The path of the force graph output, without its extension."""
+        return self._force_graph_json_path
+
+    @property
+    def link_index(self) -> LinkIndex:
+        """The links of the vault as of the last update, empty before the first one."""
+        return self._link_index
+
+    @property
+    def last_phase_durations(self) -> Dict[str, float]:
+        """The seconds spent in every phase of the last update."""
+        return self._last_phase_durations
 
-                force_graph["nodes"].append(current_object)
-                index += 1
+    # PRIVATE METHODS START HERE
+    async def _update_force_graph_json(self, phase_timer: PhaseTimer) -> None:
+        """Update the force graph files, timing every phase of the update."""
+
+        with phase_timer.phase("git_pull"):
+            head: str | None = await self._pull_repository_updates()
+
+        # The output of the last successful build matches the commit it was built from,
+        # so with no worktree changes the vault does not have to be scanned. The HEAD of
+        # a failed build is not stored, so the next run builds it again
+        if (
+            head is not None
+            and self._link_index.is_loaded
+            and exists(self._force_graph_json_path + ".json")
+            and head == await to_thread(self._get_last_built_head)
+        ):
+            with phase_timer.phase("git_status"):
+                is_worktree_unchanged: bool = await self._is_worktree_unchanged()
+
+            if is_worktree_unchanged:
+                print("No new commits or local changes, skipping force graph update")
+                return
+
+        # Change detection and file discovery share a single walk of the vault
+        with phase_timer.phase("scan"):
+            file_data: VaultScanResult = await to_thread(
+                self._scan_vault, self._obsidian_directory_path
+            )
+        markdown_files: Dict[str, str] = file_data["md_files"]
+        other_files: Set[Tuple[str, str]] = file_data["other_files"]
 
-            return index
+        with phase_timer.phase("index_diff"):
+            index_diff: FileIndexDiff = await to_thread(
+                self._diff_file_index, file_data["md_file_stats"]
+            )
 
-        self._pull_repository_updates()
+        # Deleted notes do not raise the latest modification time, the index catches them
+        has_changes: bool = await to_thread(
+            self._has_directory_changed, file_data["latest_mod_time"]
+        ) or FileIndex.has_changes(index_diff)
 
-        if self._has_directory_changed():
+        if has_changes:
             print("Changes detected, updating force graph")
-        else:
+        elif self._link_index.is_loaded:
+            # The output already matches the files of this HEAD
             print("No changes to force graph")
+            await to_thread(self._set_last_built_head, head)
             return
-
-        file_data: GetAllFilesResult = self._get_all_files(
-            self._obsidian_directory_path
+        else:
+            print("No changes to force graph, only building the link index")
+
+        with phase_timer.phase("extract_links"):
+            note_data: Dict[str, ExtractedNoteData] = await extract_notes(
+                list(index_diff["added"] | index_diff["modified"]),
+                self._extraction_workers,
+                self._parallel_threshold,
+            )
+            # Compared with the aliases of the file index before the diff is applied
+            paths_to_resolve: Set[str] | None = await to_thread(
+                self._get_paths_to_resolve,
+                markdown_files,
+                other_files,
+                index_diff,
+                note_data,
+            )
+            await to_thread(self._file_index.apply, index_diff, note_data)
+
+        print(
+            f"Re-parsed {len(index_diff['added']) + len(index_diff['modified'])} notes, "
+            f"removed {len(index_diff['removed'])} notes"
         )
-        markdown_files: Dict[str, str] = file_data["md_files"]
-        other_files: Set[Tuple[str, str]] = file_data["other_files"]
 
-        graph: List[Dict[str, str]] = []
+        with phase_timer.phase("resolve_notes"):
+            if paths_to_resolve is None or self._note_resolver is None:
+                self._note_resolver = await to_thread(
+                    self._build_note_resolver, markdown_files
+                )
+                self._resolved_files = (markdown_files, other_files)
+                self._resolved_notes = {}
+                paths_to_resolve = set(markdown_files)
+
+        print(f"Resolving the links of {len(paths_to_resolve)} notes")
+
+        with phase_timer.phase("resolve_links"):
+            resolved_graph: ResolvedGraph = await to_thread(
+                self._resolve_graph,
+                markdown_files,
+                other_files,
+                self._note_resolver,
+                paths_to_resolve,
+            )
+
+        with phase_timer.phase("link_index"):
+            await self._update_link_index(resolved_graph)
+
+        if not has_changes:
+            await to_thread(self._set_last_built_head, head)
+            return
+
+        with phase_timer.phase("graph_metrics"):
+            node_metrics: NodeMetrics = await to_thread(
+                self._compute_node_metrics, resolved_graph
+            )
+            nodes: List[ForceGraphNodeData] = self._build_nodes(
+                resolved_graph, node_metrics
+            )
+
+        version: int | None = None
+
+        # The delta is written first, clients only see it once the snapshot is written
+        if self._delta_log is not None:
+            with phase_timer.phase("write_delta"):
+                version = await to_thread(
+                    self._delta_log.write_delta,
+                    nodes,
+                    resolved_graph["node_names"],
+                    resolved_graph["link_sources"],
+                    resolved_graph["link_targets"],
+                )
 
-        for path, file_name in markdown_files.items():
-            links: Set[str] = self._extract_links_from_file(path, markdown_files)
+        with phase_timer.phase("write_json"):
+            await to_thread(
+                write_graph_json,
+                self._force_graph_json_path + ".json",
+                self._iterate_nodes(resolved_graph, nodes),
+                self._iterate_links(resolved_graph),
+                self._output_compression,
+                version,
+            )
+
+        if self._binary_output:
+            with phase_timer.phase("write_binary"):
+                await to_thread(
+                    write_binary_graph,
+                    self._force_graph_json_path + BINARY_GRAPH_EXTENSION,
+                    (
+                        (node["name"], node["val"])
+                        for node in self._iterate_nodes(resolved_graph, nodes)
+                    ),
+                    (
+                        (link["source"], link["target"])
+                        for link in self._iterate_links(resolved_graph)
+                    ),
+                )
 
-            for connection_to in links:
-                graph.append({"source": file_name, "target": connection_to})
+        # Only persist the new state once the output is written, so a failed run is
+        # retried on the next tick
+        with phase_timer.phase("save_state"):
+            if self._delta_log is not None:
+                await to_thread(self._delta_log.commit)
 
-        force_graph_data: Dict[str, list] = {"nodes": [], "links": []}
+            await to_thread(self._save_state, file_data["latest_mod_time"], head)
 
-        index: int = add_to_force_graph(force_graph_data, markdown_files)
-        add_to_force_graph(force_graph_data, other_files, index)
+    def _scan_vault(self, path: str) -> VaultScanResult:
+        """
+        Scans a directory for Markdown files and other files in a single walk, using the
+        cached DirEntry data so that every file is only stat-ed once. The ignored files
+        and folders are skipped for both the discovery and the change detection.
+
+        Args:
+            path: The path to the directory to scan.
 
-        for data in graph:
-            force_graph_data["links"].append(data)
+        Returns:
+            The Markdown files, where the key is the file path and the value is the file
+            name without the extension, their modification times and sizes, the other
+            files as tuples of path and file name, and the latest modification time of
+            any scanned file.
+        """
 
-        with open(self._force_graph_json_path + ".json", "w", encoding="utf-8") as output_file:
-            dump(force_graph_data, output_file)
+        md_files: Dict[str, str] = {}
+        md_file_stats: Dict[str, FileStat] = {}
+        other_files: Set[Tuple[str, str]] = set()
+        latest_mod_time: float = 0
+        directories_to_scan: List[str] = [path]
+
+        while directories_to_scan:
+            directory_path: str = directories_to_scan.pop()
+
+            with scandir(directory_path) as entries:
+                for entry in entries:
+                    if (
+                        entry.name in self.files_to_ignore
+                        or entry.name in self.folders_to_ignore
+                    ):
+                        continue
+
+                    current_path: str = f"{directory_path}/{entry.name}"
+
+                    if entry.is_dir():
+                        directories_to_scan.append(current_path)
+                        continue
+
+                    entry_stat = entry.stat()
+                    latest_mod_time = max(latest_mod_time, entry_stat.st_mtime)
+
+                    if entry.name.endswith(".md"):
+                        md_files[current_path] = entry.name[: len(entry.name) - 3]
+                        md_file_stats[current_path] = (
+                            entry_stat.st_mtime,
+                            entry_stat.st_size,
+                        )
+                    else:
+                        # TODO: remove .png, change this later to remove any extension
+                        other_files.add((current_path, entry.name))
+
+        return {
+            "md_files": md_files,
+            "md_file_stats": md_file_stats,
+            "other_files": other_files,
+            "latest_mod_time": latest_mod_time,
+        }
 
-    # PRIVATE METHODS START HERE
+    # def get_file_force_graph_data(self, file_name: str, last_index)
 
-    def _get_all_files(
+    def _resolve_graph(
         self,
-        path: str,
-        md_files: Dict[str, str] | None = None,
-        other_files: Set[Tuple[str, str]] | None = None,
-    ) -> GetAllFilesResult:
+        md_files: Dict[str, str],
+        other_files: Set[Tuple[str, str]],
+        note_resolver: NoteResolver,
+        paths_to_resolve: Set[str],
+    ) -> ResolvedGraph:
         """
-        Recursively scans a directory for Markdown files and other files.
-
-        Args:
-            md_files: A dictionary to store the found Markdown files, where the key is the
-            file path and the value is the file name without the extension.
-            other_files: A set to store other files found, where each entry is a tuple containing
-            the file path and the file name.
+        Numbers the nodes, every Markdown file followed by every other file, and turns
+        the links of every Markdown file into pairs of node ids. A note links to another
+        note at most once. Links that resolve to neither a note nor a file of the vault
+        are kept as broken links. Only the notes of paths_to_resolve are resolved, the
+        others reuse the links they resolved to in an earlier update.
         """
 
-        if not md_files and not other_files:
-            md_files = {}
-            other_files = set()
+        node_id_by_name: Dict[str, int] = {}
+        node_ids: array = array(
+            "I",
+            (
+                node_id_by_name.setdefault(file_name, len(node_id_by_name))
+                for file_name in md_files.values()
+            ),
+        )
+        note_count: int = len(node_id_by_name)
+        node_ids.extend(
+            node_id_by_name.setdefault(file_name, len(node_id_by_name))
+            for _, file_name in other_files
+        )
+        link_sources: array = array("I")
+        link_targets: array = array("I")
+        broken_links: Dict[int, Set[str]] = {}
 
-        assert not md_files is None
-        assert not other_files is None
+        resolved_notes: Dict[str, ResolvedNoteLinks] = self._resolved_notes
 
-        for file_name in listdir(path):
-            if file_name in self.files_to_ignore or file_name in self.folders_to_ignore:
-                continue
+        for path, file_name in md_files.items():
+            source_id: int = node_id_by_name[file_name]
 
-            current_path: str = f"{path}/{file_name}"
+            if path in paths_to_resolve:
+                resolved_notes[path] = self._resolve_note_links(
+                    path, note_resolver, node_id_by_name
+                )
 
-            if isdir(current_path):
-                self._get_all_files(current_path, md_files, other_files)
-            elif current_path.endswith(".md"):
-                md_files[current_path] = file_name[: len(file_name) - 3]
-            else:
-                # TODO: remove .png, change this later to remove any extension
-                other_files.add((current_path, file_name))
+            resolved_note: ResolvedNoteLinks = resolved_notes[path]
 
-        return {"md_files": md_files, "other_files": other_files}
+            if resolved_note["broken_links"]:
+                broken_links.setdefault(source_id, set()).update(
+                    resolved_note["broken_links"]
+                )
 
-    # def get_file_force_graph_data(self, file_name: str, last_index)
+            for connection_to in resolved_note["targets"]:
+                link_sources.append(source_id)
+                link_targets.append(node_id_by_name[connection_to])
 
-    def _extract_links_from_file(
-        self, path_to_file: str, md_files: Dict[str, str]
-    ) -> Set[str]:
-        """
-        Extracts links from a Markdown file. The markdown file is assumed to follow the
-        obsidian markdown structure.
+        return {
+            "node_names": list(node_id_by_name),
+            "node_ids": node_ids,
+            "note_count": note_count,
+            "link_sources": link_sources,
+            "link_targets": link_targets,
+            "broken_links": broken_links,
+        }
 
-        Args:
-            path_to_file: The path to the Markdown file.
+    def _resolve_note_links(
+        self,
+        path: str,
+        note_resolver: NoteResolver,
+        node_id_by_name: Dict[str, int],
+    ) -> ResolvedNoteLinks:
+        """Resolves the links of a note to the names of the notes they point to."""
+        connections: Set[str] = set()
+        broken_links: Set[str] = set()
 
-        Returns:
-            A set of extracted links.
-        """
+        for link in self._file_index.entries[path]["links"]:
+            connection_to: str | None = note_resolver.resolve(link)
+
+            if connection_to is not None:
+                connections.add(connection_to)
+            # Links to attachments are not part of the graph, but are not broken
+            elif link.rpartition("/")[2] not in node_id_by_name:
+                broken_links.add(link)
 
-        links: Set[str] = set()
+        return {"targets": list(connections), "broken_links": broken_links}
 
-        with open(path_to_file, "r", encoding="UTF-8") as md_file:
-            for line in md_file:
-                matches: List[str] = findall(r"\[\[(.*?)\]\]", line)
+    def _get_paths_to_resolve(
+        self,
+        md_files: Dict[str, str],
+        other_files: Set[Tuple[str, str]],
+        index_diff: FileIndexDiff,
+        note_data: Dict[str, ExtractedNoteData],
+    ) -> Set[str] | None:
+        """
+        Gets the notes whose links have to be resolved again. A link of any note can
+        resolve differently once a note, path, alias or other file changed, so only
+        when none did are the links of the modified notes enough.
 
-                for match in matches:
-                    actual_link: str = ""
-                    previous_character: str = ""
+        Returns:
+            The paths of the modified notes, None to resolve every note.
+        """
 
-                    for character in match:
-                        # "Ghaz's Notes#Table Of Contents | Contents" -> "Ghaz's Notes"
-                        if (
-                            previous_character != "\\"
-                            and character == "#"
-                            or character == "|"
-                        ):
-                            break
+        if self._resolved_files is None or self._resolved_files != (
+            md_files,
+            other_files,
+        ):
+            return None
 
-                        actual_link += character
-                        previous_character = character
+        for path in index_diff["modified"]:
+            # The file index keeps the aliases sorted
+            if (
+                sorted(note_data[path]["aliases"])
+                != self._file_index.entries[path]["aliases"]
+            ):
+                return None
 
-                    actual_link = actual_link.strip()
-                    # TODO: LOOK FOR A BETTER SOLUTION
+        return set(index_diff["modified"])
 
-                    markdown_exists: bool = False
+    async def _update_link_index(self, resolved_graph: ResolvedGraph) -> None:
+        """
+        Build the link index on the first update, afterwards diff it with the resolved
+        graph and only apply the changed nodes, both on a worker thread.
+        """
 
-                    for file_name in md_files.values():
-                        if file_name == actual_link:
-                            markdown_exists = True
-                            break
+        link_index_arguments: Tuple = (
+            resolved_graph["node_names"],
+            resolved_graph["note_count"],
+            resolved_graph["link_sources"],
+            resolved_graph["link_targets"],
+            resolved_graph["broken_links"],
+        )
 
-                    if markdown_exists:
-                        links.add(actual_link)
+        if not self._link_index.is_loaded:
+            await to_thread(self._link_index.load, *link_index_arguments)
+            return
 
-        return links
+        await to_thread(self._patch_link_index, link_index_arguments)
+
+    def _patch_link_index(self, link_index_arguments: Tuple) -> None:
+        """Apply the changes between the link index and the resolved graph."""
+        link_index_diff: LinkIndexDiff = self._link_index.diff(*link_index_arguments)
+        self._link_index.apply(link_index_diff)
+
+    @staticmethod
+    def _compute_node_metrics(resolved_graph: ResolvedGraph) -> NodeMetrics:
+        """Computes the degrees and PageRank of every node of the resolved graph."""
+        return GraphAdjacency(
+            len(resolved_graph["node_names"]),
+            resolved_graph["link_sources"],
+            resolved_graph["link_targets"],
+        ).compute_node_metrics()
+
+    @staticmethod
+    def _build_nodes(
+        resolved_graph: ResolvedGraph, node_metrics: NodeMetrics
+    ) -> List[ForceGraphNodeData]:
+        """Builds the node of every node id."""
+        return [
+            {
+                "id": node_name,
+                "name": node_name,
+                "val": val,
+                "in_degree": in_degree,
+                "out_degree": out_degree,
+                "pagerank": pagerank,
+            }
+            for node_name, val, in_degree, out_degree, pagerank in zip(
+                resolved_graph["node_names"],
+                node_metrics["val"],
+                node_metrics["in_degree"],
+                node_metrics["out_degree"],
+                node_metrics["pagerank"],
+            )
+        ]
+
+    @staticmethod
+    def _iterate_nodes(
+        resolved_graph: ResolvedGraph, nodes: List[ForceGraphNodeData]
+    ) -> Iterator[ForceGraphNodeData]:
+        """Yields a node for every Markdown file followed by every other file."""
+        for node_id in resolved_graph["node_ids"]:
+            yield nodes[node_id]
+
+    @staticmethod
+    def _iterate_links(resolved_graph: ResolvedGraph) -> Iterator[ForceGraphLinkData]:
+        """Yields a link for every resolved link of every Markdown file."""
+        node_names: List[str] = resolved_graph["node_names"]
+
+        for source_id, target_id in zip(
+            resolved_graph["link_sources"], resolved_graph["link_targets"]
+        ):
+            yield {"source": node_names[source_id], "target": node_names[target_id]}
+
+    def _build_note_resolver(self, md_files: Dict[str, str]) -> NoteResolver:
+        """
+        Builds the index used to resolve the links of every note in constant time.
 
-    def _pull_repository_updates(self) -> None:
-        """Pulls the latest updates from the Git repository."""
-        try:
-            run(["git", "-C", self._obsidian_directory_path, "pull"], check=True)
-        except CalledProcessError as e:
-            print(f"Failed to pull updates from repository: {e}")
+        Args:
+            md_files: The Markdown files of the vault, where the key is the file path and
+            the value is the file name without the extension.
+        """
 
-    def _get_latest_modification_time(self, directory_path) -> float:
-        latest_mod_time: float = 0
+        note_resolver = NoteResolver(self._obsidian_directory_path)
 
-        for root, dirs, files in walk(directory_path):
-            # Skip the .git directory
-            if ".git" in dirs:
-                dirs.remove(".git")
+        for path, file_name in md_files.items():
+            note_resolver.add_note(
+                path, file_name, self._file_index.entries[path]["aliases"]
+            )
 
-            for file in files:
-                file_path = join(root, file)
+        return note_resolver
 
-                mod_time: float = getmtime(file_path)
-                if mod_time > latest_mod_time:
-                    latest_mod_time = mod_time
+    async def _pull_repository_updates(self) -> str | None:
+        """
+        Pulls the latest updates from the Git repository.
 
-        return latest_mod_time
+        Returns:
+            The HEAD after the pull, None if the pull failed so that vaults that are not
+            git repositories still go through change detection.
+        """
 
-    def _get_last_update_timestamp(self) -> float:
-        force_graph_json_directory_path = join(
-            dirname(abspath(__file__)), "vault_update_timestamps.json"
+        pull_result: GitPullResult = await pull_repository(
+            self._obsidian_directory_path, self._git_timeout, self._git_semaphore
         )
 
-        if not exists(force_graph_json_directory_path):
-            return 0
-
-        with open(
-            force_graph_json_directory_path,
-            "r",
-            encoding="UTF-8",
-        ) as file:
-            try:
-                data = load(file)
-                if self._force_graph_json_path in data:
-                    return data[self._force_graph_json_path]
-            except JSONDecodeError as e:
-                print(
-                    "Error occured while trying to load file, improper json deleting", e
-                )
-                remove(force_graph_json_directory_path)
+        return pull_result["head"]
 
-        return 0
+    async def _is_worktree_unchanged(self) -> bool:
+        """
+        Whether git reports no change to any note or file of the graph. Untracked and
+        gitignored files are always reported, so a vault with any of them outside the
+        ignored folders goes through the change detection on every run.
+        """
 
-    def _has_directory_changed(self) -> bool:
-        latest_mod_time = self._get_latest_modification_time(
-            self._obsidian_directory_path
+        try:
+            changed_paths: List[str] = await get_worktree_changes(
+                self._obsidian_directory_path, self._git_timeout
+            )
+        except (GitCommandError, OSError) as e:
+            print(f"Failed to get the worktree changes of the repository: {e}")
+            return False
+
+        return all(self._is_ignored_path(path) for path in changed_paths)
+
+    def _is_ignored_path(self, path: str) -> bool:
+        """Whether a path relative to the vault is left out of the graph."""
+        names: List[str] = path.rstrip("/").split("/")
+
+        return (
+            any(name in self.folders_to_ignore for name in names)
+            or names[-1] in self.files_to_ignore
         )
-        last_update_timestamp: float = self._get_last_update_timestamp()
 
-        if latest_mod_time > last_update_timestamp:
-            self._update_timestamp_in_json(latest_mod_time)
-            return True
+    def _diff_file_index(
+        self, markdown_file_stats: Dict[str, FileStat]
+    ) -> FileIndexDiff:
+        """Diff the file index with the scanned notes, loading it on the first run."""
+        if not self._file_index.is_loaded:
+            self._file_index.load()
+
+        return self._file_index.diff(markdown_file_stats)
+
+    def _save_state(self, latest_mod_time: float, head: str | None) -> None:
+        """Persist the file index, timestamp and HEAD of a written build."""
+        self._file_index.save()
+        self._update_timestamp(latest_mod_time)
+        self._set_last_built_head(head)
+
+    def _get_last_built_head(self) -> str | None:
+        """The HEAD the output was last successfully built from."""
+        return self._state_store.get_value(
+            "vault_build_heads", self._force_graph_json_path
+        )
 
-        return False
+    def _set_last_built_head(self, head: str | None) -> None:
+        if head is not None:
+            self._state_store.set_value(
+                "vault_build_heads", self._force_graph_json_path, head
+            )
 
-    def _update_timestamp_in_json(self, timestamp: float) -> bool:
-        force_graph_json_directory_path = join(
-            dirname(abspath(__file__)), "vault_update_timestamps.json"
+    def _get_last_update_timestamp(self) -> float:
+        return self._state_store.get_value(
+            "vault_update_timestamps", self._force_graph_json_path, 0
         )
 
-        time_stamp_json = {}
+    def _has_directory_changed(self, latest_mod_time: float) -> bool:
+        return latest_mod_time > self._get_last_update_timestamp()
 
-        if not exists(force_graph_json_directory_path):
-            with open(
-                force_graph_json_directory_path,
-                "w",
-                encoding="UTF-8",
-            ) as file:
-                dump({}, file)
-        else:
-            with open(
-                force_graph_json_directory_path,
-                "r",
-                encoding="UTF-8",
-            ) as file:
-                time_stamp_json = load(file)
-                time_stamp_json[self._force_graph_json_path] = timestamp
-
-        with open(
-            force_graph_json_directory_path,
-            "w",
-            encoding="UTF-8",
-        ) as file:
-            dump(time_stamp_json, file)
-
-        return True
+    def _update_timestamp(self, timestamp: float) -> None:
+        self._state_store.set_value(
+            "vault_update_timestamps", self._force_graph_json_path, timestamp
+        )
@@ -0,0 +1,160 @@
+"""
+file_name = git_sync.py
+Created On: 2026/10/18
+Lasted Updated: 2026/10/18
+Description: Pulls the git repositories of obsidian vaults with asyncio subprocesses so
+    the event loop, and every other routine on it, keeps running during the pull.
+Edit Log:
+2026/10/18
+    - Created file
+    - Kill the git process when the pull is cancelled
+    - Report the HEAD after the pull
+    - List the changes of the worktree, stop comparing HEAD before and after a pull
+"""
+
+# STANDARD LIBRARY IMPORTS
+from contextlib import AsyncExitStack
+from typing import List, TypedDict
+
+# THIRD PARTY LIBRARY IMPORTS
+from asyncio import CancelledError, Semaphore, TimeoutError as AsyncTimeoutError
+from asyncio import wait_for
+from asyncio.subprocess import PIPE, create_subprocess_exec
+
+# LOCAL LIBRARY IMPORTS
+
+DEFAULT_GIT_TIMEOUT: float = 120
+
+
+class GitPullResult(TypedDict):
+    """The result of pulling a repository."""
+
+    succeeded: bool
+    # The commit HEAD points to after the pull, None if the pull failed
+    head: str | None
+
+
+class GitCommandError(Exception):
+    """Raised when a git command fails or times out."""
+
+
+async def run_git_command(
+    repository_path: str, arguments: List[str], timeout: float, strip: bool = True
+) -> str:
+    """
+    Runs a git command inside a repository without blocking the event loop.
+
+    Args:
+        repository_path: The path to the git repository.
+        arguments: The git arguments, for example ["pull"].
+        timeout: The number of seconds after which the command is killed.
+        strip: Strip the surrounding whitespace of the output.
+
+    Returns:
+        The standard output of the command.
+    """
+
+    process = await create_subprocess_exec(
+        "git", "-C", repository_path, *arguments, stdout=PIPE, stderr=PIPE
+    )
+
+    try:
+        stdout, stderr = await wait_for(process.communicate(), timeout)
+    except AsyncTimeoutError as e:
+        process.kill()
+        await process.wait()
+        raise GitCommandError(
+            f"git {' '.join(arguments)} timed out after {timeout} seconds"
+        ) from e
+    except CancelledError:
+        # A routine timeout cancels the pull, the git process must not outlive it
+        process.kill()
+        await process.wait()
+        raise
+
+    if process.returncode != 0:
+        raise GitCommandError(
+            f"git {' '.join(arguments)} returned non-zero exit status "
+            f"{process.returncode}: {stderr.decode(errors='replace').strip()}"
+        )
+
+    output: str = stdout.decode(errors="replace")
+
+    return output.strip() if strip else output
+
+
+async def pull_repository(
+    repository_path: str,
+    timeout: float = DEFAULT_GIT_TIMEOUT,
+    semaphore: Semaphore | None = None,
+) -> GitPullResult:
+    """
+    Pulls the latest updates of a repository and reports the HEAD after the pull.
+
+    Args:
+        repository_path: The path to the git repository.
+        timeout: The number of seconds after which each git command is killed.
+        semaphore: Bounds the number of repositories that are pulled at the same time.
+
+    Returns:
+        Whether the pull succeeded and the HEAD after it.
+    """
+
+    async with AsyncExitStack() as stack:
+        if semaphore is not None:
+            await stack.enter_async_context(semaphore)
+
+        try:
+            await run_git_command(repository_path, ["pull"], timeout)
+            head: str = await run_git_command(
+                repository_path, ["rev-parse", "HEAD"], timeout
+            )
+        except (GitCommandError, OSError) as e:
+            print(f"Failed to pull updates from repository: {e}")
+            return {"succeeded": False, "head": None}
+
+    return {"succeeded": True, "head": head}
+
+
+async def get_worktree_changes(
+    repository_path: str, timeout: float = DEFAULT_GIT_TIMEOUT
+) -> List[str]:
+    """
+    Lists the paths git reports as changed against HEAD: modified, added, deleted and
+    renamed files, untracked files and ignored files. Git can not tell whether an
+    untracked or ignored file changed, so those are always listed. A directory that is
+    untracked or ignored as a whole is listed once with a trailing "/".
+
+    Args:
+        repository_path: The path to the git repository.
+        timeout: The number of seconds after which the command is killed.
+
+    Returns:
+        The paths relative to the repository, the new path of a renamed file.
+    """
+
+    # "XY path" entries separated by NUL, the source of a rename is an extra entry
+    entries: List[str] = (
+        await run_git_command(
+            repository_path,
+            ["status", "--porcelain", "-z", "--ignored", "--untracked-files=normal"],
+            timeout,
+            strip=False,
+        )
+    ).split("\0")
+    changed_paths: List[str] = []
+    index: int = 0
+
+    while index < len(entries):
+        entry: str = entries[index]
+        index += 1
+
+        if not entry:
+            continue
+
+        changed_paths.append(entry[3:])
+
+        if entry[0] in "RC":
+            index += 1
+
+    return changed_paths
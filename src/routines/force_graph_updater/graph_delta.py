@@ -0,0 +1,505 @@
+"""
+file_name = graph_delta.py
+Created On: 2026/10/18
+Lasted Updated: 2026/10/18
+Description: Versioned deltas of the force graph, so clients on an older version can
+    patch their graph instead of downloading the full snapshot again. The deltas are
+    written next to the snapshot with a manifest, a bounded history and compaction.
+Edit Log:
+2026/10/18
+    - Created file
+    - Notify output listeners of removed delta files
+    - Diff graphs without any links
+    - Import the names of the delta outputs from the graph writer
+"""
+
+# STANDARD LIBRARY IMPORTS
+from json import dumps, load
+from operator import lshift, or_
+from os import listdir, makedirs, remove
+from os.path import exists, join
+from itertools import repeat
+from typing import Any, Dict, List, Mapping, Sequence, Set, Tuple, TypedDict
+
+# THIRD PARTY LIBRARY IMPORTS
+try:
+    import numpy
+except ImportError:  # numpy is optional, link keys are diffed as sets without it
+    numpy = None
+
+# LOCAL LIBRARY IMPORTS
+from src.routines.force_graph_updater.graph_writer import (
+    DELTA_DIRECTORY_SUFFIX,
+    DELTA_MANIFEST_NAME,
+    notify_output_listeners,
+    open_atomic,
+)
+
+
+# The number of versions a client can fall behind and still patch its graph
+DEFAULT_DELTA_HISTORY: int = 100
+
+# The number of consecutive single version deltas merged into one delta at a time
+DEFAULT_DELTA_COMPACTION_SIZE: int = 10
+
+# Links are diffed as integers, the persistent id of the source in the high bits
+LINK_KEY_SHIFT: int = 32
+LINK_KEY_MASK: int = (1 << LINK_KEY_SHIFT) - 1
+
+
+class GraphDeltaLink(TypedDict):
+    """A link of a delta, as it appears in the force graph JSON file."""
+
+    source: str
+    target: str
+
+
+class GraphDeltaNodes(TypedDict):
+    """The node changes of a delta."""
+
+    # Nodes that were added or changed, replacing the node with the same id
+    upserted: List[Mapping[str, Any]]
+    # The ids of the removed nodes
+    removed: List[str]
+
+
+class GraphDeltaLinks(TypedDict):
+    """The link changes of a delta."""
+
+    added: List[GraphDeltaLink]
+    removed: List[GraphDeltaLink]
+
+
+class GraphDelta(TypedDict):
+    """
+    The changes between two versions of the graph. Applying a delta to the graph of any
+    version from from_version up to version gives the graph of version: upsert the
+    nodes, remove the removed nodes, add the added links and remove the removed links.
+    Removing a node or link that is not there does nothing.
+    """
+
+    from_version: int
+    version: int
+    nodes: GraphDeltaNodes
+    links: GraphDeltaLinks
+
+
+class DeltaManifestEntry(TypedDict):
+    """A delta file listed in the manifest."""
+
+    from_version: int
+    version: int
+    # The name of the delta file inside the delta directory
+    file: str
+
+
+class DeltaManifest(TypedDict):
+    """
+    The manifest of the delta directory. A client on version N is up to date when N is
+    version. When N is at least oldest_version, it applies every listed delta with a
+    version above N in order, otherwise it downloads the full snapshot.
+    """
+
+    version: int
+    oldest_version: int
+    deltas: List[DeltaManifestEntry]
+
+
+def merge_graph_deltas(deltas: Sequence[GraphDelta]) -> GraphDelta:
+    """
+    Merge consecutive deltas into a single delta from the first from_version to the last
+    version. The last change of a node or link wins, so the merged delta can still be
+    applied to the graph of any version it spans.
+    """
+
+    upserted_nodes: Dict[str, Mapping[str, Any]] = {}
+    removed_nodes: Set[str] = set()
+    added_links: Dict[Tuple[str, str], GraphDeltaLink] = {}
+    removed_links: Dict[Tuple[str, str], GraphDeltaLink] = {}
+
+    for delta in deltas:
+        for node in delta["nodes"]["upserted"]:
+            upserted_nodes[node["id"]] = node
+            removed_nodes.discard(node["id"])
+
+        for node_id in delta["nodes"]["removed"]:
+            upserted_nodes.pop(node_id, None)
+            removed_nodes.add(node_id)
+
+        for link in delta["links"]["added"]:
+            added_links[(link["source"], link["target"])] = link
+            removed_links.pop((link["source"], link["target"]), None)
+
+        for link in delta["links"]["removed"]:
+            added_links.pop((link["source"], link["target"]), None)
+            removed_links[(link["source"], link["target"])] = link
+
+    return {
+        "from_version": deltas[0]["from_version"],
+        "version": deltas[-1]["version"],
+        "nodes": {
+            "upserted": list(upserted_nodes.values()),
+            "removed": sorted(removed_nodes),
+        },
+        "links": {
+            "added": list(added_links.values()),
+            "removed": list(removed_links.values()),
+        },
+    }
+
+
+class GraphDeltaLog:
+    """
+    Keeps the nodes and links of the last written version of a graph and writes the
+    delta to every new version into the <snapshot>.deltas directory. Once there are
+    twice compaction_size single version deltas, the oldest compaction_size of them are
+    merged into one, and deltas that end max_history versions or more before the latest
+    version are removed.
+
+    A new version is written in two steps, so the manifest never points past the
+    snapshot: write_delta before the snapshot is written and commit after it is.
+
+    Usage:
+        version = delta_log.write_delta(nodes, node_names, link_sources, link_targets)
+        ... write the snapshot of the version ...
+        delta_log.commit()
+    """
+
+    def __init__(
+        self,
+        snapshot_path: str,
+        max_history: int = DEFAULT_DELTA_HISTORY,
+        compaction_size: int = DEFAULT_DELTA_COMPACTION_SIZE,
+    ) -> None:
+        """
+        Args:
+            snapshot_path: The path of the full force graph JSON file.
+            max_history: The number of versions a client can fall behind.
+            compaction_size: The number of single version deltas merged at a time.
+        """
+
+        if max_history < 1 or compaction_size < 1:
+            raise ValueError("The delta history and compaction size must be positive")
+
+        self._snapshot_path = snapshot_path
+        self._directory_path: str = snapshot_path + DELTA_DIRECTORY_SUFFIX
+        self._max_history = max_history
+        self._compaction_size = compaction_size
+        self._is_loaded: bool = False
+        self._manifest: DeltaManifest = {
+            "version": 0,
+            "oldest_version": 0,
+            "deltas": [],
+        }
+        # The nodes and link keys of the version of the manifest, None when unknown
+        self._nodes: Dict[str, Mapping[str, Any]] | None = None
+        self._link_keys: Any = None
+        # A persistent id for every node name ever seen, to build the link keys
+        self._key_ids: Dict[str, int] = {}
+        self._key_names: List[str] = []
+        # The entry of the written delta, the nodes and the link keys of the version
+        self._pending: Tuple[DeltaManifestEntry | None, Dict[str, Any], Any] | None
+        self._pending = None
+
+    @property
+    def is_loaded(self) -> bool:
+        """Whether the last version was loaded from the files or written since."""
+        return self._is_loaded
+
+    @property
+    def version(self) -> int:
+        """The latest committed version."""
+        return self._manifest["version"]
+
+    def load(self) -> None:
+        """
+        Load the manifest and the nodes and links of the snapshot. When they disagree,
+        for example because a run failed between the snapshot and the manifest, the
+        history is dropped and the next version is written without a delta.
+        """
+
+        manifest_path: str = join(self._directory_path, DELTA_MANIFEST_NAME)
+        snapshot: Dict[str, Any] = {}
+
+        if exists(manifest_path):
+            with open(manifest_path, "r", encoding="UTF-8") as file:
+                self._manifest = load(file)
+
+        if exists(self._snapshot_path):
+            with open(self._snapshot_path, "r", encoding="UTF-8") as file:
+                snapshot = load(file)
+
+        self._nodes = None
+        self._link_keys = None
+        snapshot_version: int | None = snapshot.get("version")
+
+        if snapshot_version is not None and snapshot_version == self.version:
+            self._nodes = {node["id"]: node for node in snapshot["nodes"]}
+            link_count: int = len(snapshot["links"])
+            self._link_keys = self._get_link_keys(
+                [self._get_key_id(link["source"]) for link in snapshot["links"]]
+                + [self._get_key_id(link["target"]) for link in snapshot["links"]],
+                range(link_count),
+                range(link_count, 2 * link_count),
+            )
+        else:
+            # Never hand out a version number again, clients may have seen it
+            self._manifest["version"] = max(self.version, snapshot_version or 0)
+
+        self._is_loaded = True
+
+    def unload(self) -> None:
+        """Forget the loaded version, the next write_delta loads it from the files."""
+        self._is_loaded = False
+        self._nodes = None
+        self._link_keys = None
+        self._pending = None
+
+    def write_delta(
+        self,
+        nodes: Sequence[Mapping[str, Any]],
+        node_names: List[str],
+        link_sources: Sequence[int],
+        link_targets: Sequence[int],
+    ) -> int:
+        """
+        Diff a new version of the graph against the last version and write the delta
+        file. Nothing is visible to clients until commit.
+
+        Args:
+            nodes: The distinct nodes of the new version, each with an "id".
+            node_names: The node names by node id, which are also the node ids of the
+            force graph JSON file.
+            link_sources: The source node id of every link.
+            link_targets: The target node id of every link.
+
+        Returns:
+            The new version, to write into the snapshot.
+        """
+
+        if not self._is_loaded:
+            self.load()
+
+        version: int = self.version + 1
+        current_nodes: Dict[str, Mapping[str, Any]] = {
+            node["id"]: node for node in nodes
+        }
+        current_link_keys: Any = self._get_link_keys(
+            [self._get_key_id(name) for name in node_names], link_sources, link_targets
+        )
+        entry: DeltaManifestEntry | None = None
+
+        if self._nodes is not None:
+            previous_nodes: Dict[str, Mapping[str, Any]] = self._nodes
+            entry = {
+                "from_version": self.version,
+                "version": version,
+                "file": f"{self.version}-{version}.json",
+            }
+            added_keys, removed_keys = self._diff_link_keys(
+                current_link_keys, self._link_keys
+            )
+            delta: GraphDelta = {
+                "from_version": entry["from_version"],
+                "version": version,
+                "nodes": {
+                    "upserted": [
+                        node
+                        for node_id, node in current_nodes.items()
+                        if previous_nodes.get(node_id) != node
+                    ],
+                    "removed": sorted(previous_nodes.keys() - current_nodes.keys()),
+                },
+                "links": {
+                    "added": self._to_links(added_keys),
+                    "removed": self._to_links(removed_keys),
+                },
+            }
+            self._write_json(entry["file"], delta)
+
+        self._pending = (entry, current_nodes, current_link_keys)
+
+        return version
+
+    def commit(self) -> None:
+        """
+        Publish the version of the last write_delta in the manifest, once its snapshot
+        is written, then compact and evict the history.
+        """
+
+        if self._pending is None:
+            raise RuntimeError("There is no delta to commit")
+
+        entry, self._nodes, self._link_keys = self._pending
+        self._pending = None
+        version: int = self.version + 1
+        entries: List[DeltaManifestEntry] = []
+        files_to_remove: List[str] = []
+
+        if entry is None:
+            # Without a delta into this version the older deltas lead nowhere, clients
+            # behind it have to download the snapshot. This also clears the delta files
+            # of runs that failed before their commit
+            if exists(self._directory_path):
+                files_to_remove += [
+                    file_name
+                    for file_name in listdir(self._directory_path)
+                    if file_name != DELTA_MANIFEST_NAME
+                ]
+        else:
+            entries = self._manifest["deltas"] + [entry]
+
+        entries, merged_files = self._compact(entries)
+        files_to_remove += merged_files
+
+        while entries and entries[0]["version"] <= version - self._max_history:
+            files_to_remove.append(entries.pop(0)["file"])
+
+        self._manifest = {
+            "version": version,
+            "oldest_version": entries[0]["from_version"] if entries else version,
+            "deltas": entries,
+        }
+        self._write_json(DELTA_MANIFEST_NAME, self._manifest)
+
+        for file_name in files_to_remove:
+            file_path: str = join(self._directory_path, file_name)
+
+            if exists(file_path):
+                remove(file_path)
+                notify_output_listeners(file_path)
+
+    # PRIVATE METHODS START HERE
+    def _compact(
+        self, entries: List[DeltaManifestEntry]
+    ) -> Tuple[List[DeltaManifestEntry], List[str]]:
+        """
+        Merge the oldest single version deltas once there are twice the compaction size
+        of them. Merged deltas always come before the single version deltas.
+
+        Returns:
+            The entries after compaction and the files that were merged.
+        """
+
+        single_version_entries: List[DeltaManifestEntry] = [
+            entry for entry in entries if entry["version"] - entry["from_version"] == 1
+        ]
+
+        if len(single_version_entries) < 2 * self._compaction_size:
+            return entries, []
+
+        entries_to_merge: List[DeltaManifestEntry] = single_version_entries[
+            : self._compaction_size
+        ]
+        deltas: List[GraphDelta] = []
+
+        for entry in entries_to_merge:
+            with open(
+                join(self._directory_path, entry["file"]), "r", encoding="UTF-8"
+            ) as file:
+                deltas.append(load(file))
+
+        merged_delta: GraphDelta = merge_graph_deltas(deltas)
+        merged_entry: DeltaManifestEntry = {
+            "from_version": merged_delta["from_version"],
+            "version": merged_delta["version"],
+            "file": f"{merged_delta['from_version']}-{merged_delta['version']}.json",
+        }
+        self._write_json(merged_entry["file"], merged_delta)
+        merge_start: int = entries.index(entries_to_merge[0])
+
+        return (
+            entries[:merge_start]
+            + [merged_entry]
+            + entries[merge_start + len(entries_to_merge) :],
+            [entry["file"] for entry in entries_to_merge],
+        )
+
+    def _get_key_id(self, name: str) -> int:
+        """Get the persistent id of a node name."""
+        key_id: int | None = self._key_ids.get(name)
+
+        if key_id is None:
+            key_id = self._key_ids[name] = len(self._key_names)
+            self._key_names.append(name)
+
+        return key_id
+
+    @staticmethod
+    def _get_link_keys(
+        key_ids: List[int], sources: Sequence[int], targets: Sequence[int]
+    ) -> Any:
+        """
+        Get the distinct link keys of links, a sorted array with numpy and a set
+        without it.
+
+        Args:
+            key_ids: The persistent ids of the nodes.
+            sources: The index of the source of every link in key_ids.
+            targets: The index of the target of every link in key_ids.
+        """
+
+        if numpy is not None:
+            key_id_array = numpy.asarray(key_ids, dtype=numpy.uint64)
+            link_keys = (
+                numpy.left_shift(
+                    key_id_array[numpy.asarray(sources, dtype=numpy.intp)],
+                    numpy.uint64(LINK_KEY_SHIFT),
+                )
+                | key_id_array[numpy.asarray(targets, dtype=numpy.intp)]
+            )
+            link_keys.sort()
+
+            # A graph without links has no duplicates to drop
+            if len(link_keys) == 0:
+                return link_keys
+
+            # Sorted, the duplicates are next to each other
+            return link_keys[
+                numpy.concatenate(([True], link_keys[1:] != link_keys[:-1]))
+            ]
+
+        get_key_id = key_ids.__getitem__
+
+        return set(
+            map(
+                or_,
+                map(lshift, map(get_key_id, sources), repeat(LINK_KEY_SHIFT)),
+                map(get_key_id, targets),
+            )
+        )
+
+    @staticmethod
+    def _diff_link_keys(current_keys: Any, previous_keys: Any) -> Tuple[List, List]:
+        """Get the sorted link keys that were added and removed."""
+        if numpy is not None:
+            return (
+                numpy.setdiff1d(
+                    current_keys, previous_keys, assume_unique=True
+                ).tolist(),
+                numpy.setdiff1d(
+                    previous_keys, current_keys, assume_unique=True
+                ).tolist(),
+            )
+
+        return (
+            sorted(current_keys - previous_keys),
+            sorted(previous_keys - current_keys),
+        )
+
+    def _to_links(self, link_keys: List[int]) -> List[GraphDeltaLink]:
+        """Convert link keys back to links between node names."""
+        return [
+            {
+                "source": self._key_names[link_key >> LINK_KEY_SHIFT],
+                "target": self._key_names[link_key & LINK_KEY_MASK],
+            }
+            for link_key in link_keys
+        ]
+
+    def _write_json(self, file_name: str, data: Mapping[str, Any]) -> None:
+        """Atomically write a JSON file into the delta directory."""
+        makedirs(self._directory_path, exist_ok=True)
+
+        with open_atomic(join(self._directory_path, file_name)) as file:
+            file.write(dumps(data).encode("utf-8"))
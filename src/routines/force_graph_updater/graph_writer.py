@@ -0,0 +1,186 @@
+"""
+file_name = graph_writer.py
+Created On: 2026/10/18
+Lasted Updated: 2026/10/18
+Description: Streams force graph nodes and links into a JSON file that is atomically
+    replaced, so readers never see a half-written graph.
+Edit Log:
+2026/10/18
+    - Created file
+    - Share the atomic replace through open_atomic
+    - Optional version of the graph at the start of the file
+    - Notify output listeners when an output is replaced or removed
+    - Name the delta outputs here, so serving them does not import the delta log
+"""
+
+# STANDARD LIBRARY IMPORTS
+from contextlib import ExitStack, contextmanager
+from gzip import GzipFile
+from json import dumps
+from os import chmod, fsync, remove, replace, stat
+from os.path import dirname, exists
+from tempfile import NamedTemporaryFile
+from typing import IO, Any, Callable, Iterable, Iterator, List, Mapping
+
+# THIRD PARTY LIBRARY IMPORTS
+try:
+    import zstandard
+except ImportError:  # zstandard is optional, only needed for zstd output
+    zstandard = None
+
+# LOCAL LIBRARY IMPORTS
+
+COMPRESSION_EXTENSIONS = {"gzip": ".gz", "zstd": ".zst"}
+
+# The deltas of a snapshot are written to the snapshot path with this suffix, with a
+# manifest of the written versions
+DELTA_DIRECTORY_SUFFIX: str = ".deltas"
+DELTA_MANIFEST_NAME: str = "manifest.json"
+
+# The number of serialized items that are joined before every write
+WRITE_BATCH_SIZE: int = 1024
+
+# Temporary files are private, outputs have to stay readable by the web server
+DEFAULT_OUTPUT_MODE: int = 0o644
+
+# Called with the path of every output that was replaced or removed, from the thread
+# that wrote it
+_output_listeners: List[Callable[[str], None]] = []
+
+
+def write_graph_json(
+    output_path: str,
+    nodes: Iterable[Mapping[str, Any]],
+    links: Iterable[Mapping[str, Any]],
+    compression: str | None = None,
+    version: int | None = None,
+) -> None:
+    """
+    Streams the nodes and links of a force graph into a {"nodes": [], "links": []}
+    JSON file. Items are serialized one at a time straight from the iterables into a
+    temporary file, which is fsynced and then moved over the output path.
+
+    Args:
+        output_path: The path of the JSON file.
+        nodes: The nodes of the graph.
+        links: The links of the graph.
+        compression: "gzip" or "zstd" to also write a compressed sibling, for example
+        graph.json.gz, in the same pass.
+        version: The version of the graph, written as a "version" key before the nodes.
+    """
+
+    if compression is not None and compression not in COMPRESSION_EXTENSIONS:
+        raise ValueError(f"Unsupported compression: {compression}")
+
+    if compression == "zstd" and zstandard is None:
+        raise ValueError("zstd compression requires the zstandard package")
+
+    with ExitStack() as stack:
+        output_file: IO[bytes] = stack.enter_context(open_atomic(output_path))
+        streams: List[IO[bytes]] = [output_file]
+
+        if compression is not None:
+            compressed_file: IO[bytes] = stack.enter_context(
+                open_atomic(output_path + COMPRESSION_EXTENSIONS[compression])
+            )
+
+            if compression == "gzip":
+                streams.append(GzipFile(fileobj=compressed_file, mode="wb", mtime=0))
+            else:
+                assert zstandard is not None
+                streams.append(
+                    zstandard.ZstdCompressor().stream_writer(
+                        compressed_file, closefd=False
+                    )
+                )
+
+        def write(data: str) -> None:
+            encoded_data: bytes = data.encode("utf-8")
+
+            for stream in streams:
+                stream.write(encoded_data)
+
+        write(
+            '{"nodes": [' if version is None else f'{{"version": {version}, "nodes": ['
+        )
+        _write_items(write, nodes)
+        write('], "links": [')
+        _write_items(write, links)
+        write("]}")
+
+        for stream in streams[1:]:
+            stream.close()
+
+
+@contextmanager
+def open_atomic(path: str) -> Iterator[IO[bytes]]:
+    """
+    Open a temporary file next to the path for writing. When the block exits without
+    an error, the file is fsynced and moved over the path, otherwise it is removed.
+
+    Args:
+        path: The path of the file to replace.
+    """
+
+    temporary_file: IO[bytes] = NamedTemporaryFile(
+        mode="wb", dir=dirname(path) or ".", prefix=".", suffix=".tmp", delete=False
+    )
+
+    try:
+        yield temporary_file
+
+        temporary_file.flush()
+        fsync(temporary_file.fileno())
+        temporary_file.close()
+        chmod(
+            temporary_file.name,
+            stat(path).st_mode & 0o777 if exists(path) else DEFAULT_OUTPUT_MODE,
+        )
+        replace(temporary_file.name, path)
+        notify_output_listeners(path)
+    finally:
+        temporary_file.close()
+
+        if exists(temporary_file.name):
+            remove(temporary_file.name)
+
+
+def add_output_listener(listener: Callable[[str], None]) -> None:
+    """
+    Call the listener with the path of every output that is replaced or removed, for
+    example to invalidate a cache of the outputs. The listener is called from the
+    thread that wrote the output, which is often a worker thread.
+    """
+
+    _output_listeners.append(listener)
+
+
+def remove_output_listener(listener: Callable[[str], None]) -> None:
+    """Stop calling a listener added with add_output_listener."""
+    _output_listeners.remove(listener)
+
+
+def notify_output_listeners(path: str) -> None:
+    """Tell every output listener that the output at the path changed."""
+    for listener in list(_output_listeners):
+        listener(path)
+
+
+# PRIVATE FUNCTIONS START HERE
+def _write_items(
+    write: Callable[[str], None], items: Iterable[Mapping[str, Any]]
+) -> None:
+    """Write the items as comma separated JSON, batching the writes."""
+    batch: List[str] = []
+    is_first_batch: bool = True
+
+    for item in items:
+        batch.append(dumps(item))
+
+        if len(batch) == WRITE_BATCH_SIZE:
+            write(("" if is_first_batch else ", ") + ", ".join(batch))
+            batch = []
+            is_first_batch = False
+
+    if batch:
+        write(("" if is_first_batch else ", ") + ", ".join(batch))
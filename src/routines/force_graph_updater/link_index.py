@@ -0,0 +1,408 @@
+"""
+file_name = link_index.py
+Created On: 2026/10/18
+Lasted Updated: 2026/10/18
+Description: An in-memory index of the resolved links of a vault, answering what links
+    to a note, what a note links to, which of its links are broken and which notes are
+    orphans without reading the vault again. It is patched after every run with only
+    the nodes whose links changed.
+Edit Log:
+2026/10/18
+    - Created file
+    - Lock the queries against applied diffs, so diffs apply on a worker thread
+    - Compare the distinct link targets, repeated links are not a change
+"""
+
+# STANDARD LIBRARY IMPORTS
+from array import array
+from bisect import bisect_left, insort
+from sys import intern
+from threading import Lock
+from typing import Collection, Dict, Iterable, List, Sequence, Set, Tuple, TypedDict
+
+# THIRD PARTY LIBRARY IMPORTS
+
+# LOCAL LIBRARY IMPORTS
+
+
+class LinkIndexNode:
+    """
+    A note or file of the link index. The links and backlinks are sorted arrays of the
+    node ids of the link index, which stay the same between runs.
+    """
+
+    __slots__ = ("name", "is_note", "links", "backlinks", "broken_links")
+
+    def __init__(self, name: str, is_note: bool) -> None:
+        self.name: str = name
+        self.is_note: bool = is_note
+        self.links: array = array("I")
+        self.backlinks: array = array("I")
+        # The link targets of the note that do not resolve to a note or file
+        self.broken_links: Tuple[str, ...] = ()
+
+
+class LinkIndexDiff(TypedDict):
+    """The changes between the link index and the resolved graph of a run."""
+
+    # The added nodes and the nodes that became or stopped being a note, with whether
+    # they are a note
+    updated_nodes: Dict[str, bool]
+    removed_nodes: Set[str]
+    # The names of every node a node with changed links now links to
+    changed_links: Dict[str, List[str]]
+    changed_broken_links: Dict[str, Tuple[str, ...]]
+
+
+class LinkIndex:
+    """
+    The links between the notes and files of a vault, with interned names and integer
+    node ids. Queries are dictionary lookups that only touch the queried node. Loads
+    and applied diffs hold a lock the queries wait for, so they can run on a worker
+    thread without a query seeing a half-patched index.
+
+    Usage:
+        link_index.load(node_names, note_count, link_sources, link_targets, {})
+        link_index.backlinks("Note")
+        link_index_diff = link_index.diff(node_names, note_count, sources, targets, {})
+        link_index.apply(link_index_diff)
+    """
+
+    __slots__ = (
+        "_nodes",
+        "_node_ids",
+        "_free_node_ids",
+        "_orphan_ids",
+        "_broken_link_ids",
+        "_orphans",
+        "_is_loaded",
+        "_lock",
+    )
+
+    def __init__(self) -> None:
+        # Indexed by node id, the ids of removed nodes are None until they are reused
+        self._nodes: List[LinkIndexNode | None] = []
+        self._node_ids: Dict[str, int] = {}
+        self._free_node_ids: List[int] = []
+        self._orphan_ids: Set[int] = set()
+        self._broken_link_ids: Set[int] = set()
+        self._orphans: List[str] | None = None
+        self._is_loaded: bool = False
+        self._lock = Lock()
+
+    @property
+    def is_loaded(self) -> bool:
+        """Whether the index was loaded, a loaded index is kept current with diffs."""
+        return self._is_loaded
+
+    def __len__(self) -> int:
+        return len(self._node_ids)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._node_ids
+
+    def load(
+        self,
+        node_names: Sequence[str],
+        note_count: int,
+        link_sources: Sequence[int],
+        link_targets: Sequence[int],
+        broken_links: Dict[int, Collection[str]],
+    ) -> None:
+        """
+        Build the whole index from the resolved graph of a run, which is a lot faster
+        than applying a diff that adds every node. The built index replaces the current
+        one at the end, so this can run on a worker thread. The arguments are the same
+        as the ones of diff.
+        """
+
+        targets_by_source: List[List[int]] = [[] for _ in node_names]
+        sources_by_target: List[List[int]] = [[] for _ in node_names]
+
+        for source, target in zip(link_sources, link_targets):
+            targets_by_source[source].append(target)
+            sources_by_target[target].append(source)
+
+        nodes: List[LinkIndexNode | None] = []
+        orphan_ids: Set[int] = set()
+
+        for node_id, (name, targets, sources) in enumerate(
+            zip(node_names, targets_by_source, sources_by_target)
+        ):
+            node = LinkIndexNode(intern(name), node_id < note_count)
+            # Notes with the same name share a node and can link to the same node
+            node.links = array("I", sorted(set(targets)))
+            node.backlinks = array("I", sorted(set(sources)))
+            node.broken_links = tuple(sorted(broken_links.get(node_id, ())))
+            nodes.append(node)
+
+            if node.is_note and not targets and not sources:
+                orphan_ids.add(node_id)
+
+        node_ids: Dict[str, int] = {
+            node_name: node_id for node_id, node_name in enumerate(node_names)
+        }
+
+        with self._lock:
+            self._node_ids = node_ids
+            self._nodes = nodes
+            self._free_node_ids = []
+            self._orphan_ids = orphan_ids
+            self._broken_link_ids = {
+                node_id for node_id, links in broken_links.items() if links
+            }
+            self._orphans = None
+            self._is_loaded = True
+
+    def unload(self) -> None:
+        """Drop every node, so the whole index is loaded again."""
+        with self._lock:
+            self._nodes = []
+            self._node_ids = {}
+            self._free_node_ids = []
+            self._orphan_ids = set()
+            self._broken_link_ids = set()
+            self._orphans = None
+            self._is_loaded = False
+
+    def links(self, name: str) -> List[str]:
+        """
+        The names of the notes and files a note links to.
+
+        Raises:
+            KeyError: If there is no note or file with the name.
+        """
+
+        with self._lock:
+            return self._get_names(self._get_node(name).links)
+
+    def backlinks(self, name: str) -> List[str]:
+        """
+        The names of the notes that link to a note or file.
+
+        Raises:
+            KeyError: If there is no note or file with the name.
+        """
+
+        with self._lock:
+            return self._get_names(self._get_node(name).backlinks)
+
+    def broken_links(self, name: str) -> List[str]:
+        """
+        The link targets of a note that do not resolve to any note or file.
+
+        Raises:
+            KeyError: If there is no note or file with the name.
+        """
+
+        with self._lock:
+            return list(self._get_node(name).broken_links)
+
+    def all_broken_links(self) -> Dict[str, List[str]]:
+        """The broken link targets of every note that has any, keyed by note name."""
+        broken_links: Dict[str, List[str]] = {}
+
+        with self._lock:
+            for node_id in self._broken_link_ids:
+                node: LinkIndexNode = self._get_node_by_id(node_id)
+                broken_links[node.name] = list(node.broken_links)
+
+        return broken_links
+
+    def orphans(self) -> List[str]:
+        """The names of the notes without links and backlinks, sorted."""
+        with self._lock:
+            if self._orphans is None:
+                self._orphans = self._get_names(self._orphan_ids)
+
+            return list(self._orphans)
+
+    def diff(
+        self,
+        node_names: Sequence[str],
+        note_count: int,
+        link_sources: Sequence[int],
+        link_targets: Sequence[int],
+        broken_links: Dict[int, Collection[str]],
+    ) -> LinkIndexDiff:
+        """
+        Compare the index with the resolved graph of a run. The index is only read, so
+        this runs without the lock while the index is queried. Only the thread that
+        applies the diffs may call it.
+
+        Args:
+            node_names: The distinct node names, indexed by the node id of the run.
+            note_count: The nodes with an id below the note count are notes, the rest
+            are other files of the vault.
+            link_sources: The source node id of every link.
+            link_targets: The target node id of every link.
+            broken_links: The broken link targets of the notes that have any, keyed by
+            node id.
+
+        Returns:
+            The nodes whose links changed since the last applied diff.
+        """
+
+        node_ids: Dict[str, int] = self._node_ids
+        nodes: List[LinkIndexNode | None] = self._nodes
+        # The ids of the index, -1 for the nodes that are not in the index yet
+        index_ids: List[int] = [node_ids.get(name, -1) for name in node_names]
+        targets_by_source: List[List[int]] = [[] for _ in node_names]
+
+        for source, target in zip(link_sources, link_targets):
+            targets_by_source[source].append(target)
+
+        diff: LinkIndexDiff = {
+            "updated_nodes": {},
+            "removed_nodes": set(node_ids).difference(node_names),
+            "changed_links": {},
+            "changed_broken_links": {},
+        }
+
+        for node_id, name in enumerate(node_names):
+            index_id: int = index_ids[node_id]
+            node: LinkIndexNode | None = nodes[index_id] if index_id >= 0 else None
+            is_note: bool = node_id < note_count
+            targets: List[int] = targets_by_source[node_id]
+            node_broken_links: Tuple[str, ...] = tuple(
+                sorted(broken_links.get(node_id, ()))
+            )
+
+            if node is None or node.is_note != is_note:
+                diff["updated_nodes"][name] = is_note
+
+            if node is None:
+                if targets:
+                    diff["changed_links"][name] = [node_names[t] for t in targets]
+
+                if node_broken_links:
+                    diff["changed_broken_links"][name] = node_broken_links
+
+                continue
+
+            # A target that is not in the index yet sorts first as -1, a note links to
+            # a node once however many of its links resolve to it
+            if node.links.tolist() != sorted(set(map(index_ids.__getitem__, targets))):
+                diff["changed_links"][name] = [node_names[t] for t in targets]
+
+            if node.broken_links != node_broken_links:
+                diff["changed_broken_links"][name] = node_broken_links
+
+        for name in diff["removed_nodes"]:
+            removed_node: LinkIndexNode | None = nodes[node_ids[name]]
+            assert removed_node is not None
+
+            if removed_node.links:
+                diff["changed_links"][name] = []
+
+        return diff
+
+    def apply(self, diff: LinkIndexDiff) -> None:
+        """
+        Apply a diff to the index, only touching the changed nodes and the nodes they
+        link to or used to link to. Queries wait until the whole diff is applied.
+
+        Args:
+            diff: The diff returned by the last call to diff.
+        """
+
+        with self._lock:
+            nodes: List[LinkIndexNode | None] = self._nodes
+            node_ids: Dict[str, int] = self._node_ids
+            touched_ids: Set[int] = set()
+
+            for name, is_note in diff["updated_nodes"].items():
+                node_id: int | None = node_ids.get(name)
+
+                if node_id is None:
+                    touched_ids.add(self._add_node(name, is_note))
+                else:
+                    self._get_node(name).is_note = is_note
+                    touched_ids.add(node_id)
+
+            for name, target_names in diff["changed_links"].items():
+                source_id: int = node_ids[name]
+                node: LinkIndexNode = self._get_node(name)
+                links = array(
+                    "I", sorted({node_ids[target] for target in target_names})
+                )
+                old_links: Set[int] = set(node.links)
+                new_links: Set[int] = set(links)
+
+                for target_id in old_links - new_links:
+                    backlinks: array = self._get_node_by_id(target_id).backlinks
+                    del backlinks[bisect_left(backlinks, source_id)]
+
+                for target_id in new_links - old_links:
+                    insort(self._get_node_by_id(target_id).backlinks, source_id)
+
+                node.links = links
+                touched_ids.add(source_id)
+                touched_ids |= old_links ^ new_links
+
+            for name, broken_links in diff["changed_broken_links"].items():
+                self._get_node(name).broken_links = broken_links
+
+                if broken_links:
+                    self._broken_link_ids.add(node_ids[name])
+                else:
+                    self._broken_link_ids.discard(node_ids[name])
+
+            for name in diff["removed_nodes"]:
+                removed_id: int = node_ids.pop(name)
+                nodes[removed_id] = None
+                self._free_node_ids.append(removed_id)
+                self._orphan_ids.discard(removed_id)
+                self._broken_link_ids.discard(removed_id)
+                touched_ids.discard(removed_id)
+
+            for node_id in touched_ids:
+                touched_node: LinkIndexNode = self._get_node_by_id(node_id)
+
+                if (
+                    touched_node.is_note
+                    and not touched_node.links
+                    and not touched_node.backlinks
+                ):
+                    self._orphan_ids.add(node_id)
+                else:
+                    self._orphan_ids.discard(node_id)
+
+            self._orphans = None
+            self._is_loaded = True
+
+    # PRIVATE METHODS START HERE
+    def _add_node(self, name: str, is_note: bool) -> int:
+        """Add a node without links, reusing the id of a removed node if there is one."""
+        name = intern(name)
+        node = LinkIndexNode(name, is_note)
+
+        if self._free_node_ids:
+            node_id: int = self._free_node_ids.pop()
+            self._nodes[node_id] = node
+        else:
+            node_id = len(self._nodes)
+            self._nodes.append(node)
+
+        self._node_ids[name] = node_id
+
+        return node_id
+
+    def _get_node(self, name: str) -> LinkIndexNode:
+        """Get the node of a name, raising a KeyError if there is none."""
+        node_id: int | None = self._node_ids.get(name)
+
+        if node_id is None:
+            raise KeyError(f"{name} is not a note or file of the vault")
+
+        return self._get_node_by_id(node_id)
+
+    def _get_node_by_id(self, node_id: int) -> LinkIndexNode:
+        node: LinkIndexNode | None = self._nodes[node_id]
+        assert node is not None
+
+        return node
+
+    def _get_names(self, node_ids: Iterable[int]) -> List[str]:
+        """The sorted names of the nodes of the node ids."""
+        return sorted(self._get_node_by_id(node_id).name for node_id in node_ids)
@@ -0,0 +1,97 @@
+"""
+file_name = note_resolver.py
+Created On: 2026/10/18
+Lasted Updated: 2026/10/18
+Description: Resolves obsidian [[links]] to the notes of a vault in constant time.
+Edit Log:
+2026/10/18
+    - Created file
+"""
+
+# STANDARD LIBRARY IMPORTS
+from os.path import relpath
+from typing import Dict, Iterable
+
+# THIRD PARTY LIBRARY IMPORTS
+
+# LOCAL LIBRARY IMPORTS
+
+
+class NoteResolver:
+    """
+    A hash index of the notes of a vault, built once per run. Links are resolved the
+    way obsidian does it: by exact note name first, then case-insensitively by name,
+    by (partial) path inside the vault and finally by frontmatter alias.
+    """
+
+    def __init__(self, vault_path: str) -> None:
+        self._vault_path = vault_path
+        self._names: Dict[str, str] = {}
+        self._folded_names: Dict[str, str] = {}
+        self._folded_paths: Dict[str, str] = {}
+        self._folded_aliases: Dict[str, str] = {}
+
+    def add_note(self, path: str, note_name: str, aliases: Iterable[str] = ()) -> None:
+        """
+        Add a note to the index.
+
+        Args:
+            path: The path to the markdown file of the note.
+            note_name: The name of the note, which is also its node id in the graph.
+            aliases: The aliases declared in the frontmatter of the note.
+        """
+
+        self._names.setdefault(note_name, note_name)
+        self._folded_names.setdefault(note_name.casefold(), note_name)
+
+        # "sub/deep/Note.md" can be linked as "Note", "deep/Note" or "sub/deep/Note"
+        path_parts = self._normalize(relpath(path, self._vault_path)).split("/")
+
+        for index in range(len(path_parts) - 1):
+            self._folded_paths.setdefault("/".join(path_parts[index:]), note_name)
+
+        for alias in aliases:
+            self._folded_aliases.setdefault(alias.casefold(), note_name)
+
+    def resolve(self, link: str) -> str | None:
+        """
+        Resolve a link to the name of the note it points to.
+
+        Args:
+            link: The link target, without any #heading or |alias suffix.
+
+        Returns:
+            The name of the linked note, or None if the note does not exist.
+        """
+
+        note_name: str | None = self._names.get(link)
+
+        if note_name is not None:
+            return note_name
+
+        folded_link: str = self._normalize(link)
+
+        return (
+            self._folded_names.get(folded_link)
+            or self._folded_paths.get(folded_link)
+            or self._folded_aliases.get(folded_link)
+        )
+
+    def __contains__(self, link: str) -> bool:
+        return self.resolve(link) is not None
+
+    # PRIVATE METHODS START HERE
+    @staticmethod
+    def _normalize(link: str) -> str:
+        """Case fold a link or path and strip its leading "./" and ".md" extension."""
+        link = link.replace("\\", "/").strip().casefold()
+
+        if link.startswith("./"):
+            link = link[2:]
+
+        link = link.lstrip("/")
+
+        if link.endswith(".md"):
+            link = link[:-3]
+
+        return link
@@ -1,94 +1,204 @@
 """
 file_name = routine.py
 Created On: 2024/06/27
-Lasted Updated: 2024/06/27
+Lasted Updated: 2026/10/18
 Description: _FILL OUT HERE_
 Edit Log:
 2024/06/27
     - Created file
+2026/10/18
+    - Configurable extraction worker count and parallel threshold
+    - Pull and update every vault concurrently with bounded git concurrency
+    - Run when a vault changes, keeping the 30 minute interval as a fallback
+    - Optional compressed sibling of the force graph output
+    - Optional binary graph output
+    - Time out after an hour, queue overlapping runs in the disk-heavy group
+    - Cache the vault config and force graphs until the config file changes
+    - Update vaults concurrently with a limit, a failed vault does not stop the rest
+    - Configurable history and compaction of the graph deltas
+    - Optional port and host of the graph server in the vault JSON file
+    - Look up the link index of a vault by its save name
+    - Read the vault JSON file through the vault config module
+    - Log the phase durations of every vault update
+    - Run at most 5 minutes after a change while a vault keeps changing
 """
 
 # STANDARD LIBRARY IMPORTS
-from json import load
-from os.path import abspath, dirname, join
-from typing import List, TypedDict, Set, cast
+from logging import Logger, getLogger
+from os.path import join
+from typing import List, Tuple, Set, cast
 
 # THIRD PARTY LIBRARY IMPORTS
+from asyncio import Semaphore, gather
 
 # LOCAL LIBRARY IMPORTS
 from src.routines.force_graph_updater.force_graph import ForceGraph
+from src.routines.force_graph_updater.git_sync import DEFAULT_GIT_TIMEOUT
+from src.routines.force_graph_updater.graph_delta import (
+    DEFAULT_DELTA_COMPACTION_SIZE,
+    DEFAULT_DELTA_HISTORY,
+)
+from src.routines.force_graph_updater.link_extractor import DEFAULT_PARALLEL_THRESHOLD
+from src.routines.force_graph_updater.link_index import LinkIndex
+from src.routines.force_graph_updater.vault_config import (
+    VaultDataJson,
+    VaultJson,
+    get_vault_json,
+    get_vault_paths,
+)
 from src.routines.routine_decorator import RoutineDecorator, Seconds
+from src.routines.routine_profiling import summarize_phases
 
 
-class VaultDataJson(TypedDict):
-    """
-    The data structure of the vaults object in the vaults json file
-    """
+DEFAULT_GIT_CONCURRENCY: int = 4
+DEFAULT_VAULT_CONCURRENCY: int = 4
 
-    save_name: str
-    path: str
+TASK_NAME = "force_graph_routine"
 
+logger: Logger = getLogger(TASK_NAME)
 
-class VaultJson(TypedDict):
-    """The data structure of the vault json"""
-
-    data_directory: str
-    vaults: List[VaultDataJson]
+# The loaded vault JSON with the force graphs built from it
+_force_graph_list_cache: Tuple[VaultJson, List[ForceGraph]] | None = None
 
 
 def get_force_graph_list() -> List[ForceGraph]:
-    """Get the list of force graph objects from the force graph JSON file."""
+    """
+    Get the list of force graph objects from the force graph JSON file. The objects
+    live until the file changes, so their file indexes stay warm between runs.
+    """
+    global _force_graph_list_cache  # pylint: disable=global-statement
 
-    force_graphs: List[ForceGraph] = []
-    force_graph_json_directory_path = join(
-        dirname(abspath(__file__)), "obsidian_vaults.json"
-    )
+    vault_json: VaultJson = get_vault_json()
 
-    # TODO CHECH FOR SAME SAVE NAME
+    if _force_graph_list_cache is not None and _force_graph_list_cache[0] is vault_json:
+        return _force_graph_list_cache[1]
 
+    force_graphs: List[ForceGraph] = []
     save_paths: Set[str] = set()
     obsidian_vaults: Set[str] = set()
 
-    with open(
-        force_graph_json_directory_path,
-        "r",
-        encoding="UTF-8",
-    ) as file:
-        vault_json: VaultJson = load(file)
+    data_directory: str = vault_json["data_directory"]
+    vaults: List[VaultDataJson] = vault_json["vaults"]
+    git_semaphore = Semaphore(
+        vault_json.get("git_concurrency", DEFAULT_GIT_CONCURRENCY)
+    )
 
-        data_directory: str = vault_json["data_directory"]
-        vaults: List[VaultDataJson] = vault_json["vaults"]
+    for vault in vaults:
+        save_path: str = join(data_directory, vault["save_name"])
 
-        for vault in vaults:
-            save_path: str = join(data_directory, vault["save_name"])
+        if save_path in save_paths:
+            raise ValueError(f"Duplicate save path: {save_path}")
 
-            if save_path in save_paths:
-                raise ValueError(f"Duplicate save path: {save_path}")
+        save_paths.add(save_path)
 
-            save_paths.add(save_path)
+        vault_path: str = vault["path"]
 
-            vault_path: str = vault["path"]
+        if vault_path in obsidian_vaults:
+            raise ValueError(f"Duplicate vault path: {vault_path}")
 
-            if vault_path in obsidian_vaults:
-                raise ValueError(f"Duplicate vault path: {vault_path}")
+        obsidian_vaults.add(vault_path)
 
-            obsidian_vaults.add(vault_path)
+        force_graph = ForceGraph(
+            save_path,
+            vault_path,
+            vault_json.get("extraction_workers"),
+            vault_json.get("parallel_threshold", DEFAULT_PARALLEL_THRESHOLD),
+            vault_json.get("git_timeout", DEFAULT_GIT_TIMEOUT),
+            git_semaphore,
+            vault_json.get("output_compression"),
+            vault_json.get("binary_output", False),
+            delta_history=vault_json.get("delta_history", DEFAULT_DELTA_HISTORY),
+            delta_compaction_size=vault_json.get(
+                "delta_compaction_size", DEFAULT_DELTA_COMPACTION_SIZE
+            ),
+        )
+        force_graphs.append(force_graph)
 
-            force_graph = ForceGraph(save_path, vault_path)
-            force_graphs.append(force_graph)
+    _force_graph_list_cache = (vault_json, force_graphs)
 
     return force_graphs
 
 
+def get_link_index(save_name: str) -> LinkIndex:
+    """
+    Get the link index of a vault, which is empty until its force graph was updated
+    once by this process.
+
+    Raises:
+        KeyError: If no vault has the save name.
+    """
+
+    save_path: str = join(get_vault_json()["data_directory"], save_name)
+
+    for force_graph in get_force_graph_list():
+        if force_graph.force_graph_json_path == save_path:
+            return force_graph.link_index
+
+    raise KeyError(f"No vault with the save name {save_name}")
+
+
+async def update_force_graph(force_graph: ForceGraph, semaphore: Semaphore) -> bool:
+    """
+    Update a single force graph once the semaphore lets it, logging how long every
+    phase of the update took.
+
+    Returns:
+        Whether the update succeeded, a failure is logged instead of raised so it
+        does not abort the updates of the other vaults.
+    """
+
+    async with semaphore:
+        try:
+            await force_graph.update_force_graph_json()
+        except Exception:  # pylint: disable=broad-exception-caught
+            logger.exception(
+                "Failed to update the force graph of %s",
+                force_graph.obsidian_directory_path,
+            )
+            return False
+        finally:
+            logger.info(
+                "Force graph phases of %s: %s",
+                force_graph.obsidian_directory_path,
+                summarize_phases(force_graph.last_phase_durations),
+            )
+
+    return True
+
+
 @RoutineDecorator(
-    task_name="force_graph_routine", routine_metadata={"interval": cast(Seconds, 1800)}
-)  # Run every 30 minutes
+    task_name=TASK_NAME,
+    routine_metadata={
+        "interval": cast(Seconds, 1800),
+        "watch": {
+            "paths": get_vault_paths,
+            "debounce": cast(Seconds, 30),
+            "max_wait": cast(Seconds, 300),
+            "ignored_names": ForceGraph.folders_to_ignore,
+        },
+        "timeout": cast(Seconds, 3600),
+        "overlap": "queue",
+        "resource_group": "disk-heavy",
+    },
+)  # Run when a vault changes, or every 30 minutes
 async def routine() -> None:
     """
     The routine to update the force graph list
     """
 
     force_graph_list: List[ForceGraph] = get_force_graph_list()
+    semaphore = Semaphore(
+        get_vault_json().get("vault_concurrency", DEFAULT_VAULT_CONCURRENCY)
+    )
+
+    results: List[bool] = await gather(
+        *(
+            update_force_graph(force_graph, semaphore)
+            for force_graph in force_graph_list
+        )
+    )
 
-    for force_graph in force_graph_list:
-        force_graph.update_force_graph_json()
+    if not all(results):
+        raise RuntimeError(
+            f"{results.count(False)} of {len(results)} force graphs failed to update"
+        )
@@ -0,0 +1,73 @@
+"""
+file_name = vault_config.py
+Created On: 2026/10/18
+Lasted Updated: 2026/10/18
+Description: The vault JSON file that configures the force graph and graph server
+    routines. It has no heavy imports, so reading the config does not import the force
+    graph.
+Edit Log:
+2026/10/18
+    - Created file
+"""
+
+# STANDARD LIBRARY IMPORTS
+from json import load
+from os import stat
+from os.path import abspath, dirname, join
+from typing import List, NotRequired, Tuple, TypedDict
+
+# THIRD PARTY LIBRARY IMPORTS
+
+# LOCAL LIBRARY IMPORTS
+
+
+class VaultDataJson(TypedDict):
+    """
+    The data structure of the vaults object in the vaults json file
+    """
+
+    save_name: str
+    path: str
+
+
+class VaultJson(TypedDict):
+    """The data structure of the vault json"""
+
+    data_directory: str
+    vaults: List[VaultDataJson]
+    extraction_workers: NotRequired[int]
+    parallel_threshold: NotRequired[int]
+    git_timeout: NotRequired[float]
+    git_concurrency: NotRequired[int]
+    output_compression: NotRequired[str]
+    binary_output: NotRequired[bool]
+    vault_concurrency: NotRequired[int]
+    delta_history: NotRequired[int]
+    delta_compaction_size: NotRequired[int]
+    graph_server_port: NotRequired[int]
+    graph_server_host: NotRequired[str]
+
+
+VAULT_JSON_PATH: str = join(dirname(abspath(__file__)), "obsidian_vaults.json")
+
+# The modification time of the vault JSON file with what was loaded from it
+_vault_json_cache: Tuple[float, VaultJson] | None = None
+
+
+def get_vault_json() -> VaultJson:
+    """Get the vault JSON file, only loading it again when it changed."""
+    global _vault_json_cache  # pylint: disable=global-statement
+
+    modified_time: float = stat(VAULT_JSON_PATH).st_mtime
+
+    if _vault_json_cache is None or _vault_json_cache[0] != modified_time:
+        with open(VAULT_JSON_PATH, "r", encoding="UTF-8") as file:
+            _vault_json_cache = (modified_time, load(file))
+
+    return _vault_json_cache[1]
+
+
+def get_vault_paths() -> List[str]:
+    """Get the paths of the obsidian vaults from the force graph JSON file."""
+
+    return [vault["path"] for vault in get_vault_json()["vaults"]]
@@ -0,0 +1,584 @@
+"""
+file_name = graph_server.py
+Created On: 2026/10/18
+Lasted Updated: 2026/10/18
+Description: A small asyncio HTTP server for the force graph outputs, with an in-memory
+    cache of pre-compressed responses, ETags, byte ranges and sendfile for large
+    snapshots, so clients polling the graph cost almost nothing.
+Edit Log:
+2026/10/18
+    - Created file
+    - Check the cached files against the files on disk, written by any process
+    - Import the names of the delta outputs without the delta log and NumPy
+"""
+
+# STANDARD LIBRARY IMPORTS
+from gzip import compress
+from os import fstat, stat, stat_result
+from os.path import exists, join
+from re import Match, escape, fullmatch
+from typing import IO, Dict, Iterable, List, Set, Tuple
+
+# THIRD PARTY LIBRARY IMPORTS
+from asyncio import AbstractEventLoop, Server, StreamReader, StreamWriter
+from asyncio import IncompleteReadError, LimitOverrunError
+from asyncio import TimeoutError as AsyncTimeoutError
+from asyncio import get_running_loop, start_server, to_thread, wait_for
+
+# LOCAL LIBRARY IMPORTS
+from src.routines.force_graph_updater.binary_graph import BINARY_GRAPH_EXTENSION
+from src.routines.force_graph_updater.graph_writer import (
+    COMPRESSION_EXTENSIONS,
+    DELTA_DIRECTORY_SUFFIX,
+    DELTA_MANIFEST_NAME,
+    add_output_listener,
+    remove_output_listener,
+)
+
+DEFAULT_GRAPH_SERVER_HOST: str = "127.0.0.1"
+
+# Files up to this size are cached in memory with a gzip copy, larger files are sent
+# from disk with sendfile, compressed only if the force graph wrote a .gz sibling
+MEMORY_CACHE_FILE_LIMIT: int = 8 * 1024 * 1024
+
+# The seconds to wait for the next request on a connection before closing it
+KEEP_ALIVE_TIMEOUT: float = 15
+
+GZIP_LEVEL: int = 6
+
+GZIP_EXTENSION: str = COMPRESSION_EXTENSIONS["gzip"]
+
+# /<save_name> followed by the suffix of a graph output
+GRAPH_PATH_PATTERN: str = (
+    rf"/([^/]+?)(\.json|{escape(BINARY_GRAPH_EXTENSION)}"
+    rf"|\.json{escape(DELTA_DIRECTORY_SUFFIX)}/(?:[0-9]+-[0-9]+\.json"
+    rf"|{escape(DELTA_MANIFEST_NAME)}))"
+)
+
+CONTENT_TYPES: Dict[str, str] = {
+    ".json": "application/json",
+    BINARY_GRAPH_EXTENSION: "application/octet-stream",
+}
+
+
+class CachedGraphFile:
+    """A graph file in memory, with its gzip copy and their ETags."""
+
+    __slots__ = ("body", "identity", "etag", "gzip_body", "gzip_etag")
+
+    def __init__(self, body: bytes, file_stat: stat_result) -> None:
+        self.body = body
+        self.identity: Tuple[int, int, int] = _get_identity(file_stat)
+        self.etag: str = _get_etag(file_stat)
+        self.gzip_body: bytes = compress(body, GZIP_LEVEL, mtime=0)
+        self.gzip_etag: str = _get_etag(file_stat, "-gzip")
+
+
+class GraphResponse:
+    """The representation of a graph file that answers a request."""
+
+    __slots__ = ("status", "headers", "body", "file", "offset", "length")
+
+    def __init__(
+        self,
+        status: str,
+        headers: List[Tuple[str, str]] | None = None,
+        body: bytes = b"",
+        file: IO[bytes] | None = None,
+        offset: int = 0,
+        length: int | None = None,
+    ) -> None:
+        self.status = status
+        self.headers: List[Tuple[str, str]] = headers or []
+        self.body = body
+        # A file is sent with sendfile instead of the body
+        self.file = file
+        self.offset = offset
+        self.length: int = len(body) if length is None else length
+
+
+class GraphServer:
+    """
+    Serves the force graph outputs of the vaults in the data directory over HTTP/1.1:
+    /<save_name>.json, /<save_name>.fgb and the delta files and manifest under
+    /<save_name>.json.deltas/.
+
+    Every response carries a strong ETag, so a polling client that sends
+    If-None-Match gets an empty 304 until the graph changes. Clients that accept gzip
+    get a gzip copy compressed once per version, and a single byte range of the
+    uncompressed file can be requested with Range. Files are read into the cache on
+    their first request. Every request of a cached file compares its inode,
+    modification time and size with the file on disk, so outputs another process
+    replaces or removes are read again, and the force graph of this process drops
+    its outputs from the cache as it writes them.
+
+    Usage:
+        graph_server = GraphServer("/data", {"vault_1"}, 8765)
+        await graph_server.start()
+        ...
+        await graph_server.close()
+    """
+
+    def __init__(
+        self,
+        data_directory: str,
+        save_names: Iterable[str],
+        port: int,
+        host: str = DEFAULT_GRAPH_SERVER_HOST,
+    ) -> None:
+        self._data_directory = data_directory
+        self._save_names: Set[str] = set(save_names)
+        self._port = port
+        self._host = host
+        self._server: Server | None = None
+        self._loop: AbstractEventLoop | None = None
+        self._cache: Dict[str, CachedGraphFile] = {}
+        # Bumped on every invalidation, a read that started before is not cached
+        self._generations: Dict[str, int] = {}
+        self._writers: Set[StreamWriter] = set()
+
+    async def start(self) -> None:
+        """Start listening and invalidating the cache on every written output."""
+        self._loop = get_running_loop()
+        add_output_listener(self._on_output_changed)
+
+        try:
+            self._server = await start_server(
+                self._handle_client, self._host, self._port
+            )
+        except BaseException:
+            remove_output_listener(self._on_output_changed)
+            raise
+
+    async def close(self) -> None:
+        """Stop listening, close the idle keep-alive connections and wait for the rest."""
+        if self._server is None:
+            return
+
+        remove_output_listener(self._on_output_changed)
+        self._server.close()
+
+        for writer in self._writers:
+            writer.close()
+
+        await self._server.wait_closed()
+        self._server = None
+        self._cache = {}
+
+    async def get_response(
+        self, method: str, target: str, headers: Dict[str, str]
+    ) -> GraphResponse:
+        """
+        Build the response to a request. The file of a sendfile response has to be
+        closed by the caller.
+
+        Args:
+            method: The request method.
+            target: The request target, the path with an optional query.
+            headers: The request headers, with lowercase names.
+        """
+
+        if method not in ("GET", "HEAD"):
+            return GraphResponse("405 Method Not Allowed", [("Allow", "GET, HEAD")])
+
+        file_path: str | None = self._get_file_path(target.split("?", 1)[0])
+
+        if file_path is None:
+            return GraphResponse("404 Not Found")
+
+        accepts_gzip: bool = _accepts_gzip(headers.get("accept-encoding", ""))
+        range_header: str | None = headers.get("range")
+        cached_file: CachedGraphFile | None = self._cache.get(file_path)
+
+        if cached_file is not None and not _is_current(file_path, cached_file):
+            self._invalidate(file_path)
+            cached_file = None
+
+        if cached_file is None:
+            cached_file, file = await to_thread(
+                self._load_file, file_path, self._generations.get(file_path)
+            )
+
+            if file is not None:
+                return await to_thread(
+                    self._get_file_response,
+                    file,
+                    file_path,
+                    headers,
+                    accepts_gzip and range_header is None,
+                )
+
+            if cached_file is None:
+                return GraphResponse("404 Not Found")
+
+        response_headers: List[Tuple[str, str]] = [
+            ("Content-Type", _get_content_type(file_path)),
+            ("Cache-Control", "no-cache"),
+            ("Vary", "Accept-Encoding"),
+        ]
+
+        if _matches_etag(
+            headers.get("if-none-match"), (cached_file.etag, cached_file.gzip_etag)
+        ):
+            return GraphResponse(
+                "304 Not Modified",
+                response_headers
+                + [
+                    (
+                        "ETag",
+                        cached_file.gzip_etag if accepts_gzip else cached_file.etag,
+                    )
+                ],
+            )
+
+        if range_header is not None and headers.get("if-range") in (
+            None,
+            cached_file.etag,
+        ):
+            range_response: GraphResponse | None = _get_range_response(
+                range_header,
+                len(cached_file.body),
+                response_headers + [("ETag", cached_file.etag)],
+                cached_file.body,
+            )
+
+            if range_response is not None:
+                return range_response
+
+        if accepts_gzip:
+            return GraphResponse(
+                "200 OK",
+                response_headers
+                + [("ETag", cached_file.gzip_etag), ("Content-Encoding", "gzip")],
+                cached_file.gzip_body,
+            )
+
+        return GraphResponse(
+            "200 OK", response_headers + [("ETag", cached_file.etag)], cached_file.body
+        )
+
+    # PRIVATE METHODS START HERE
+    async def _handle_client(self, reader: StreamReader, writer: StreamWriter) -> None:
+        """Answer the requests of a connection until it closes or idles."""
+        self._writers.add(writer)
+
+        try:
+            while True:
+                try:
+                    request_head: bytes = await wait_for(
+                        reader.readuntil(b"\r\n\r\n"), KEEP_ALIVE_TIMEOUT
+                    )
+                except (AsyncTimeoutError, IncompleteReadError, LimitOverrunError):
+                    return
+
+                lines: List[str] = request_head.decode("latin-1").split("\r\n")
+                request_line: List[str] = lines[0].split()
+                headers: Dict[str, str] = {}
+
+                for line in lines[1:]:
+                    name, _, value = line.partition(":")
+
+                    if name:
+                        headers[name.strip().lower()] = value.strip()
+
+                if len(request_line) != 3:
+                    await self._write_response(
+                        writer, GraphResponse("400 Bad Request"), False, False
+                    )
+                    return
+
+                method, target, version = request_line
+                # Request bodies are not read, so a connection with one is not reused
+                keep_alive: bool = (
+                    version == "HTTP/1.1"
+                    and headers.get("connection", "").lower() != "close"
+                    and headers.get("content-length", "0") == "0"
+                    and "transfer-encoding" not in headers
+                )
+                response: GraphResponse = await self.get_response(
+                    method, target, headers
+                )
+
+                try:
+                    await self._write_response(
+                        writer, response, method == "HEAD", keep_alive
+                    )
+                finally:
+                    if response.file is not None:
+                        response.file.close()
+
+                if not keep_alive:
+                    return
+        except ConnectionError:
+            pass
+        finally:
+            self._writers.discard(writer)
+            writer.close()
+
+    async def _write_response(
+        self,
+        writer: StreamWriter,
+        response: GraphResponse,
+        is_head: bool,
+        keep_alive: bool,
+    ) -> None:
+        """Write a response, sending its file with sendfile."""
+        head_lines: List[str] = [f"HTTP/1.1 {response.status}"]
+        head_lines += [f"{name}: {value}" for name, value in response.headers]
+        head_lines.append(f"Content-Length: {response.length}")
+        head_lines.append(f"Connection: {'keep-alive' if keep_alive else 'close'}")
+        writer.write(("\r\n".join(head_lines) + "\r\n\r\n").encode("latin-1"))
+
+        if is_head or not response.length:
+            await writer.drain()
+            return
+
+        if response.file is None:
+            writer.write(response.body)
+            await writer.drain()
+            return
+
+        await writer.drain()
+        assert self._loop is not None
+        await self._loop.sendfile(
+            writer.transport, response.file, response.offset, response.length
+        )
+
+    def _get_file_path(self, path: str) -> str | None:
+        """Get the file of a request path, None if it is not a graph output."""
+        match: Match[str] | None = fullmatch(GRAPH_PATH_PATTERN, path)
+
+        if match is None or match.group(1) not in self._save_names:
+            return None
+
+        return join(self._data_directory, match.group(1) + match.group(2))
+
+    def _load_file(
+        self, file_path: str, generation: int | None
+    ) -> Tuple[CachedGraphFile | None, IO[bytes] | None]:
+        """
+        Open a graph file on a worker thread. A small file is read and cached, a large
+        file is returned open to be sent with sendfile.
+
+        Args:
+            file_path: The path of the graph file.
+            generation: The invalidation generation of the file before it was opened.
+
+        Returns:
+            The cached file or the open file, both None if the file does not exist.
+        """
+
+        try:
+            file: IO[bytes] = open(file_path, "rb")
+        except (FileNotFoundError, IsADirectoryError):
+            return None, None
+
+        file_stat: stat_result = fstat(file.fileno())
+
+        if file_stat.st_size > MEMORY_CACHE_FILE_LIMIT:
+            return None, file
+
+        with file:
+            cached_file = CachedGraphFile(file.read(), file_stat)
+
+        assert self._loop is not None
+        self._loop.call_soon_threadsafe(
+            self._store_cached_file, file_path, cached_file, generation
+        )
+
+        return cached_file, None
+
+    def _store_cached_file(
+        self, file_path: str, cached_file: CachedGraphFile, generation: int | None
+    ) -> None:
+        """Cache a file read on a worker thread, unless it changed in the meantime."""
+        if self._generations.get(file_path) == generation:
+            self._cache[file_path] = cached_file
+
+    def _get_file_response(
+        self,
+        file: IO[bytes],
+        file_path: str,
+        headers: Dict[str, str],
+        use_gzip: bool,
+    ) -> GraphResponse:
+        """
+        Build the response for a file too large for the cache, sent from disk. The
+        gzip sibling the force graph writes next to the JSON file is sent when the
+        client accepts it.
+        """
+
+        gzip_path: str = file_path + GZIP_EXTENSION
+
+        if use_gzip and exists(gzip_path):
+            try:
+                gzip_file: IO[bytes] = open(gzip_path, "rb")
+            except FileNotFoundError:
+                pass
+            else:
+                file.close()
+                file = gzip_file
+
+        is_gzip: bool = file.name == gzip_path
+        file_stat: stat_result = fstat(file.fileno())
+        etag: str = _get_etag(file_stat, "-gzip" if is_gzip else "")
+        response_headers: List[Tuple[str, str]] = [
+            ("Content-Type", _get_content_type(file_path)),
+            ("Cache-Control", "no-cache"),
+            ("Vary", "Accept-Encoding"),
+            ("ETag", etag),
+        ]
+
+        if _matches_etag(headers.get("if-none-match"), (etag,)):
+            file.close()
+            return GraphResponse("304 Not Modified", response_headers)
+
+        if is_gzip:
+            return GraphResponse(
+                "200 OK",
+                response_headers + [("Content-Encoding", "gzip")],
+                file=file,
+                length=file_stat.st_size,
+            )
+
+        range_header: str | None = headers.get("range")
+
+        if range_header is not None and headers.get("if-range") in (None, etag):
+            range_response: GraphResponse | None = _get_range_response(
+                range_header, file_stat.st_size, response_headers
+            )
+
+            if range_response is not None:
+                if range_response.length:
+                    range_response.file = file
+                else:
+                    file.close()
+
+                return range_response
+
+        return GraphResponse(
+            "200 OK", response_headers, file=file, length=file_stat.st_size
+        )
+
+    def _on_output_changed(self, path: str) -> None:
+        """Drop a replaced or removed output from the cache, from any thread."""
+        if self._loop is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._invalidate, path)
+
+    def _invalidate(self, path: str) -> None:
+        """Drop a file from the cache on the event loop."""
+        self._generations[path] = self._generations.get(path, 0) + 1
+        self._cache.pop(path, None)
+
+
+# PRIVATE FUNCTIONS START HERE
+def _get_identity(file_stat: stat_result) -> Tuple[int, int, int]:
+    """The inode, modification time and size of a file version."""
+    return file_stat.st_ino, file_stat.st_mtime_ns, file_stat.st_size
+
+
+def _get_etag(file_stat: stat_result, suffix: str = "") -> str:
+    """
+    A strong ETag from the identity of a file version. Outputs are replaced, never
+    written in place, so every version has a new inode.
+    """
+
+    inode, mtime_ns, size = _get_identity(file_stat)
+
+    return f'"{inode:x}-{mtime_ns:x}-{size:x}{suffix}"'
+
+
+def _is_current(file_path: str, cached_file: CachedGraphFile) -> bool:
+    """
+    Whether a cached file is still the version on disk. A stat of a local file is
+    cheap enough to run on the event loop for every request.
+    """
+
+    try:
+        return _get_identity(stat(file_path)) == cached_file.identity
+    except OSError:
+        return False
+
+
+def _get_content_type(file_path: str) -> str:
+    """The content type of a graph file."""
+    for extension, content_type in CONTENT_TYPES.items():
+        if file_path.endswith(extension):
+            return content_type
+
+    return "application/octet-stream"
+
+
+def _accepts_gzip(accept_encoding: str) -> bool:
+    """Whether an Accept-Encoding header accepts gzip."""
+    for coding in accept_encoding.split(","):
+        name, _, parameters = coding.partition(";")
+
+        if name.strip().lower() in ("gzip", "*"):
+            return parameters.replace(" ", "") not in ("q=0", "q=0.0", "q=0.00")
+
+    return False
+
+
+def _matches_etag(if_none_match: str | None, etags: Tuple[str, ...]) -> bool:
+    """Whether an If-None-Match header matches one of the ETags."""
+    if if_none_match is None:
+        return False
+
+    if if_none_match.strip() == "*":
+        return True
+
+    return any(
+        etag.strip().removeprefix("W/") in etags for etag in if_none_match.split(",")
+    )
+
+
+def _get_range_response(
+    range_header: str,
+    size: int,
+    headers: List[Tuple[str, str]],
+    body: bytes | None = None,
+) -> GraphResponse | None:
+    """
+    Build the response to a single byte range of a file.
+
+    Args:
+        range_header: The Range header of the request.
+        size: The size of the file.
+        headers: The headers of the response.
+        body: The body of a cached file, None for a file sent from disk, which the
+        caller attaches to the response.
+
+    Returns:
+        None for other ranges, like several ranges at once, which get the whole file.
+    """
+
+    match: Match[str] | None = fullmatch(r"\s*bytes=(\d*)-(\d*)\s*", range_header)
+
+    if match is None or match.group(1) == match.group(2) == "":
+        return None
+
+    start: int
+    end: int
+
+    if match.group(1) == "":
+        # A suffix range, the last bytes of the file
+        start, end = max(size - int(match.group(2)), 0), size - 1
+    else:
+        start = int(match.group(1))
+        end = min(int(match.group(2)), size - 1) if match.group(2) else size - 1
+
+    if start >= size or end < start:
+        return GraphResponse(
+            "416 Range Not Satisfiable",
+            headers + [("Content-Range", f"bytes */{size}")],
+        )
+
+    headers = headers + [("Content-Range", f"bytes {start}-{end}/{size}")]
+
+    if body is None:
+        return GraphResponse(
+            "206 Partial Content", headers, offset=start, length=end - start + 1
+        )
+
+    return GraphResponse("206 Partial Content", headers, body[start : end + 1])
@@ -0,0 +1,74 @@
+"""
+file_name = routine.py
+Created On: 2026/10/18
+Lasted Updated: 2026/10/18
+Description: Serves the force graph outputs of the vaults over HTTP while the routine
+    manager runs, when a graph server port is configured in the vault JSON file.
+Edit Log:
+2026/10/18
+    - Created file
+    - Read the vault JSON file without importing the force graph routine
+"""
+
+# STANDARD LIBRARY IMPORTS
+from logging import Logger, getLogger
+from typing import cast
+
+# THIRD PARTY LIBRARY IMPORTS
+from asyncio import sleep
+
+# LOCAL LIBRARY IMPORTS
+from src.routines.force_graph_updater.vault_config import VaultJson, get_vault_json
+from src.routines.graph_server.graph_server import (
+    DEFAULT_GRAPH_SERVER_HOST,
+    GraphServer,
+)
+from src.routines.routine_decorator import RoutineDecorator, Seconds
+
+TASK_NAME = "graph_server_routine"
+
+# The seconds between checks of the vault JSON file for a changed vault list
+CONFIG_CHECK_INTERVAL: float = 60
+
+logger: Logger = getLogger(TASK_NAME)
+
+
+@RoutineDecorator(
+    task_name=TASK_NAME,
+    routine_metadata={
+        "interval": cast(Seconds, 60 * 60),
+        # Serves until it is cancelled, a run that is due meanwhile is queued, so a
+        # server that stopped is started again
+        "overlap": "queue",
+    },
+)
+async def routine() -> None:
+    """
+    Serve the force graph outputs until the routine manager shuts down, restarting the
+    server whenever the vault JSON file changes.
+    """
+
+    while True:
+        vault_json: VaultJson = get_vault_json()
+        port: int | None = vault_json.get("graph_server_port")
+
+        if port is None:
+            logger.info("No graph_server_port in the vault JSON file, not serving")
+            return
+
+        graph_server = GraphServer(
+            vault_json["data_directory"],
+            (vault["save_name"] for vault in vault_json["vaults"]),
+            port,
+            vault_json.get("graph_server_host", DEFAULT_GRAPH_SERVER_HOST),
+        )
+        await graph_server.start()
+        logger.info("Serving the force graphs on port %s", port)
+
+        try:
+            while get_vault_json() is vault_json:
+                await sleep(CONFIG_CHECK_INTERVAL)
+        finally:
+            await graph_server.close()
+
+        logger.info("The vault JSON file changed, restarting the graph server")
@@ -0,0 +1,245 @@
+"""
+file_name = restart_engine.py
+Created On: 2026/10/18
+Lasted Updated: 2026/10/18
+Description: Restarts services with asyncio subprocesses in dependency ordered waves,
+    with bounded parallelism inside a wave, timeouts and a health check.
+Edit Log:
+2026/10/18
+    - Created file
+    - Never run a health check once the health check timeout passed
+"""
+
+# STANDARD LIBRARY IMPORTS
+from logging import Logger, getLogger
+from os import killpg
+from signal import SIGKILL
+from time import monotonic, perf_counter
+from typing import List, Sequence, Tuple, TypedDict
+
+# THIRD PARTY LIBRARY IMPORTS
+from asyncio import CancelledError, Semaphore, TimeoutError as AsyncTimeoutError
+from asyncio import gather, sleep, wait_for
+from asyncio.subprocess import DEVNULL, PIPE, STDOUT, create_subprocess_exec
+
+# LOCAL LIBRARY IMPORTS
+
+DEFAULT_RESTART_COMMAND: List[str] = ["sudo", "systemctl"]
+DEFAULT_RESTART_PARALLELISM: int = 4
+DEFAULT_RESTART_TIMEOUT: float = 120
+DEFAULT_HEALTH_CHECK_TIMEOUT: float = 30
+DEFAULT_HEALTH_CHECK_INTERVAL: float = 1
+
+# A line of the service list that separates two waves
+WAVE_SEPARATOR: str = "---"
+
+
+class RestartResult(TypedDict):
+    """The result of restarting a single service."""
+
+    service: str
+    succeeded: bool
+    duration: float
+    error: str | None
+
+
+class RestartCommandError(Exception):
+    """Raised when a restart or health check command fails or times out."""
+
+
+def parse_service_waves(service_list: str) -> List[List[str]]:
+    """
+    Parse a service list into waves. Every line is a service, a "---" line starts the
+    next wave, blank lines and lines starting with # are ignored. A list without
+    separators is a single wave.
+    """
+
+    waves: List[List[str]] = [[]]
+
+    for line in service_list.splitlines():
+        line = line.strip()
+
+        if line == WAVE_SEPARATOR:
+            waves.append([])
+        elif line and not line.startswith("#"):
+            waves[-1].append(line)
+
+    return [wave for wave in waves if wave]
+
+
+class RestartEngine:
+    """
+    Restarts services wave by wave. The services of a wave restart concurrently, at
+    most parallelism at once, and the next wave only starts once every service of
+    the wave restarted and passed its health check, so later waves can depend on
+    earlier ones.
+
+    The command is the service manager to call, ["sudo", "systemctl"] by default. It is
+    called with "restart <service>" and then with "is-active --quiet <service>" until
+    the service is active, so any stub with the same interface can stand in for it.
+    """
+
+    def __init__(
+        self,
+        command: Sequence[str] = tuple(DEFAULT_RESTART_COMMAND),
+        parallelism: int = DEFAULT_RESTART_PARALLELISM,
+        restart_timeout: float = DEFAULT_RESTART_TIMEOUT,
+        health_check_timeout: float = DEFAULT_HEALTH_CHECK_TIMEOUT,
+        health_check_interval: float = DEFAULT_HEALTH_CHECK_INTERVAL,
+        stop_on_failure: bool = False,
+        logger: Logger | None = None,
+    ) -> None:
+        self._command: List[str] = list(command)
+        self._parallelism = parallelism
+        self._restart_timeout = restart_timeout
+        self._health_check_timeout = health_check_timeout
+        self._health_check_interval = health_check_interval
+        self._stop_on_failure = stop_on_failure
+        self._logger: Logger = logger or getLogger(__name__)
+
+    async def restart_waves(self, waves: List[List[str]]) -> List[RestartResult]:
+        """
+        Restart every wave in order.
+
+        Returns:
+            The result of every restarted service. When stop_on_failure is set, the
+            waves after the first failed wave are not restarted.
+        """
+
+        semaphore = Semaphore(self._parallelism)
+        results: List[RestartResult] = []
+
+        for wave_index, wave in enumerate(waves):
+            wave_results: List[RestartResult] = await gather(
+                *(self._restart_with_limit(semaphore, service) for service in wave)
+            )
+            results += wave_results
+            failed_services: List[str] = [
+                result["service"] for result in wave_results if not result["succeeded"]
+            ]
+
+            if failed_services and self._stop_on_failure:
+                self._logger.error(
+                    "Wave %s failed for %s, not restarting the remaining waves",
+                    wave_index + 1,
+                    ", ".join(failed_services),
+                )
+                break
+
+        return results
+
+    async def restart_service(self, service: str) -> RestartResult:
+        """Restart a service and wait until it is active."""
+        start: float = perf_counter()
+
+        try:
+            await self._run_command(["restart", service], self._restart_timeout)
+            await self._wait_until_active(service)
+        except RestartCommandError as e:
+            self._logger.error("Failed to restart %s: %s", service, e)
+            return {
+                "service": service,
+                "succeeded": False,
+                "duration": perf_counter() - start,
+                "error": str(e),
+            }
+
+        duration: float = perf_counter() - start
+        self._logger.info(
+            "Successfully restarted %s in %.2f seconds", service, duration
+        )
+
+        return {
+            "service": service,
+            "succeeded": True,
+            "duration": duration,
+            "error": None,
+        }
+
+    # PRIVATE METHODS START HERE
+    async def _restart_with_limit(
+        self, semaphore: Semaphore, service: str
+    ) -> RestartResult:
+        """Restart a service once the semaphore lets it."""
+        async with semaphore:
+            return await self.restart_service(service)
+
+    async def _wait_until_active(self, service: str) -> None:
+        """Poll is-active until the service is active or the health check times out."""
+        deadline: float = monotonic() + self._health_check_timeout
+
+        while True:
+            remaining_time: float = deadline - monotonic()
+
+            # A timeout of 0 would kill the check before it could run
+            if remaining_time <= 0:
+                break
+
+            return_code, _ = await self._run_command(
+                ["is-active", "--quiet", service], remaining_time, check=False
+            )
+
+            if return_code == 0:
+                return
+
+            if monotonic() + self._health_check_interval > deadline:
+                break
+
+            await sleep(self._health_check_interval)
+
+        raise RestartCommandError(
+            f"{service} is not active {self._health_check_timeout} seconds after the "
+            "restart"
+        )
+
+    async def _run_command(
+        self, arguments: List[str], timeout: float, check: bool = True
+    ) -> Tuple[int, str]:
+        """
+        Run the command with the arguments, killing it after the timeout or when the
+        run is cancelled.
+
+        Returns:
+            The return code and the combined output of the command.
+        """
+
+        try:
+            process = await create_subprocess_exec(
+                *self._command,
+                *arguments,
+                stdin=DEVNULL,
+                stdout=PIPE,
+                stderr=STDOUT,
+                start_new_session=True,
+            )
+        except OSError as e:
+            raise RestartCommandError(f"Failed to run {self._command[0]}: {e}") from e
+
+        try:
+            output, _ = await wait_for(process.communicate(), timeout)
+        except (AsyncTimeoutError, CancelledError) as e:
+            # Kill the whole process group, a wrapper script would otherwise leave its
+            # children holding the output pipe open
+            try:
+                killpg(process.pid, SIGKILL)
+            except ProcessLookupError:
+                pass
+
+            await process.wait()
+
+            if isinstance(e, CancelledError):
+                raise
+
+            raise RestartCommandError(
+                f"{' '.join(arguments)} timed out after {timeout:.0f} seconds"
+            ) from e
+
+        decoded_output: str = output.decode(errors="replace").strip()
+
+        if check and process.returncode != 0:
+            raise RestartCommandError(
+                f"{' '.join(arguments)} returned non-zero exit status "
+                f"{process.returncode}: {decoded_output}"
+            )
+
+        return process.returncode or 0, decoded_output
@@ -1,47 +1,89 @@
 """
 file_name = routine.py
 Created On: 2024/06/29
-Lasted Updated: 2024/06/29
+Lasted Updated: 2026/10/18
 Description: _FILL OUT HERE_
 Edit Log:
 2024/06/29
     - Created file
+2026/10/18
+    - Run on the thread executor, systemctl blocks until the restart is done
+    - Time out after 10 minutes
+    - Restart in dependency ordered waves through the async restart engine
+    - Only re-read the service list when it changed
+    - Fail the run when any service failed to restart
 """
 
 # STANDARD LIBRARY IMPORTS
+from os import environ, stat
 from os.path import join, dirname, abspath
-from subprocess import run, CalledProcessError
 from logging import getLogger, Logger
+from shlex import split
+from typing import List, Tuple, cast
 
 # THIRD PARTY LIBRARY IMPORTS
 
 # LOCAL LIBRARY IMPORTS
-from src.routines.routine_decorator import RoutineDecorator
+from src.routines.restart_services.restart_engine import (
+    DEFAULT_RESTART_COMMAND,
+    RestartEngine,
+    RestartResult,
+    parse_service_waves,
+)
+from src.routines.routine_decorator import RoutineDecorator, Seconds
 from src.routines.routine_scheduler import RoutineScheduler, WeekdayMapper
 
 TASK_NAME = "service_restarter_routine"
 
+SERVICE_LIST_PATH: str = join(dirname(abspath(__file__)), "service_list.txt")
+
+# The service manager command, for example a local stub instead of systemctl
+RESTART_COMMAND: List[str] = split(
+    environ.get("RESTART_SERVICES_COMMAND", " ".join(DEFAULT_RESTART_COMMAND))
+)
+
+logger: Logger = getLogger(TASK_NAME)
+
+_service_waves_cache: Tuple[float, List[List[str]]] | None = None
+
+
+def get_service_waves() -> List[List[str]]:
+    """Get the waves of the service list, only parsing it again when it changed."""
+    global _service_waves_cache  # pylint: disable=global-statement
+
+    modified_time: float = stat(SERVICE_LIST_PATH).st_mtime
+
+    if _service_waves_cache is None or _service_waves_cache[0] != modified_time:
+        with open(SERVICE_LIST_PATH, "r", encoding="UTF-8") as file:
+            _service_waves_cache = (modified_time, parse_service_waves(file.read()))
+
+    return _service_waves_cache[1]
+
 
 @RoutineDecorator(
     task_name="service_restarter_routine",
-    routine_metadata={"interval": RoutineScheduler(WeekdayMapper.SUNDAY.value, 0)},
-)  # Run every 30 minutes
+    routine_metadata={
+        "interval": RoutineScheduler(WeekdayMapper.SUNDAY.value, 0),
+        "timeout": cast(Seconds, 600),
+    },
+)  # Run every sunday at 12AM
 async def routine() -> None:
     """
     A routine to restart all services at the end of the week at 12AM
-    """
 
-    service_list_path = join(dirname(abspath(__file__)), "service_list.txt")
+    Raises:
+        RuntimeError: If any service failed to restart, once every service was tried.
+    """
 
-    with open(service_list_path, "r", encoding="UTF-8") as file:
-        for service_name in file:
-            service_name = service_name.strip()
-            # Restart the service
+    restart_results: List[RestartResult] = await RestartEngine(
+        RESTART_COMMAND, logger=logger
+    ).restart_waves(get_service_waves())
+    failed_services: List[str] = [
+        result["service"] for result in restart_results if not result["succeeded"]
+    ]
 
-            logger = getLogger(TASK_NAME)
-            try:
-                # Restart the service using systemctl
-                run(["sudo", "systemctl", "restart", service_name], check=True)
-                logger.info("Successfully restarted %s", service_name)
-            except CalledProcessError:
-                logger.error("Failed to restart %s", service_name)
+    if failed_services:
+        raise RuntimeError(
+            f"{len(failed_services)} of {len(restart_results)} services failed to "
+            f"restart: {', '.join(failed_services)}"
+        )
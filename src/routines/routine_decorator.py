@@ -1,37 +1,110 @@
 """
 file_name = routine.py
 Created On: 2024/06/26
-Lasted Updated: 2024/06/26
+Lasted Updated: 2026/10/18
 Description: A routine decorator to run a routine function at a specified interval.
 Edit Log:
 2024/06/26
     - Created file
+2026/10/18
+    - Watch mode that runs the routine when watched directories change
+    - Record every run in the run history of the state store
+    - Run the routine once per call, the RoutineManager schedules the runs
+    - Execution modes to run blocking routines on a thread or process executor
+    - Run timeout, overlap policy and resource group metadata
+    - Record cancelled runs, such as runs that timed out, as failed runs
+    - Swap the log file handler for the queued logging of the RoutineManager
+    - Record the duration and result of every run in the metrics registry
+    - Optional cProfile or tracemalloc profile of every run
+    - Set the logger and its log file up on first use instead of on import
+    - Run watched routines after max_wait even while the directories keep changing
+    - Log the runs that skip their cProfile profile because another one is running
+    - Write the run history on a worker thread instead of the event loop
 """
 
 # STANDARD LIBRARY IMPORTS
-from typing import Callable, Set, TypedDict, NewType, cast
+from concurrent.futures import Executor
+from contextlib import nullcontext
+from functools import wraps
+from importlib import import_module
+from inspect import iscoroutinefunction
+from typing import (
+    Any,
+    Callable,
+    List,
+    Literal,
+    NotRequired,
+    Set,
+    TypedDict,
+    NewType,
+    cast,
+)
 import logging
-from logging.handlers import TimedRotatingFileHandler
 from pathlib import Path
-
+from time import perf_counter, time
 
 # THIRD PARTY LIBRARY IMPORTS
-from asyncio import sleep
+from asyncio import CancelledError, get_running_loop, sleep, to_thread
 
 # LOCAL LIBRARY IMPORTS
+from src.routines.directory_watcher import DirectoryWatcher, DirectoryWatcherError
+from src.routines.routine_logging import create_log_file_handler
+from src.routines.routine_metrics import get_metrics_registry
+from src.routines.routine_profiling import (
+    ProfileMode,
+    get_profile_dump_path,
+    profile_run,
+)
 from src.routines.routine_scheduler import RoutineScheduler
+from src.routines.state_store import get_state_store
 
 Seconds = NewType("Seconds", int)
 
+# async routines run on the event loop, thread and process routines are plain
+# functions that run on the executors of the RoutineManager
+ExecutionMode = Literal["async", "thread", "process"]
+
+# What happens when a run is due while the previous run is still going: skip the run,
+# queue it to start once the previous run finished, or allow both to run at once
+OverlapPolicy = Literal["skip", "queue", "allow"]
+
+
+class WatchMetadata(TypedDict):
+    """
+    Metadata to run a routine when the watched directories change. The interval of the
+    routine is kept as a polling fallback and as the maximum time between runs.
+    """
+
+    paths: Callable[[], List[str]]
+    debounce: NotRequired[Seconds]
+    # The routine runs this long after the first change even if changes keep coming
+    max_wait: NotRequired[Seconds]
+    ignored_names: NotRequired[Set[str]]
+
 
 class RoutineMetadata(TypedDict):
     """Metadata for the interval decorator."""
 
     interval: Seconds | RoutineScheduler
+    watch: NotRequired[WatchMetadata]
+    execution: NotRequired[ExecutionMode]
+    # The run is cancelled after this many seconds. A thread or process routine stops
+    # being awaited but keeps running until it returns.
+    timeout: NotRequired[Seconds]
+    overlap: NotRequired[OverlapPolicy]
+    # Routines of the same resource group share a limit on how many run at once
+    resource_group: NotRequired[str]
+    # Profile every run and dump the stats into logs/profiles, to pin a slow run down
+    # without a debugger
+    profile: NotRequired[ProfileMode]
 
 
 class RoutineDecorator:
-    """Decorator to run a routine function at a specified interval."""
+    """
+    Decorator to run a routine function at a specified interval. The decorated function
+    runs the routine once and exposes this decorator as its routine_decorator
+    attribute, which the RoutineManager uses to schedule it.
+    """
 
     _task_names: Set[str] = set()
 
@@ -42,19 +115,136 @@ class RoutineDecorator:
 
         self._add_task_name(task_name)
 
-        self._logger = self._setup_logger(task_name)
+        # Set up on first use, importing a routine does not create its log file
+        self._logger: logging.Logger | None = None
 
     def __call__(self, routine_function: Callable):
-        """Make the instance callable and return the wrapper function."""
+        """
+        Make the instance callable and return the wrapper function. The wrapper takes
+        the executor to run a thread or process routine on, the event loop default
+        executor is used when none is given.
+        """
+
+        if (self.execution_mode == "async") != iscoroutinefunction(routine_function):
+            raise TypeError(
+                f"Routine {self._task_name} must be an async function if and only if "
+                'its execution mode is "async"'
+            )
+
+        @wraps(routine_function)
+        async def wrapper(executor: Executor | None = None):
+            await self._run_routine(routine_function, executor)
 
-        async def wrapper():
-            while True:
-                await routine_function()
-                await sleep(self._get_seconds_to_run())
-                self._logger.info("SUCCESS")
+        wrapper.routine_decorator = self  # type: ignore[attr-defined]
 
         return wrapper
 
+    @property
+    def task_name(self) -> str:
+        """The unique name of the routine."""
+        return self._task_name
+
+    @property
+    def routine_metadata(self) -> RoutineMetadata:
+        """The scheduling metadata of the routine."""
+        return self._routine_metadata
+
+    @property
+    def execution_mode(self) -> ExecutionMode:
+        """Where the routine function runs."""
+        return self._routine_metadata.get("execution", "async")
+
+    @property
+    def overlap_policy(self) -> OverlapPolicy:
+        """What happens to a run that is due while the previous run is going."""
+        return self._routine_metadata.get("overlap", "skip")
+
+    @property
+    def logger(self) -> logging.Logger:
+        """The logger of the routine, logging to its log file unless replaced."""
+        if self._logger is None:
+            self._logger = self._setup_logger(self._task_name)
+
+        return self._logger
+
+    def get_seconds_to_run(self) -> Seconds:
+        """Get the number of seconds to run the routine."""
+        seconds_till_next_run: Seconds
+
+        if isinstance(self._routine_metadata["interval"], RoutineScheduler):
+            seconds_till_next_run = cast(
+                Seconds, self._routine_metadata["interval"].seconds_till_next_run()
+            )
+            self.logger.info("Seconds till next run: %s", seconds_till_next_run)
+        else:
+            seconds_till_next_run = self._routine_metadata["interval"]
+
+        return seconds_till_next_run
+
+    def use_log_handler(self, handler: logging.Handler) -> None:
+        """Replace the handlers of the routine logger, closing the replaced ones."""
+        if self._logger is None:
+            # Skip the log file handler that would be replaced right away
+            self._logger = self._setup_logger(self._task_name, add_file_handler=False)
+
+        for replaced_handler in list(self._logger.handlers):
+            self._logger.removeHandler(replaced_handler)
+
+            if replaced_handler is not handler:
+                replaced_handler.close()
+
+        self._logger.addHandler(handler)
+
+    def start_watcher(self) -> DirectoryWatcher | None:
+        """Start watching for changes if the routine has watch metadata and inotify."""
+        if "watch" not in self._routine_metadata:
+            return None
+
+        if not DirectoryWatcher.is_supported():
+            self.logger.info("inotify is not supported, falling back to polling")
+            return None
+
+        watch_metadata: WatchMetadata = self._routine_metadata["watch"]
+        watcher = DirectoryWatcher(
+            watch_metadata.get("ignored_names", set()),
+            watch_metadata.get("debounce", Seconds(5)),
+            watch_metadata.get("max_wait", Seconds(60)),
+        )
+
+        try:
+            watcher.start()
+        except DirectoryWatcherError as e:
+            self.logger.error(
+                "Failed to start watching, falling back to polling: %s", e
+            )
+            return None
+
+        return watcher
+
+    async def wait_for_watched_changes(self, watcher: DirectoryWatcher) -> bool:
+        """
+        Refresh the watched paths and wait for a debounced change, at most until the
+        next scheduled run so new paths are picked up regularly.
+
+        Returns:
+            True if a watched directory changed.
+        """
+
+        seconds_to_run: Seconds = self.get_seconds_to_run()
+
+        try:
+            watcher.watch(self._routine_metadata["watch"]["paths"]())
+        except (DirectoryWatcherError, OSError) as e:
+            self.logger.error("Failed to watch, polling until the next run: %s", e)
+            await sleep(seconds_to_run)
+            return False
+
+        if await watcher.wait_for_changes(seconds_to_run):
+            self.logger.info("Changes detected in watched directories")
+            return True
+
+        return False
+
     # PRIVATE FUNCTIONS START HERE
     @classmethod
     def _add_task_name(cls, task_name):
@@ -65,41 +255,134 @@ class RoutineDecorator:
 
         cls._task_names.add(task_name)
 
-    def _setup_logger(self, task_name: str):
+    def _setup_logger(self, task_name: str, add_file_handler: bool = True):
         """Setup the logger for the routine function."""
         logger = logging.getLogger(self._task_name)
         logger.setLevel(logging.INFO)
 
-        logging_directory_path = Path(__file__).resolve().parents[2] / "logs"
+        if add_file_handler and not logger.handlers:
+            # Log straight to a daily rotated file until the RoutineManager swaps in
+            # its queued logging
+            logger.addHandler(create_log_file_handler(task_name))
 
-        # Create the directory if it does not exist
-        logging_directory_path.mkdir(parents=True, exist_ok=True)
+        return logger
 
-        if not logger.handlers:
-            # Create a TimedRotatingFileHandler that rotates logs daily
-            handler = TimedRotatingFileHandler(
-                filename=f"{logging_directory_path}/{task_name}.log",  # Log file name
-                when="midnight",  # Rotate at midnight
-                interval=1,  # Interval is 1 day
-            )
-            formatter = logging.Formatter(
-                "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    async def _run_routine(
+        self, routine_function: Callable, executor: Executor | None
+    ) -> None:
+        """Run the routine once and record the run in the run history."""
+        profile_mode: ProfileMode | None = self._routine_metadata.get("profile")
+        dump_path: Path | None = None
+
+        if profile_mode is not None:
+            dump_path = get_profile_dump_path(profile_mode, self._task_name)
+            self.logger.info(
+                "Profiling the run with %s into %s", profile_mode, dump_path
             )
-            handler.setFormatter(formatter)
-            logger.addHandler(handler)
 
-        return logger
+        started_at: float = time()
+        start: float = perf_counter()
 
-    def _get_seconds_to_run(self) -> Seconds:
-        """Get the number of seconds to run the routine."""
-        seconds_till_next_run: Seconds
+        try:
+            if self.execution_mode == "async":
+                # The profile also covers everything else the event loop runs while
+                # the routine is awaited
+                with (
+                    profile_run(profile_mode, dump_path)
+                    if profile_mode is not None and dump_path is not None
+                    else nullcontext(True)
+                ) as is_profiled:
+                    if not is_profiled:
+                        self._log_skipped_profile()
 
-        if isinstance(self._routine_metadata["interval"], RoutineScheduler):
-            seconds_till_next_run = cast(
-                Seconds, self._routine_metadata["interval"].seconds_till_next_run()
+                    await routine_function()
+            elif self.execution_mode == "thread":
+                is_profiled = await get_running_loop().run_in_executor(
+                    executor,
+                    _call_routine_function,
+                    routine_function,
+                    profile_mode,
+                    dump_path,
+                )
+            else:
+                # The decorated name resolves to the wrapper, so the process looks
+                # the routine up by name instead of pickling the function
+                is_profiled = await get_running_loop().run_in_executor(
+                    executor,
+                    _run_routine_function,
+                    routine_function.__module__,
+                    routine_function.__qualname__,
+                    profile_mode,
+                    dump_path,
+                )
+        except (Exception, CancelledError) as e:
+            duration: float = perf_counter() - start
+            get_metrics_registry().record_run(
+                self._task_name, duration, False, started_at + duration
             )
-            self._logger.info("Seconds till next run: %s", seconds_till_next_run)
-        else:
-            seconds_till_next_run = self._routine_metadata["interval"]
+            # The write finishes on its thread even if this await is cancelled too
+            await to_thread(
+                get_state_store().record_run,
+                self._task_name,
+                started_at,
+                duration,
+                False,
+                repr(e),
+            )
+            raise
 
-        return seconds_till_next_run
+        if self.execution_mode != "async" and not is_profiled:
+            self._log_skipped_profile()
+
+        duration = perf_counter() - start
+        get_metrics_registry().record_run(
+            self._task_name, duration, True, started_at + duration
+        )
+        await to_thread(
+            get_state_store().record_run, self._task_name, started_at, duration, True
+        )
+        self.logger.info("SUCCESS in %.3f seconds", duration)
+
+    def _log_skipped_profile(self) -> None:
+        """Warn that the run is not profiled because another profile is running."""
+        self.logger.warning(
+            "Skipped the profile of the run, another cProfile profile is running"
+        )
+
+
+# PRIVATE FUNCTIONS START HERE
+def _call_routine_function(
+    routine_function: Callable,
+    profile_mode: ProfileMode | None,
+    dump_path: Path | None,
+) -> bool:
+    """
+    Call a routine function, profiled on the thread that runs it.
+
+    Returns:
+        False if the run should have been profiled but another profile was running.
+    """
+
+    if profile_mode is None or dump_path is None:
+        routine_function()
+        return True
+
+    with profile_run(profile_mode, dump_path) as is_profiled:
+        routine_function()
+
+    return is_profiled
+
+
+def _run_routine_function(
+    module_name: str,
+    qualified_name: str,
+    profile_mode: ProfileMode | None,
+    dump_path: Path | None,
+) -> bool:
+    """Run the undecorated routine function of a decorated routine in a process."""
+    routine_wrapper: Any = import_module(module_name)
+
+    for name in qualified_name.split("."):
+        routine_wrapper = getattr(routine_wrapper, name)
+
+    return _call_routine_function(routine_wrapper.__wrapped__, profile_mode, dump_path)
@@ -1,21 +1,40 @@
 """
 file_name = routine_list.py
 Created On: 2024/06/27
-Lasted Updated: 2024/06/27
+Lasted Updated: 2026/10/18
 Description: _FILL OUT HERE_
 Edit Log:
 2024/06/27
     - Created file
+2026/10/18
+    - Serve the force graphs with the graph server routine
+    - Declare the routines by entry point, they are imported on their first run
 """
 
 # STANDARD LIBRARY IMPORTS
-from typing import List, Callable
+from typing import List
 
 # THIRD PARTY LIBRARY IMPORTS
 
 # LOCAL LIBRARY IMPORTS
-from src.routines.force_graph_updater.routine import routine as force_graph_routine
-# from src.routines.restart_services.routine import routine as restart_services
+from src.routines.routine_registry import RoutineEntry
 
 
-routine_list: List[Callable] = [force_graph_routine]
+routine_list: List[RoutineEntry] = [
+    {
+        "name": "force_graph_routine",
+        "entry_point": "src.routines.force_graph_updater.routine:routine",
+        "description": "Update the force graph files of the obsidian vaults",
+    },
+    {
+        "name": "graph_server_routine",
+        "entry_point": "src.routines.graph_server.routine:routine",
+        "description": "Serve the force graph files over HTTP",
+    },
+    {
+        "name": "service_restarter_routine",
+        "entry_point": "src.routines.restart_services.routine:routine",
+        "enabled": False,
+        "description": "Restart the services of the service list every Sunday",
+    },
+]
@@ -0,0 +1,166 @@
+"""
+file_name = routine_logging.py
+Created On: 2026/10/18
+Lasted Updated: 2026/10/18
+Description: The log files of the routines, written either directly by the logging
+    call or by one background thread that drains a queue for every routine.
+Edit Log:
+2026/10/18
+    - Created file
+"""
+
+# STANDARD LIBRARY IMPORTS
+from copy import copy
+from json import dumps
+from logging import Formatter, Handler, LogRecord
+from logging.handlers import QueueHandler, QueueListener, TimedRotatingFileHandler
+from pathlib import Path
+from queue import SimpleQueue
+from typing import Dict
+
+# THIRD PARTY LIBRARY IMPORTS
+
+# LOCAL LIBRARY IMPORTS
+
+LOGS_DIRECTORY_PATH: Path = Path(__file__).resolve().parents[2] / "logs"
+
+LOG_FORMAT: str = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+
+class JsonLinesFormatter(Formatter):
+    """Formats every record as a single line JSON object."""
+
+    def format(self, record: LogRecord) -> str:
+        log_line: Dict[str, str | float] = {
+            "time": record.created,
+            "name": record.name,
+            "level": record.levelname,
+            "message": record.getMessage(),
+        }
+
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+
+        if record.exc_text:
+            log_line["exception"] = record.exc_text
+
+        return dumps(log_line)
+
+
+def create_log_file_handler(
+    task_name: str, json_lines: bool = False
+) -> TimedRotatingFileHandler:
+    """
+    Create the handler of the log file of a routine, rotated daily at midnight.
+
+    Args:
+        task_name: The name of the routine, which is also the name of the log file.
+        json_lines: Write JSON lines to a .jsonl file instead of formatted text.
+    """
+
+    # Create the directory if it does not exist
+    LOGS_DIRECTORY_PATH.mkdir(parents=True, exist_ok=True)
+
+    log_file_name: str = f"{task_name}.jsonl" if json_lines else f"{task_name}.log"
+    handler = TimedRotatingFileHandler(
+        filename=LOGS_DIRECTORY_PATH / log_file_name,
+        when="midnight",
+        interval=1,
+        delay=True,
+    )
+    handler.setFormatter(JsonLinesFormatter() if json_lines else Formatter(LOG_FORMAT))
+
+    return handler
+
+
+class QueuedRoutineLogging:
+    """
+    Non-blocking logging for every routine. The logging call only freezes the record
+    and puts it on an in-memory queue. One listener thread writes and rotates the log
+    file of each routine, which keeps file I/O and rotation off the event loop.
+
+    Usage:
+        queued_logging = QueuedRoutineLogging()
+        queued_logging.start()
+        logger.addHandler(queued_logging.handler)
+        ...
+        queued_logging.stop()
+    """
+
+    def __init__(self, json_lines: bool = False) -> None:
+        self._queue: SimpleQueue = SimpleQueue()
+        self._handler: QueueHandler = _FrozenRecordQueueHandler(self._queue)
+        self._listener = QueueListener(
+            self._queue, _RoutineFileRouter(json_lines), respect_handler_level=True
+        )
+        self._is_started: bool = False
+
+    @property
+    def handler(self) -> QueueHandler:
+        """The handler to add to the routine loggers."""
+        return self._handler
+
+    def start(self) -> None:
+        """Start the listener thread."""
+        if not self._is_started:
+            self._listener.start()
+            self._is_started = True
+
+    def stop(self) -> None:
+        """Write every queued record, then stop the thread and close the log files."""
+        if self._is_started:
+            self._listener.stop()
+            self._is_started = False
+
+        for handler in self._listener.handlers:
+            handler.close()
+
+
+# PRIVATE CLASSES START HERE
+class _FrozenRecordQueueHandler(QueueHandler):
+    """
+    Queues a copy of the record with its message and exception rendered, so the
+    record does not change after the call. Unlike QueueHandler.prepare, it leaves the
+    message unformatted so the listener can still write JSON lines.
+    """
+
+    _exception_formatter: Formatter = Formatter()
+
+    def prepare(self, record: LogRecord) -> LogRecord:
+        record = copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+
+        if record.exc_info:
+            record.exc_text = self._exception_formatter.formatException(record.exc_info)
+            record.exc_info = None
+
+        return record
+
+
+class _RoutineFileRouter(Handler):
+    """Writes every record to the log file of its logger, only used by one thread."""
+
+    def __init__(self, json_lines: bool) -> None:
+        super().__init__()
+        self._json_lines = json_lines
+        self._file_handlers: Dict[str, TimedRotatingFileHandler] = {}
+
+    def emit(self, record: LogRecord) -> None:
+        file_handler: TimedRotatingFileHandler | None = self._file_handlers.get(
+            record.name
+        )
+
+        if file_handler is None:
+            file_handler = create_log_file_handler(record.name, self._json_lines)
+            self._file_handlers[record.name] = file_handler
+
+        file_handler.handle(record)
+
+    def close(self) -> None:
+        for file_handler in self._file_handlers.values():
+            file_handler.close()
+
+        self._file_handlers.clear()
+        super().close()
@@ -0,0 +1,316 @@
+"""
+file_name = routine_metrics.py
+Created On: 2026/10/18
+Lasted Updated: 2026/10/18
+Description: In-process run metrics of the routines, exposed in the Prometheus text
+    format by an optional local HTTP endpoint.
+Edit Log:
+2026/10/18
+    - Created file
+"""
+
+# STANDARD LIBRARY IMPORTS
+from bisect import bisect_left
+from threading import Lock
+from typing import Dict, List, Tuple, TypedDict
+
+# THIRD PARTY LIBRARY IMPORTS
+from asyncio import Server, StreamReader, StreamWriter, start_server, wait_for
+from asyncio import IncompleteReadError, LimitOverrunError
+from asyncio import TimeoutError as AsyncTimeoutError
+
+# LOCAL LIBRARY IMPORTS
+
+# Upper bounds of the run duration histogram buckets in seconds, from quick routines
+# to force graph builds of large vaults
+DURATION_BUCKETS: Tuple[float, ...] = (
+    0.1,
+    0.5,
+    1,
+    5,
+    10,
+    30,
+    60,
+    120,
+    300,
+    600,
+    1800,
+    3600,
+)
+
+DEFAULT_METRICS_HOST: str = "127.0.0.1"
+
+# The number of seconds a client has to send its request headers
+REQUEST_TIMEOUT: float = 10
+
+PROMETHEUS_CONTENT_TYPE: str = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class RoutineMetricsSnapshot(TypedDict):
+    """The metrics of a single routine at one point in time."""
+
+    runs_succeeded: int
+    runs_failed: int
+    duration_count: int
+    duration_sum: float
+    # The number of runs per bucket, not cumulative, the last bucket is +Inf
+    duration_buckets: List[int]
+    last_run_timestamp: float | None
+    last_success_timestamp: float | None
+    schedule_lag: float | None
+
+
+class RoutineMetrics:
+    """The run metrics of a single routine."""
+
+    __slots__ = (
+        "runs_succeeded",
+        "runs_failed",
+        "duration_sum",
+        "duration_buckets",
+        "last_run_timestamp",
+        "last_success_timestamp",
+        "schedule_lag",
+    )
+
+    def __init__(self) -> None:
+        self.runs_succeeded: int = 0
+        self.runs_failed: int = 0
+        self.duration_sum: float = 0
+        self.duration_buckets: List[int] = [0] * (len(DURATION_BUCKETS) + 1)
+        self.last_run_timestamp: float | None = None
+        self.last_success_timestamp: float | None = None
+        self.schedule_lag: float | None = None
+
+
+class MetricsRegistry:
+    """
+    Counts the runs, durations and scheduling lag of every routine. Recording is a few
+    additions under a lock, safe to call from the event loop and from threads.
+    """
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._routines: Dict[str, RoutineMetrics] = {}
+
+    def record_run(
+        self, task_name: str, duration: float, succeeded: bool, finished_at: float
+    ) -> None:
+        """Record a finished run of a routine."""
+        with self._lock:
+            routine_metrics: RoutineMetrics = self._get_routine_metrics(task_name)
+
+            if succeeded:
+                routine_metrics.runs_succeeded += 1
+                routine_metrics.last_success_timestamp = finished_at
+            else:
+                routine_metrics.runs_failed += 1
+
+            routine_metrics.duration_sum += duration
+            routine_metrics.duration_buckets[
+                bisect_left(DURATION_BUCKETS, duration)
+            ] += 1
+            routine_metrics.last_run_timestamp = finished_at
+
+    def record_schedule_lag(self, task_name: str, lag: float) -> None:
+        """Record how many seconds after its deadline a run started."""
+        with self._lock:
+            self._get_routine_metrics(task_name).schedule_lag = lag
+
+    def snapshot(self) -> Dict[str, RoutineMetricsSnapshot]:
+        """Get a copy of the metrics of every routine, keyed by task name."""
+        with self._lock:
+            return {
+                task_name: {
+                    "runs_succeeded": routine_metrics.runs_succeeded,
+                    "runs_failed": routine_metrics.runs_failed,
+                    "duration_count": sum(routine_metrics.duration_buckets),
+                    "duration_sum": routine_metrics.duration_sum,
+                    "duration_buckets": list(routine_metrics.duration_buckets),
+                    "last_run_timestamp": routine_metrics.last_run_timestamp,
+                    "last_success_timestamp": routine_metrics.last_success_timestamp,
+                    "schedule_lag": routine_metrics.schedule_lag,
+                }
+                for task_name, routine_metrics in self._routines.items()
+            }
+
+    def render_prometheus(self) -> str:
+        """Render the metrics in the Prometheus text exposition format."""
+        snapshot: Dict[str, RoutineMetricsSnapshot] = self.snapshot()
+        lines: List[str] = [
+            "# HELP routine_runs_total The number of finished routine runs.",
+            "# TYPE routine_runs_total counter",
+        ]
+
+        for task_name, metrics in snapshot.items():
+            label: str = _escape_label(task_name)
+            lines.append(
+                f'routine_runs_total{{routine="{label}",result="success"}} '
+                f'{metrics["runs_succeeded"]}'
+            )
+            lines.append(
+                f'routine_runs_total{{routine="{label}",result="failure"}} '
+                f'{metrics["runs_failed"]}'
+            )
+
+        lines += [
+            "# HELP routine_run_duration_seconds The duration of routine runs.",
+            "# TYPE routine_run_duration_seconds histogram",
+        ]
+
+        for task_name, metrics in snapshot.items():
+            label = _escape_label(task_name)
+            cumulative_count: int = 0
+
+            for upper_bound, bucket_count in zip(
+                (*DURATION_BUCKETS, "+Inf"), metrics["duration_buckets"]
+            ):
+                cumulative_count += bucket_count
+                lines.append(
+                    f'routine_run_duration_seconds_bucket{{routine="{label}",'
+                    f'le="{upper_bound}"}} {cumulative_count}'
+                )
+
+            lines.append(
+                f'routine_run_duration_seconds_sum{{routine="{label}"}} '
+                f'{metrics["duration_sum"]}'
+            )
+            lines.append(
+                f'routine_run_duration_seconds_count{{routine="{label}"}} '
+                f'{metrics["duration_count"]}'
+            )
+
+        gauges: List[Tuple[str, str, Dict[str, float | None]]] = [
+            (
+                "routine_last_run_timestamp_seconds",
+                "The time the last run of the routine finished.",
+                {
+                    name: metrics["last_run_timestamp"]
+                    for name, metrics in snapshot.items()
+                },
+            ),
+            (
+                "routine_last_success_timestamp_seconds",
+                "The time the last successful run of the routine finished.",
+                {
+                    name: metrics["last_success_timestamp"]
+                    for name, metrics in snapshot.items()
+                },
+            ),
+            (
+                "routine_schedule_lag_seconds",
+                "How late the last scheduled run of the routine started.",
+                {name: metrics["schedule_lag"] for name, metrics in snapshot.items()},
+            ),
+        ]
+
+        for name, description, values in gauges:
+            lines += [f"# HELP {name} {description}", f"# TYPE {name} gauge"]
+
+            for task_name, value in values.items():
+                if value is not None:
+                    lines.append(
+                        f'{name}{{routine="{_escape_label(task_name)}"}} {value}'
+                    )
+
+        return "\n".join(lines) + "\n"
+
+    # PRIVATE METHODS START HERE
+    def _get_routine_metrics(self, task_name: str) -> RoutineMetrics:
+        """Get the metrics of a routine, creating them on first use."""
+        if task_name not in self._routines:
+            self._routines[task_name] = RoutineMetrics()
+
+        return self._routines[task_name]
+
+
+class MetricsServer:
+    """
+    A minimal HTTP server that answers GET /metrics with the metrics of a registry in
+    the Prometheus text format. Meant to listen on localhost for a local scraper.
+    """
+
+    def __init__(
+        self,
+        metrics_registry: MetricsRegistry,
+        port: int,
+        host: str = DEFAULT_METRICS_HOST,
+    ) -> None:
+        self._metrics_registry = metrics_registry
+        self._port = port
+        self._host = host
+        self._server: Server | None = None
+
+    async def start(self) -> None:
+        """Start listening."""
+        self._server = await start_server(self._handle_client, self._host, self._port)
+
+    async def close(self) -> None:
+        """Stop listening and wait for the open connections to close."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    # PRIVATE METHODS START HERE
+    async def _handle_client(self, reader: StreamReader, writer: StreamWriter) -> None:
+        """Answer a single request and close the connection."""
+        try:
+            request_head: bytes = await wait_for(
+                reader.readuntil(b"\r\n\r\n"), REQUEST_TIMEOUT
+            )
+        except (AsyncTimeoutError, IncompleteReadError, LimitOverrunError):
+            writer.close()
+            return
+
+        request_line: List[str] = (
+            request_head.split(b"\r\n", 1)[0].decode("latin-1").split()
+        )
+        status: str
+        body: bytes
+
+        if len(request_line) != 3 or request_line[0] not in ("GET", "HEAD"):
+            status, body = "405 Method Not Allowed", b""
+        elif request_line[1].split("?", 1)[0] != "/metrics":
+            status, body = "404 Not Found", b""
+        else:
+            status = "200 OK"
+            body = self._metrics_registry.render_prometheus().encode("utf-8")
+
+        writer.write(
+            (
+                f"HTTP/1.1 {status}\r\n"
+                f"Content-Type: {PROMETHEUS_CONTENT_TYPE}\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                "Connection: close\r\n\r\n"
+            ).encode("latin-1")
+        )
+
+        if request_line[:1] != ["HEAD"]:
+            writer.write(body)
+
+        try:
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+
+_metrics_registry: MetricsRegistry | None = None
+
+
+def get_metrics_registry() -> MetricsRegistry:
+    """Get the metrics registry shared by every routine."""
+    global _metrics_registry  # pylint: disable=global-statement
+
+    if _metrics_registry is None:
+        _metrics_registry = MetricsRegistry()
+
+    return _metrics_registry
+
+
+# PRIVATE FUNCTIONS START HERE
+def _escape_label(value: str) -> str:
+    """Escape a Prometheus label value."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
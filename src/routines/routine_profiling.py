@@ -0,0 +1,228 @@
+"""
+file_name = routine_profiling.py
+Created On: 2026/10/18
+Lasted Updated: 2026/10/18
+Description: Opt-in profiling of routine runs, a timer for the phases of a run and
+    cProfile or tracemalloc dumps of whole runs into the logs directory.
+Edit Log:
+2026/10/18
+    - Created file
+    - Share tracemalloc between overlapping profiles, it stops with the last one
+    - Summarize phase durations without the timer, to log the last ones of a run
+    - Run one cProfile profile at a time and skip the ones that would overlap it
+"""
+
+# STANDARD LIBRARY IMPORTS
+from contextlib import contextmanager
+from cProfile import Profile
+from datetime import datetime
+from pathlib import Path
+from threading import Lock
+from time import perf_counter
+import tracemalloc
+from typing import Dict, Iterator, List, Literal, Tuple
+
+# THIRD PARTY LIBRARY IMPORTS
+
+# LOCAL LIBRARY IMPORTS
+from src.routines.routine_logging import LOGS_DIRECTORY_PATH
+
+ProfileMode = Literal["cprofile", "tracemalloc"]
+
+PROFILES_DIRECTORY_PATH: Path = LOGS_DIRECTORY_PATH / "profiles"
+
+# The number of stack frames tracemalloc keeps per allocation
+TRACEMALLOC_FRAMES: int = 10
+
+# The number of allocation sites written to a tracemalloc dump
+TRACEMALLOC_TOP_SITES: int = 50
+
+# Held by the running cProfile profile, Python 3.12+ only allows a single profiler
+_cprofile_lock: Lock = Lock()
+
+# The tracemalloc profiles that are running, tracing stops when the last one ends
+_tracemalloc_lock: Lock = Lock()
+_tracemalloc_profile_count: int = 0
+# Whether the profiles started tracing, tracing started by someone else keeps going
+_is_tracing_started_by_profiles: bool = False
+
+
+class PhaseTimer:
+    """
+    Times the phases of a run on the monotonic clock. A phase that is entered more
+    than once adds up.
+
+    Usage:
+        phase_timer = PhaseTimer()
+
+        with phase_timer.phase("git_pull"):
+            ...
+
+        print(phase_timer.summary())
+    """
+
+    def __init__(self) -> None:
+        self._durations: Dict[str, float] = {}
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time the block as the named phase."""
+        start: float = perf_counter()
+
+        try:
+            yield
+        finally:
+            self._durations[name] = (
+                self._durations.get(name, 0) + perf_counter() - start
+            )
+
+    @property
+    def durations(self) -> Dict[str, float]:
+        """The seconds spent in every phase, in the order the phases started."""
+        return dict(self._durations)
+
+    def summary(self) -> str:
+        """A single line with the duration of every phase and their total."""
+        return summarize_phases(self._durations)
+
+
+def summarize_phases(durations: Dict[str, float]) -> str:
+    """A single line with the duration of every phase and their total."""
+    phases: List[str] = [
+        f"{name} {duration:.3f}s" for name, duration in durations.items()
+    ]
+    phases.append(f"total {sum(durations.values()):.3f}s")
+
+    return ", ".join(phases)
+
+
+def get_profile_dump_path(profile_mode: ProfileMode, task_name: str) -> Path:
+    """Get a new path in the profiles directory of the logs for a run of a routine."""
+    extension: str = ".prof" if profile_mode == "cprofile" else ".txt"
+
+    return PROFILES_DIRECTORY_PATH / (
+        f"{task_name}-{datetime.now():%Y%m%d-%H%M%S-%f}{extension}"
+    )
+
+
+@contextmanager
+def profile_run(profile_mode: ProfileMode, dump_path: Path) -> Iterator[bool]:
+    """
+    Profile the block and dump the result, even when the block raised. cProfile only
+    sees the calling thread, so the block should run the routine on the thread that
+    calls this. An async routine is profiled across its awaits, so its profile covers
+    the whole event loop while it runs, with every other routine and callback the loop
+    ran in the meantime. Only one cProfile profile runs at a time, a profile that
+    would overlap it is skipped and writes no dump. Overlapping tracemalloc profiles
+    share the tracing, so each one also holds the allocations of the others, and their
+    peak covers every profile that ran since the oldest running one started.
+
+    Args:
+        profile_mode: "cprofile" dumps pstats to a .prof file, "tracemalloc" dumps the
+        allocation sites that grew the most and the peak traced memory to a .txt file.
+        dump_path: The path to write the dump to.
+
+    Yields:
+        Whether the block is profiled.
+    """
+
+    dump_path.parent.mkdir(parents=True, exist_ok=True)
+
+    if profile_mode == "cprofile":
+        profile: Profile | None = _start_cprofile_profile()
+
+        if profile is None:
+            yield False
+            return
+
+        try:
+            yield True
+        finally:
+            profile.disable()
+            _cprofile_lock.release()
+            profile.dump_stats(dump_path)
+
+        return
+
+    start_snapshot: tracemalloc.Snapshot = _start_tracemalloc_profile()
+
+    try:
+        yield True
+    finally:
+        end_snapshot, current_size, peak_size = _stop_tracemalloc_profile()
+
+        with open(dump_path, "w", encoding="UTF-8") as dump_file:
+            dump_file.write(
+                f"Traced memory: {current_size / 1024:.1f} KiB, "
+                f"peak {peak_size / 1024:.1f} KiB\n\n"
+            )
+
+            for statistic in end_snapshot.compare_to(start_snapshot, "lineno")[
+                :TRACEMALLOC_TOP_SITES
+            ]:
+                dump_file.write(f"{statistic}\n")
+
+
+# PRIVATE FUNCTIONS START HERE
+def _start_cprofile_profile() -> Profile | None:
+    """
+    Start a cProfile profile unless another profiler is running.
+
+    Returns:
+        The running profile, None if another profiler is running.
+    """
+
+    if not _cprofile_lock.acquire(blocking=False):
+        return None
+
+    profile = Profile()
+
+    try:
+        profile.enable()
+    except ValueError:
+        # A profiler started outside of the routines already holds the profiling
+        # hook, which Python 3.12+ refuses to share
+        _cprofile_lock.release()
+        return None
+
+    return profile
+
+
+def _start_tracemalloc_profile() -> tracemalloc.Snapshot:
+    """Start tracing for a profile unless another profile is running, and snapshot."""
+    global _tracemalloc_profile_count  # pylint: disable=global-statement
+    global _is_tracing_started_by_profiles  # pylint: disable=global-statement
+
+    with _tracemalloc_lock:
+        if _tracemalloc_profile_count == 0:
+            _is_tracing_started_by_profiles = not tracemalloc.is_tracing()
+
+            if _is_tracing_started_by_profiles:
+                tracemalloc.start(TRACEMALLOC_FRAMES)
+
+            tracemalloc.reset_peak()
+
+        _tracemalloc_profile_count += 1
+
+        return tracemalloc.take_snapshot()
+
+
+def _stop_tracemalloc_profile() -> Tuple[tracemalloc.Snapshot, int, int]:
+    """
+    Snapshot the end of a profile and stop tracing if it is the last running one.
+
+    Returns:
+        The snapshot, the traced memory and the peak traced memory.
+    """
+
+    global _tracemalloc_profile_count  # pylint: disable=global-statement
+
+    with _tracemalloc_lock:
+        snapshot: tracemalloc.Snapshot = tracemalloc.take_snapshot()
+        current_size, peak_size = tracemalloc.get_traced_memory()
+        _tracemalloc_profile_count -= 1
+
+        if _tracemalloc_profile_count == 0 and _is_tracing_started_by_profiles:
+            tracemalloc.stop()
+
+        return snapshot, current_size, peak_size
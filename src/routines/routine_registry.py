@@ -0,0 +1,117 @@
+"""
+file_name = routine_registry.py
+Created On: 2026/10/18
+Lasted Updated: 2026/10/18
+Description: The routines are declared by the entry point of their decorated function,
+    so the RoutineManager only imports a routine module once the routine first runs and
+    the modules of routines that do not run are never imported.
+Edit Log:
+2026/10/18
+    - Created file
+    - Format with black
+"""
+
+# STANDARD LIBRARY IMPORTS
+from importlib import import_module
+from typing import Any, Callable, Iterable, List, NotRequired, Set, TypedDict
+
+# THIRD PARTY LIBRARY IMPORTS
+
+# LOCAL LIBRARY IMPORTS
+
+
+class RoutineEntry(TypedDict):
+    """The declaration of a routine in the routine registry."""
+
+    # The task name of the routine, the decorated function has to use the same name
+    name: str
+    # The decorated routine function as "package.module:attribute"
+    entry_point: str
+    # Disabled routines only run when they are selected by name, enabled by default
+    enabled: NotRequired[bool]
+    description: NotRequired[str]
+
+
+def select_routines(
+    routine_entries: List[RoutineEntry], only: Iterable[str] | None = None
+) -> List[RoutineEntry]:
+    """
+    Select the routines to run, without importing any of them.
+
+    Args:
+        routine_entries: The declared routines.
+        only: The names of the routines to run, disabled routines included. Every
+        enabled routine runs when not given.
+
+    Raises:
+        ValueError: If a name is declared twice or is not a declared routine.
+    """
+
+    names: Set[str] = set()
+
+    for routine_entry in routine_entries:
+        if routine_entry["name"] in names:
+            raise ValueError(f"Task name {routine_entry['name']} already exists.")
+
+        names.add(routine_entry["name"])
+
+    if only is None:
+        return [
+            routine_entry
+            for routine_entry in routine_entries
+            if routine_entry.get("enabled", True)
+        ]
+
+    selected_names: Set[str] = set(only)
+    unknown_names: Set[str] = selected_names - names
+
+    if unknown_names:
+        raise ValueError(
+            f"Unknown routines {', '.join(sorted(unknown_names))}, the routines are "
+            f"{', '.join(sorted(names))}"
+        )
+
+    return [
+        routine_entry
+        for routine_entry in routine_entries
+        if routine_entry["name"] in selected_names
+    ]
+
+
+def load_routine(routine_entry: RoutineEntry) -> Callable:
+    """
+    Import the module of a routine and get its decorated routine function.
+
+    Raises:
+        ValueError: If the entry point is not "module:attribute" or the task name of the
+        routine differs from the declared name.
+        TypeError: If the entry point is not a function decorated with RoutineDecorator.
+    """
+
+    module_name, separator, attribute_path = routine_entry["entry_point"].partition(":")
+
+    if not separator or not module_name or not attribute_path:
+        raise ValueError(
+            f"The entry point {routine_entry['entry_point']} of "
+            f"{routine_entry['name']} is not in the module:attribute form"
+        )
+
+    routine_function: Any = import_module(module_name)
+
+    for name in attribute_path.split("."):
+        routine_function = getattr(routine_function, name)
+
+    routine_decorator: Any = getattr(routine_function, "routine_decorator", None)
+
+    if routine_decorator is None:
+        raise TypeError(
+            f"{routine_entry['entry_point']} is not decorated with RoutineDecorator"
+        )
+
+    if routine_decorator.task_name != routine_entry["name"]:
+        raise ValueError(
+            f"{routine_entry['entry_point']} is the routine "
+            f"{routine_decorator.task_name}, not {routine_entry['name']}"
+        )
+
+    return routine_function
@@ -1,16 +1,25 @@
 """
 file_name = routine_scheduler.py
 Created On: 2024/06/29
-Lasted Updated: 2024/06/29
+Lasted Updated: 2026/10/18
 Description: _FILL OUT HERE_
 Edit Log:
 2024/06/29
     - Created file
+2026/10/18
+    - Cron expression schedules over precomputed bitsets, timezone and DST aware
+    - Fix the weekday schedule firing on the wrong day and at the wrong hour
+    - Reject cron expressions that never fire when the scheduler is created
+    - Treat stepped wildcard day fields as unrestricted and reject open ranges
 """
 
 # STANDARD LIBRARY IMPORTS
-from datetime import datetime, timedelta, date
+from datetime import datetime, timedelta, date, tzinfo
 from enum import Enum
+from math import ceil
+from time import time
+from typing import Dict, List, Tuple
+from zoneinfo import ZoneInfo
 
 # THIRD PARTY LIBRARY IMPORTS
 
@@ -31,14 +40,106 @@ class WeekdayMapper(Enum):
     SUNDAY = date(2023, 1, 8).weekday()
 
 
+CRON_MACROS: Dict[str, str] = {
+    "@yearly": "0 0 1 1 *",
+    "@annually": "0 0 1 1 *",
+    "@monthly": "0 0 1 * *",
+    "@weekly": "0 0 * * 0",
+    "@daily": "0 0 * * *",
+    "@midnight": "0 0 * * *",
+    "@hourly": "0 * * * *",
+}
+
+MONTH_NAMES: List[str] = [
+    "jan",
+    "feb",
+    "mar",
+    "apr",
+    "may",
+    "jun",
+    "jul",
+    "aug",
+    "sep",
+    "oct",
+    "nov",
+    "dec",
+]
+WEEKDAY_NAMES: List[str] = ["sun", "mon", "tue", "wed", "thu", "fri", "sat"]
+
+# (lowest value, highest value, names starting at the lowest value)
+CRON_FIELDS: List[Tuple[int, int, List[str]]] = [
+    (0, 59, []),  # minute
+    (0, 23, []),  # hour
+    (1, 31, []),  # day of month
+    (1, 12, MONTH_NAMES),  # month
+    (0, 7, WEEKDAY_NAMES),  # day of week, 0 and 7 are both sunday
+]
+
+# A schedule that matches nothing within this many years never fires, the longest
+# real gap is a February 29th that falls on a given weekday, every 28 years
+MAX_SEARCH_YEARS: int = 30
+
+
 class RoutineScheduler:
     """
-    A class to handle scheduling of routines
+    A class to handle scheduling of routines. Schedules are cron expressions
+    ("minute hour day-of-month month day-of-week") compiled into one bitset per field,
+    so finding the next matching hour or minute is a single bit operation instead of
+    stepping through time.
+
+    Times are evaluated on the wall clock of the given timezone, or of the system when
+    no timezone is given. A run inside a DST gap fires once the clock jumped, a run
+    inside a repeated hour only fires on its first occurrence.
+
+    Raises:
+        ValueError: If the cron expression is invalid or never fires.
     """
 
-    def __init__(self, day_to_run_on: int, hour_to_run_at: int):
-        self._day_to_run_on = day_to_run_on
-        self._hour_to_run_at = hour_to_run_at
+    def __init__(
+        self,
+        day_to_run_on: int | None = None,
+        hour_to_run_at: int = 0,
+        cron_expression: str | None = None,
+        timezone: str | tzinfo | None = None,
+    ):
+        if cron_expression is None:
+            if day_to_run_on is None:
+                raise ValueError("Either a weekday or a cron expression is required")
+
+            # datetime weekdays start on monday, cron weekdays start on sunday
+            cron_expression = f"0 {hour_to_run_at} * * {(day_to_run_on + 1) % 7}"
+
+        self._cron_expression = cron_expression
+        self._timezone: tzinfo | None = (
+            ZoneInfo(timezone) if isinstance(timezone, str) else timezone
+        )
+        (
+            self._minutes,
+            self._hours,
+            self._days_of_month,
+            self._months,
+            self._days_of_week,
+        ) = self._parse_cron_expression(cron_expression)
+
+        fields: List[str] = CRON_MACROS.get(cron_expression, cron_expression).split()
+        # Like cron, a day field starting with "*", such as "*/2", does not restrict
+        # the day, so both day fields have to match instead of either one
+        self._is_day_of_month_restricted: bool = not fields[2].startswith("*")
+        self._is_day_of_week_restricted: bool = not fields[4].startswith("*")
+
+        # A valid expression like "0 0 30 2 *" can still never fire, fail here instead
+        # of in the dispatcher of the routine manager
+        self.get_next_run_date()
+
+    @classmethod
+    def from_cron(
+        cls, cron_expression: str, timezone: str | tzinfo | None = None
+    ) -> "RoutineScheduler":
+        """
+        Create a scheduler from a cron expression, for example "30 2 * * mon-fri" or
+        "@daily". Fields accept "*", values, names, ranges, steps and lists.
+        """
+        return cls(cron_expression=cron_expression, timezone=timezone)
 
     def seconds_till_next_run(self) -> int:
         """
@@ -49,30 +150,176 @@ class RoutineScheduler:
         """
 
         next_run_date: datetime = self.get_next_run_date()
-        todays_date: datetime = datetime.now()
 
-        return int((next_run_date - todays_date).total_seconds())
+        return ceil(self._timestamp(next_run_date) - time())
 
-    # PRIVATE METHODS START HERE
-    def get_next_run_date(self) -> datetime:
+    def get_next_run_date(self, after: datetime | None = None) -> datetime:
         """
-        Get the next date where the routine will run based on todays date
+        Get the next date where the routine will run, strictly after the given date or
+        after now. The date is in the scheduler timezone, or naive local time.
         """
 
-        todays_date: datetime = datetime.now()
-        current_weekday = todays_date.weekday()
-        next_date: datetime
+        after_timestamp: float
 
-        if current_weekday == self._day_to_run_on:
-            next_date = todays_date + timedelta(days=self._day_to_run_on)
-        elif current_weekday < self._day_to_run_on:
-            next_date = todays_date + timedelta(
-                days=self._day_to_run_on - current_weekday
-            )
+        if after is None:
+            after_timestamp = time()
+            after = datetime.fromtimestamp(after_timestamp, self._timezone)
         else:
-            next_date = todays_date + timedelta(
-                days=7 - current_weekday + self._day_to_run_on
+            if after.tzinfo is not None:
+                after = (
+                    after.astimezone(self._timezone)
+                    if self._timezone is not None
+                    else after.astimezone().replace(tzinfo=None)
+                )
+
+            after_timestamp = self._timestamp(after)
+
+        candidate: datetime = after.replace(
+            tzinfo=None, second=0, microsecond=0
+        ) + timedelta(minutes=1)
+        search_end_year: int = candidate.year + MAX_SEARCH_YEARS
+
+        while True:
+            candidate = self._next_wall_clock_match(candidate, search_end_year)
+            next_run_date: datetime = candidate.replace(tzinfo=self._timezone)
+
+            # The wall clock can be behind the instant inside a repeated DST hour
+            if self._timestamp(next_run_date) > after_timestamp:
+                return next_run_date
+
+            candidate += timedelta(minutes=1)
+
+    # PRIVATE METHODS START HERE
+    @staticmethod
+    def _parse_cron_expression(cron_expression: str) -> List[int]:
+        """Parse a cron expression into a bitset per field, bit n set if n matches."""
+        fields: List[str] = CRON_MACROS.get(cron_expression, cron_expression).split()
+
+        if len(fields) != len(CRON_FIELDS):
+            raise ValueError(
+                f"Invalid cron expression {cron_expression!r}, expected 5 fields"
+            )
+
+        bitsets: List[int] = []
+
+        for field, (lowest, highest, names) in zip(fields, CRON_FIELDS):
+            bitset: int = 0
+
+            for part in field.lower().split(","):
+                value_range, _, step_text = part.partition("/")
+                step: int = int(step_text) if step_text else 1
+
+                if value_range == "*":
+                    start, end = lowest, highest
+                else:
+                    start_text, separator, end_text = value_range.partition("-")
+
+                    if separator and not end_text:
+                        raise ValueError(
+                            f"Invalid cron field {field!r} in {cron_expression!r}"
+                        )
+
+                    start = RoutineScheduler._parse_cron_value(
+                        start_text, lowest, names
+                    )
+                    end = (
+                        RoutineScheduler._parse_cron_value(end_text, lowest, names)
+                        if end_text
+                        else (highest if step_text else start)
+                    )
+
+                if step < 1 or not lowest <= start <= end <= highest:
+                    raise ValueError(
+                        f"Invalid cron field {field!r} in {cron_expression!r}"
+                    )
+
+                for value in range(start, end + 1, step):
+                    bitset |= 1 << value
+
+            bitsets.append(bitset)
+
+        # Sunday can be written as 0 or 7
+        if bitsets[4] & 1 << 7:
+            bitsets[4] = (bitsets[4] | 1) & ~(1 << 7)
+
+        return bitsets
+
+    @staticmethod
+    def _parse_cron_value(text: str, lowest: int, names: List[str]) -> int:
+        """Parse a number or a month or weekday name."""
+        if text in names:
+            return names.index(text) + lowest
+
+        if not text.isdigit():
+            raise ValueError(f"Invalid cron value {text!r}")
+
+        return int(text)
+
+    @staticmethod
+    def _next_set_bit(bitset: int, start: int) -> int:
+        """The lowest set bit at or above start, -1 if there is none."""
+        remaining_bits: int = bitset >> start
+
+        if not remaining_bits:
+            return -1
+
+        return start + (remaining_bits & -remaining_bits).bit_length() - 1
+
+    def _is_day_matching(self, day: datetime) -> bool:
+        """Whether the day matches, cron ORs the day fields when both are restricted."""
+        matches_day_of_month: bool = bool(self._days_of_month >> day.day & 1)
+        matches_day_of_week: bool = bool(
+            self._days_of_week >> (day.weekday() + 1) % 7 & 1
+        )
+
+        if self._is_day_of_month_restricted and self._is_day_of_week_restricted:
+            return matches_day_of_month or matches_day_of_week
+
+        return matches_day_of_month and matches_day_of_week
+
+    def _next_wall_clock_match(
+        self, candidate: datetime, search_end_year: int
+    ) -> datetime:
+        """The first naive wall clock minute at or after the candidate that matches."""
+        while candidate.year <= search_end_year:
+            if not self._months >> candidate.month & 1:
+                month: int = self._next_set_bit(self._months, candidate.month + 1)
+                candidate = (
+                    datetime(candidate.year, month, 1)
+                    if month != -1
+                    else datetime(candidate.year + 1, 1, 1)
+                )
+                continue
+
+            if not self._is_day_matching(candidate):
+                candidate = datetime(
+                    candidate.year, candidate.month, candidate.day
+                ) + timedelta(days=1)
+                continue
+
+            hour: int = self._next_set_bit(self._hours, candidate.hour)
+
+            if hour == -1:
+                candidate = datetime(
+                    candidate.year, candidate.month, candidate.day
+                ) + timedelta(days=1)
+                continue
+
+            minute: int = self._next_set_bit(
+                self._minutes, candidate.minute if hour == candidate.hour else 0
             )
 
-        next_date.replace(hour=self._hour_to_run_at, minute=0, second=0, microsecond=0)
-        return next_date
+            if minute == -1:
+                candidate = candidate.replace(hour=hour, minute=0) + timedelta(hours=1)
+                continue
+
+            return candidate.replace(hour=hour, minute=minute)
+
+        raise ValueError(f"The cron expression {self._cron_expression!r} never fires")
+
+    def _timestamp(self, wall_clock_date: datetime) -> float:
+        """The POSIX timestamp of a date in the scheduler timezone or in local time."""
+        if wall_clock_date.tzinfo is None and self._timezone is not None:
+            wall_clock_date = wall_clock_date.replace(tzinfo=self._timezone)
+
+        return wall_clock_date.timestamp()
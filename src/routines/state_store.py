@@ -0,0 +1,240 @@
+"""
+file_name = state_store.py
+Created On: 2026/10/18
+Lasted Updated: 2026/10/18
+Description: A small persistent state layer on sqlite3 in WAL mode, shared by every
+    routine for key/value state, per-file indexes and run history.
+Edit Log:
+2026/10/18
+    - Created file
+"""
+
+# STANDARD LIBRARY IMPORTS
+from json import dumps, loads
+from pathlib import Path
+from sqlite3 import Connection, connect
+from threading import Lock, local
+from time import time
+from typing import Any, Dict, Iterable, List, Tuple, TypedDict
+
+# THIRD PARTY LIBRARY IMPORTS
+
+# LOCAL LIBRARY IMPORTS
+
+DEFAULT_STATE_DATABASE_PATH: Path = (
+    Path(__file__).resolve().parents[2] / "state" / "routine_state.sqlite3"
+)
+
+# The number of runs kept per routine in the run history
+RUN_HISTORY_LIMIT: int = 1000
+
+SCHEMA: str = """
+CREATE TABLE IF NOT EXISTS key_values (
+    namespace TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (namespace, key)
+);
+CREATE TABLE IF NOT EXISTS file_index (
+    namespace TEXT NOT NULL,
+    path TEXT NOT NULL,
+    mtime REAL NOT NULL,
+    size INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (namespace, path)
+);
+CREATE TABLE IF NOT EXISTS run_history (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    routine TEXT NOT NULL,
+    started_at REAL NOT NULL,
+    duration REAL NOT NULL,
+    succeeded INTEGER NOT NULL,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS run_history_routine ON run_history (routine, id);
+"""
+
+
+class FileIndexRow(TypedDict):
+    """A row of a file index, the data is any JSON serializable value."""
+
+    mtime: float
+    size: int
+    data: Any
+
+
+class RunHistoryEntry(TypedDict):
+    """A single run of a routine."""
+
+    started_at: float
+    duration: float
+    succeeded: bool
+    error: str | None
+
+
+class StateStore:
+    """
+    Persistent routine state in a sqlite database. Every thread gets its own
+    connection, the database runs in WAL mode so readers never block the writer, and
+    writers wait on each other through the busy timeout instead of failing.
+    """
+
+    def __init__(self, database_path: str | Path = DEFAULT_STATE_DATABASE_PATH) -> None:
+        self._database_path = Path(database_path)
+        self._connections = local()
+        self._schema_lock = Lock()
+        self._schema_created: bool = False
+
+    # KEY VALUE STATE
+    def get_value(self, namespace: str, key: str, default: Any = None) -> Any:
+        """Get a JSON value, or the default if it was never set."""
+        row = (
+            self._connection()
+            .execute(
+                "SELECT value FROM key_values WHERE namespace = ? AND key = ?",
+                (namespace, key),
+            )
+            .fetchone()
+        )
+
+        return default if row is None else loads(row[0])
+
+    def set_value(self, namespace: str, key: str, value: Any) -> None:
+        """Set a JSON serializable value."""
+        with self._connection() as connection:
+            connection.execute(
+                "INSERT INTO key_values (namespace, key, value, updated_at) "
+                "VALUES (?, ?, ?, ?) ON CONFLICT (namespace, key) DO UPDATE SET "
+                "value = excluded.value, updated_at = excluded.updated_at",
+                (namespace, key, dumps(value), time()),
+            )
+
+    # FILE INDEXES
+    def load_file_index(self, namespace: str) -> Dict[str, FileIndexRow]:
+        """Load every row of a file index, keyed by path."""
+        rows = self._connection().execute(
+            "SELECT path, mtime, size, data FROM file_index WHERE namespace = ?",
+            (namespace,),
+        )
+
+        return {
+            path: {"mtime": mtime, "size": size, "data": loads(data)}
+            for path, mtime, size, data in rows
+        }
+
+    def update_file_index(
+        self,
+        namespace: str,
+        upserts: Dict[str, FileIndexRow],
+        removals: Iterable[str] = (),
+    ) -> None:
+        """Insert or replace the given rows and delete the removed paths, atomically."""
+        with self._connection() as connection:
+            connection.executemany(
+                "INSERT OR REPLACE INTO file_index (namespace, path, mtime, size, data) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (
+                    (namespace, path, row["mtime"], row["size"], dumps(row["data"]))
+                    for path, row in upserts.items()
+                ),
+            )
+            connection.executemany(
+                "DELETE FROM file_index WHERE namespace = ? AND path = ?",
+                ((namespace, path) for path in removals),
+            )
+
+    def clear_file_index(self, namespace: str) -> None:
+        """Delete every row of a file index."""
+        with self._connection() as connection:
+            connection.execute(
+                "DELETE FROM file_index WHERE namespace = ?", (namespace,)
+            )
+
+    # RUN HISTORY
+    def record_run(
+        self,
+        routine: str,
+        started_at: float,
+        duration: float,
+        succeeded: bool,
+        error: str | None = None,
+    ) -> None:
+        """Record a run of a routine, only keeping the latest runs per routine."""
+        with self._connection() as connection:
+            connection.execute(
+                "INSERT INTO run_history (routine, started_at, duration, succeeded, "
+                "error) VALUES (?, ?, ?, ?, ?)",
+                (routine, started_at, duration, int(succeeded), error),
+            )
+            connection.execute(
+                "DELETE FROM run_history WHERE routine = ? AND id <= (SELECT id FROM "
+                "run_history WHERE routine = ? ORDER BY id DESC LIMIT 1 OFFSET ?)",
+                (routine, routine, RUN_HISTORY_LIMIT),
+            )
+
+    def get_run_history(self, routine: str, limit: int = 10) -> List[RunHistoryEntry]:
+        """Get the latest runs of a routine, newest first."""
+        rows: List[Tuple[float, float, int, str | None]] = (
+            self._connection()
+            .execute(
+                "SELECT started_at, duration, succeeded, error FROM run_history "
+                "WHERE routine = ? ORDER BY id DESC LIMIT ?",
+                (routine, limit),
+            )
+            .fetchall()
+        )
+
+        return [
+            {
+                "started_at": started_at,
+                "duration": duration,
+                "succeeded": bool(succeeded),
+                "error": error,
+            }
+            for started_at, duration, succeeded, error in rows
+        ]
+
+    def close(self) -> None:
+        """Close the connection of the calling thread."""
+        connection: Connection | None = getattr(self._connections, "connection", None)
+
+        if connection is not None:
+            connection.close()
+            self._connections.connection = None
+
+    # PRIVATE METHODS START HERE
+    def _connection(self) -> Connection:
+        """Get the connection of the calling thread, opening it on first use."""
+        connection: Connection | None = getattr(self._connections, "connection", None)
+
+        if connection is not None:
+            return connection
+
+        self._database_path.parent.mkdir(parents=True, exist_ok=True)
+
+        connection = connect(self._database_path, timeout=30)
+        connection.execute("PRAGMA journal_mode = WAL")
+        connection.execute("PRAGMA synchronous = NORMAL")
+
+        with self._schema_lock:
+            if not self._schema_created:
+                connection.executescript(SCHEMA)
+                self._schema_created = True
+
+        self._connections.connection = connection
+
+        return connection
+
+
+_state_store: StateStore | None = None
+
+
+def get_state_store() -> StateStore:
+    """Get the state store shared by every routine."""
+    global _state_store  # pylint: disable=global-statement
+
+    if _state_store is None:
+        _state_store = StateStore()
+
+    return _state_store
@@ -0,0 +1,100 @@
+"""
+file_name = test_benchmarks.py
+Created On: 2026/10/18
+Lasted Updated: 2026/10/18
+Description: Smoke tests of the synthetic vaults and the force graph benchmark.
+Edit Log:
+2026/10/18
+    - Created file
+"""
+
+# STANDARD LIBRARY IMPORTS
+from os import stat, walk
+from os.path import join, relpath
+from pathlib import Path
+from typing import Dict
+
+# THIRD PARTY LIBRARY IMPORTS
+
+# LOCAL LIBRARY IMPORTS
+from benchmarks.force_graph_benchmark import benchmark_scale
+from benchmarks.vault_generator import (
+    DEFAULT_VAULT_SHAPE,
+    VaultShape,
+    generate_vault,
+    modify_notes,
+)
+
+SMALL_VAULT_SHAPE: VaultShape = {
+    **DEFAULT_VAULT_SHAPE,
+    "notes": 40,
+    "links_per_note": 4,
+    "folder_depth": 2,
+    "folders_per_level": 2,
+}
+
+
+def read_vault(vault_path: str) -> Dict[str, bytes]:
+    vault_files: Dict[str, bytes] = {}
+
+    for root, _, names in walk(vault_path):
+        for name in names:
+            with open(join(root, name), "rb") as file:
+                vault_files[relpath(join(root, name), vault_path)] = file.read()
+
+    return vault_files
+
+
+def test_generate_vault_is_deterministic(tmp_path: Path):
+    first_summary = generate_vault(str(tmp_path / "first"), SMALL_VAULT_SHAPE)
+    second_summary = generate_vault(str(tmp_path / "second"), SMALL_VAULT_SHAPE)
+    other_summary = generate_vault(
+        str(tmp_path / "other"), {**SMALL_VAULT_SHAPE, "seed": 1}
+    )
+    vault_files = read_vault(str(tmp_path / "first"))
+
+    assert first_summary == second_summary
+    assert vault_files == read_vault(str(tmp_path / "second"))
+    assert vault_files != read_vault(str(tmp_path / "other"))
+    assert other_summary["notes"] == 40
+
+
+def test_generate_vault_summary(tmp_path: Path):
+    summary = generate_vault(str(tmp_path), SMALL_VAULT_SHAPE)
+    vault_files = read_vault(str(tmp_path))
+    note_count = sum(path.endswith(".md") for path in vault_files)
+    attachment_count = sum(path.endswith(".png") for path in vault_files)
+
+    assert summary == {
+        "notes": note_count,
+        "attachments": attachment_count,
+        "links": 40 * 4 + attachment_count,
+        "folders": 1 + 2 + 4,
+    }
+    assert join(".obsidian", "app.json") in vault_files
+
+
+def test_modify_notes(tmp_path: Path):
+    generate_vault(str(tmp_path), SMALL_VAULT_SHAPE)
+    paths = sorted(path for path in read_vault(str(tmp_path)) if path.endswith(".md"))
+    before = read_vault(str(tmp_path))
+    modified_time = stat(tmp_path / paths[0]).st_mtime
+
+    modify_notes(str(tmp_path), paths[:2])
+    after = read_vault(str(tmp_path))
+
+    assert sorted(path for path in before if before[path] != after[path]) == paths[:2]
+    assert after[paths[0]].startswith(before[paths[0]])
+    assert stat(tmp_path / paths[0]).st_mtime > modified_time
+
+
+def test_benchmark_scale():
+    result = benchmark_scale(SMALL_VAULT_SHAPE, 0.1, None, 10_000)
+
+    assert result["vault"]["notes"] == 40
+    assert set(result["scenarios"]) == {"cold", "unchanged", "incremental"}
+    assert all(
+        scenario["seconds"] > 0 and scenario["phases"]
+        for scenario in result["scenarios"].values()
+    )
+    assert result["peak_traced_memory_kib"] > 0
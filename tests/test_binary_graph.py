@@ -0,0 +1,89 @@
+"""
+file_name = test_binary_graph.py
+Created On: 2026/10/18
+Lasted Updated: 2026/10/18
+Description: Tests of the compact binary force graph format.
+Edit Log:
+2026/10/18
+    - Created file
+"""
+
+# STANDARD LIBRARY IMPORTS
+from pathlib import Path
+
+# THIRD PARTY LIBRARY IMPORTS
+import pytest
+
+# LOCAL LIBRARY IMPORTS
+from src.routines.force_graph_updater.binary_graph import (
+    BINARY_GRAPH_HEADER,
+    SECTION_ALIGNMENT,
+    BinaryGraphError,
+    BinaryGraphReader,
+    read_binary_graph,
+    write_binary_graph,
+)
+
+
+def test_round_trip(tmp_path: Path):
+    output_path = str(tmp_path / "vault.fgb")
+    write_binary_graph(
+        output_path,
+        [("A", 3), ("Bé 🌱", -1), ("C", 0)],
+        [("A", "Bé 🌱"), ("C", "A")],
+    )
+
+    assert read_binary_graph(output_path) == {
+        "nodes": [
+            {"id": "A", "name": "A", "val": 3},
+            {"id": "Bé 🌱", "name": "Bé 🌱", "val": -1},
+            {"id": "C", "name": "C", "val": 0},
+        ],
+        "links": [
+            {"source": "A", "target": "Bé 🌱"},
+            {"source": "C", "target": "A"},
+        ],
+    }
+
+
+def test_strings_are_interned(tmp_path: Path):
+    output_path = str(tmp_path / "vault.fgb")
+    write_binary_graph(output_path, [("A", 1), ("A", 2)], [("A", "A")])
+
+    with BinaryGraphReader(output_path) as graph:
+        assert (graph.string_count, graph.node_count, graph.link_count) == (1, 2, 1)
+        assert list(graph.nodes()) == [("A", 1), ("A", 2)]
+        assert list(graph.links()) == [("A", "A")]
+
+
+def test_sections_are_aligned(tmp_path: Path):
+    output_path = tmp_path / "vault.fgb"
+    write_binary_graph(str(output_path), [("Odd", 1), ("B", 2)], [("Odd", "B")])
+    section_offsets = BINARY_GRAPH_HEADER.unpack_from(output_path.read_bytes())[6:]
+
+    assert all(offset % SECTION_ALIGNMENT == 0 for offset in section_offsets)
+
+
+def test_empty_graph(tmp_path: Path):
+    output_path = str(tmp_path / "vault.fgb")
+    write_binary_graph(output_path, [], [])
+
+    assert read_binary_graph(output_path) == {"nodes": [], "links": []}
+
+
+def test_link_to_unknown_node(tmp_path: Path):
+    with pytest.raises(KeyError):
+        write_binary_graph(str(tmp_path / "vault.fgb"), [("A", 1)], [("A", "B")])
+
+    assert not (tmp_path / "vault.fgb").exists()
+
+
+def test_invalid_files(tmp_path: Path):
+    (tmp_path / "small.fgb").write_bytes(b"FGRB")
+    (tmp_path / "other.fgb").write_bytes(b"\0" * BINARY_GRAPH_HEADER.size)
+
+    with pytest.raises(BinaryGraphError, match="too small"):
+        read_binary_graph(str(tmp_path / "small.fgb"))
+
+    with pytest.raises(BinaryGraphError, match="is not a version"):
+        read_binary_graph(str(tmp_path / "other.fgb"))
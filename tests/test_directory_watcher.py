@@ -0,0 +1,115 @@
+"""
+file_name = test_directory_watcher.py
+Created On: 2026/10/18
+Lasted Updated: 2026/10/18
+Description: Tests of the debounced inotify watching of directory trees.
+Edit Log:
+2026/10/18
+    - Created file
+    - Changes that keep coming are reported after max_wait
+"""
+
+# STANDARD LIBRARY IMPORTS
+from pathlib import Path
+from typing import Awaitable, Callable
+
+# THIRD PARTY LIBRARY IMPORTS
+from asyncio import create_task, get_running_loop, run, sleep
+import pytest
+
+# LOCAL LIBRARY IMPORTS
+from src.routines.directory_watcher import DirectoryWatcher, DirectoryWatcherError
+
+pytestmark = pytest.mark.skipif(
+    not DirectoryWatcher.is_supported(), reason="inotify is only available on Linux"
+)
+
+
+def watch(
+    tmp_path: Path,
+    test: Callable[[DirectoryWatcher], Awaitable[None]],
+    max_wait: float = 60,
+) -> None:
+    """Run a test with a started watcher of the temporary directory."""
+
+    async def run_test() -> None:
+        directory_watcher = DirectoryWatcher({".git"}, debounce=0.1, max_wait=max_wait)
+        directory_watcher.start()
+
+        try:
+            directory_watcher.watch([str(tmp_path)])
+            await test(directory_watcher)
+        finally:
+            directory_watcher.close()
+
+    run(run_test())
+
+
+def test_no_changes(tmp_path):
+    async def test(directory_watcher: DirectoryWatcher) -> None:
+        assert not await directory_watcher.wait_for_changes(0.1)
+
+    watch(tmp_path, test)
+
+
+def test_burst_of_writes_is_one_change(tmp_path):
+    async def test(directory_watcher: DirectoryWatcher) -> None:
+        for index in range(5):
+            (tmp_path / f"{index}.md").write_text("note", encoding="UTF-8")
+            await sleep(0.02)
+
+        assert await directory_watcher.wait_for_changes(1)
+        assert not await directory_watcher.wait_for_changes(0.2)
+
+    watch(tmp_path, test)
+
+
+def test_continuous_writes_are_reported_after_max_wait(tmp_path):
+    async def write_notes() -> None:
+        for index in range(100):
+            (tmp_path / f"{index}.md").write_text("note", encoding="UTF-8")
+            await sleep(0.03)
+
+    async def test(directory_watcher: DirectoryWatcher) -> None:
+        writer = create_task(write_notes())
+        loop = get_running_loop()
+        start_time: float = loop.time()
+
+        try:
+            assert await directory_watcher.wait_for_changes(1)
+            assert loop.time() - start_time < 0.6
+            assert await directory_watcher.wait_for_changes(1)
+        finally:
+            writer.cancel()
+
+    watch(tmp_path, test, max_wait=0.3)
+
+
+def test_new_directories_are_watched(tmp_path):
+    async def test(directory_watcher: DirectoryWatcher) -> None:
+        (tmp_path / "new").mkdir()
+        assert await directory_watcher.wait_for_changes(1)
+
+        (tmp_path / "new" / "note.md").write_text("note", encoding="UTF-8")
+        assert await directory_watcher.wait_for_changes(1)
+
+    watch(tmp_path, test)
+
+
+def test_ignored_directories(tmp_path):
+    (tmp_path / ".git").mkdir()
+
+    async def test(directory_watcher: DirectoryWatcher) -> None:
+        (tmp_path / ".git" / "index").write_bytes(b"index")
+
+        assert not await directory_watcher.wait_for_changes(0.3)
+
+    watch(tmp_path, test)
+
+
+def test_missing_directory(tmp_path):
+    async def test(directory_watcher: DirectoryWatcher) -> None:
+        with pytest.raises(DirectoryWatcherError, match="Can not watch"):
+            directory_watcher.watch([str(tmp_path / "missing")])
+
+    watch(tmp_path, test)
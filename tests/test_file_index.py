@@ -0,0 +1,103 @@
+"""
+file_name = test_file_index.py
+Created On: 2026/10/18
+Lasted Updated: 2026/10/18
+Description: Tests of the per-file index the force graph rebuilds incrementally from.
+Edit Log:
+2026/10/18
+    - Created file
+"""
+
+# STANDARD LIBRARY IMPORTS
+from pathlib import Path
+from typing import Dict
+
+# THIRD PARTY LIBRARY IMPORTS
+import pytest
+
+# LOCAL LIBRARY IMPORTS
+from src.routines.force_graph_updater.file_index import (
+    ExtractedNoteData,
+    FileIndex,
+    FileIndexDiff,
+    FileStat,
+)
+from src.routines.state_store import StateStore
+
+STATS: Dict[str, FileStat] = {"A.md": (1.0, 10), "B.md": (2.0, 20)}
+
+NOTE_DATA: Dict[str, ExtractedNoteData] = {
+    "A.md": {"links": {"C", "B"}, "aliases": {"First"}},
+    "B.md": {"links": set(), "aliases": set()},
+}
+
+
+@pytest.fixture(name="state_store")
+def fixture_state_store(tmp_path: Path) -> StateStore:
+    return StateStore(tmp_path / "state.sqlite3")
+
+
+def load_index(state_store: StateStore) -> FileIndex:
+    file_index = FileIndex(state_store, "vault")
+    file_index.load()
+
+    return file_index
+
+
+def test_diff_and_apply(state_store):
+    file_index: FileIndex = load_index(state_store)
+    diff: FileIndexDiff = file_index.diff(STATS)
+
+    assert diff == {"added": {"A.md", "B.md"}, "modified": set(), "removed": set()}
+    file_index.apply(diff, NOTE_DATA)
+    assert file_index.entries["A.md"] == {
+        "mtime": 1.0,
+        "size": 10,
+        "links": ["B", "C"],
+        "aliases": ["First"],
+    }
+
+    # A changed size or modification time is a modification
+    diff = file_index.diff({"A.md": (1.0, 11), "C.md": (3.0, 30)})
+    assert diff == {"added": {"C.md"}, "modified": {"A.md"}, "removed": {"B.md"}}
+
+
+def test_unchanged_files(state_store):
+    file_index: FileIndex = load_index(state_store)
+    file_index.apply(file_index.diff(STATS), NOTE_DATA)
+
+    assert not FileIndex.has_changes(file_index.diff(STATS))
+
+
+def test_save_and_load(state_store):
+    file_index: FileIndex = load_index(state_store)
+    file_index.apply(file_index.diff(STATS), NOTE_DATA)
+    file_index.save()
+
+    file_index.apply(file_index.diff({"A.md": (5.0, 10)}), {"A.md": NOTE_DATA["B.md"]})
+    file_index.save()
+
+    reloaded: FileIndex = load_index(state_store)
+    assert reloaded.entries == file_index.entries
+    assert list(reloaded.entries) == ["A.md"]
+    assert reloaded.entries["A.md"]["links"] == []
+
+
+def test_unsaved_changes_are_dropped_on_unload(state_store):
+    file_index: FileIndex = load_index(state_store)
+    file_index.apply(file_index.diff(STATS), NOTE_DATA)
+    file_index.unload()
+
+    assert not file_index.is_loaded
+    file_index.load()
+    assert file_index.diff(STATS)["added"] == {"A.md", "B.md"}
+
+
+def test_version_change_starts_over(state_store, monkeypatch):
+    file_index: FileIndex = load_index(state_store)
+    file_index.apply(file_index.diff(STATS), NOTE_DATA)
+    file_index.save()
+
+    monkeypatch.setattr(FileIndex, "version", FileIndex.version + 1)
+
+    assert load_index(state_store).entries == {}
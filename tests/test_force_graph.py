@@ -0,0 +1,347 @@
+"""
+file_name = test_force_graph.py
+Created On: 2026/10/18
+Lasted Updated: 2026/10/18
+Description: Tests of the force graph updates of a vault that is a git clone.
+Edit Log:
+2026/10/18
+    - Created file
+    - Rebuild local edits of a vault whose HEAD is unchanged
+    - Keep the blocking work of an update off the event loop
+    - Log the phase durations with the vault path
+    - Only resolve the links of modified notes
+    - Cover the single walk of the vault and its ignored files
+    - Skip the scan on an unchanged HEAD with a clean worktree
+"""
+
+# STANDARD LIBRARY IMPORTS
+from json import load
+from os import utime
+from pathlib import Path
+from subprocess import run
+from threading import current_thread, main_thread
+from typing import Callable, Dict, List, Set, Tuple
+
+# THIRD PARTY LIBRARY IMPORTS
+from asyncio import Semaphore
+from asyncio import run as run_async
+import pytest
+
+# LOCAL LIBRARY IMPORTS
+from src.routines.force_graph_updater import force_graph as force_graph_module
+from src.routines.force_graph_updater.file_index import FileIndex
+from src.routines.force_graph_updater.force_graph import ForceGraph
+from src.routines.force_graph_updater.link_index import LinkIndex
+from src.routines.force_graph_updater.note_resolver import NoteResolver
+from src.routines.force_graph_updater.routine import update_force_graph
+from src.routines.state_store import StateStore
+
+
+def git(repository_path: Path, *arguments: str) -> None:
+    run(
+        ["git", "-C", str(repository_path), *arguments],
+        check=True,
+        capture_output=True,
+    )
+
+
+def commit_note(repository_path: Path, name: str, content: str) -> None:
+    """Commit a note to a clone and push it to the origin."""
+    (repository_path / f"{name}.md").write_text(content, encoding="UTF-8")
+    git(repository_path, "add", "-A")
+    git(repository_path, "commit", "-q", "-m", f"Add {name}")
+    git(repository_path, "push", "-q")
+
+
+@pytest.fixture(name="vault")
+def fixture_vault(tmp_path: Path) -> Tuple[Path, Path]:
+    """A vault cloned from a bare origin, and a second clone to push from."""
+    origin_path: Path = tmp_path / "origin.git"
+    vault_path: Path = tmp_path / "vault"
+    writer_path: Path = tmp_path / "writer"
+    run(["git", "init", "-q", "--bare", str(origin_path)], check=True)
+    run(["git", "clone", "-q", str(origin_path), str(writer_path)], check=True)
+    git(writer_path, "config", "user.email", "test@example.com")
+    git(writer_path, "config", "user.name", "Test")
+    commit_note(writer_path, "A", "[[B]]")
+    commit_note(writer_path, "B", "")
+    run(["git", "clone", "-q", str(origin_path), str(vault_path)], check=True)
+
+    return vault_path, writer_path
+
+
+def create_force_graph(tmp_path: Path, vault_path: Path) -> ForceGraph:
+    return ForceGraph(
+        str(tmp_path / "graph"),
+        str(vault_path),
+        state_store=StateStore(tmp_path / "state.sqlite3"),
+        delta_history=0,
+    )
+
+
+def read_graph(tmp_path: Path) -> Tuple[Set[str], Set[Tuple[str, str]]]:
+    with open(tmp_path / "graph.json", encoding="UTF-8") as file:
+        graph = load(file)
+
+    return {node["id"] for node in graph["nodes"]}, {
+        (link["source"], link["target"]) for link in graph["links"]
+    }
+
+
+def test_failed_build_is_retried_on_the_same_head(vault, tmp_path, monkeypatch):
+    vault_path, writer_path = vault
+    force_graph: ForceGraph = create_force_graph(tmp_path, vault_path)
+    run_async(force_graph.update_force_graph_json())
+    assert read_graph(tmp_path) == ({"A", "B"}, {("A", "B")})
+
+    commit_note(writer_path, "C", "[[A]]")
+    write_graph_json = force_graph_module.write_graph_json
+
+    def fail_to_write(*arguments, **keyword_arguments):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(force_graph_module, "write_graph_json", fail_to_write)
+
+    with pytest.raises(OSError):
+        run_async(force_graph.update_force_graph_json())
+
+    # The pull already moved HEAD, the next run still has to build C
+    monkeypatch.setattr(force_graph_module, "write_graph_json", write_graph_json)
+    run_async(force_graph.update_force_graph_json())
+    assert read_graph(tmp_path) == ({"A", "B", "C"}, {("A", "B"), ("C", "A")})
+
+
+def test_unchanged_head_is_skipped(vault, tmp_path, capsys):
+    vault_path, _ = vault
+    force_graph: ForceGraph = create_force_graph(tmp_path, vault_path)
+    run_async(force_graph.update_force_graph_json())
+
+    # Folders the graph ignores do not count as local changes
+    (vault_path / ".obsidian").mkdir()
+    (vault_path / ".obsidian" / "workspace.json").write_text("{}", encoding="UTF-8")
+    run_async(force_graph.update_force_graph_json())
+
+    assert (
+        "No new commits or local changes, skipping force graph update"
+        in capsys.readouterr().out
+    )
+    # The vault is not scanned at all
+    assert "git_status" in force_graph.last_phase_durations
+    assert "scan" not in force_graph.last_phase_durations
+
+
+@pytest.mark.parametrize(
+    "note, content, link",
+    [
+        ("D", "[[B]]", ("D", "B")),
+        ("B", "[[A]]", ("B", "A")),
+        ("folder/D", "[[B]]", ("D", "B")),
+    ],
+)
+def test_local_edit_on_the_same_head_is_built(vault, tmp_path, note, content, link):
+    vault_path, _ = vault
+    force_graph: ForceGraph = create_force_graph(tmp_path, vault_path)
+    run_async(force_graph.update_force_graph_json())
+
+    # An edit the watcher reports, not committed so HEAD stays the same
+    (vault_path / f"{note}.md").parent.mkdir(exist_ok=True)
+    (vault_path / f"{note}.md").write_text(content, encoding="UTF-8")
+    run_async(force_graph.update_force_graph_json())
+
+    assert "scan" in force_graph.last_phase_durations
+    assert link in read_graph(tmp_path)[1]
+
+
+def test_gitignored_notes_are_scanned(vault, tmp_path):
+    vault_path, writer_path = vault
+    (writer_path / ".gitignore").write_text("private/\n", encoding="UTF-8")
+    git(writer_path, "add", ".gitignore")
+    git(writer_path, "commit", "-q", "-m", "Ignore private")
+    git(writer_path, "push", "-q")
+    force_graph: ForceGraph = create_force_graph(tmp_path, vault_path)
+    run_async(force_graph.update_force_graph_json())
+
+    # Git can not tell whether an ignored note changed, the vault is scanned
+    (vault_path / "private").mkdir()
+    (vault_path / "private" / "D.md").write_text("[[A]]", encoding="UTF-8")
+    run_async(force_graph.update_force_graph_json())
+
+    assert ("D", "A") in read_graph(tmp_path)[1]
+
+
+def test_blocking_work_runs_off_the_event_loop(vault, tmp_path, monkeypatch):
+    vault_path, _ = vault
+    on_event_loop: Dict[str, bool] = {}
+
+    def record(owner: type, name: str) -> None:
+        function: Callable = getattr(owner, name)
+
+        def recorded(*arguments, **keyword_arguments):
+            key: str = f"{owner.__name__}.{name}"
+            on_event_loop[key] = on_event_loop.get(key, False) or (
+                current_thread() is main_thread()
+            )
+            return function(*arguments, **keyword_arguments)
+
+        monkeypatch.setattr(owner, name, recorded)
+
+    for name in ("load", "diff", "apply", "save"):
+        record(FileIndex, name)
+
+    for name in ("load", "diff", "apply"):
+        record(LinkIndex, name)
+
+    for name in ("_build_note_resolver", "_resolve_graph", "_update_timestamp"):
+        record(ForceGraph, name)
+
+    force_graph: ForceGraph = create_force_graph(tmp_path, vault_path)
+    run_async(force_graph.update_force_graph_json())
+    (vault_path / "D.md").write_text("[[A]]", encoding="UTF-8")
+    run_async(force_graph.update_force_graph_json())
+
+    assert on_event_loop == {
+        "FileIndex.load": False,
+        "FileIndex.diff": False,
+        "FileIndex.apply": False,
+        "FileIndex.save": False,
+        "LinkIndex.load": False,
+        "LinkIndex.diff": False,
+        "LinkIndex.apply": False,
+        "ForceGraph._build_note_resolver": False,
+        "ForceGraph._resolve_graph": False,
+        "ForceGraph._update_timestamp": False,
+    }
+
+
+def test_phases_are_logged_with_the_vault(vault, tmp_path, monkeypatch, caplog):
+    vault_path, _ = vault
+    force_graph: ForceGraph = create_force_graph(tmp_path, vault_path)
+    caplog.set_level("INFO", "force_graph_routine")
+
+    assert run_async(update_force_graph(force_graph, Semaphore()))
+
+    def fail_to_write(*arguments, **keyword_arguments):
+        raise OSError("disk full")
+
+    (vault_path / "D.md").write_text("[[A]]", encoding="UTF-8")
+    monkeypatch.setattr(force_graph_module, "write_graph_json", fail_to_write)
+
+    assert not run_async(update_force_graph(force_graph, Semaphore()))
+
+    phase_messages: List[str] = [
+        record.getMessage()
+        for record in caplog.records
+        if record.getMessage().startswith("Force graph phases")
+    ]
+    assert len(phase_messages) == 2
+
+    for message in phase_messages:
+        assert message.startswith(f"Force graph phases of {vault_path}: git_pull ")
+        assert "total " in message
+
+
+@pytest.fixture(name="resolved_links")
+def fixture_resolved_links(monkeypatch) -> List[str]:
+    """The links resolved by every note resolver."""
+    resolved_links: List[str] = []
+    resolve: Callable = NoteResolver.resolve
+
+    def recorded_resolve(note_resolver: NoteResolver, link: str) -> str | None:
+        resolved_links.append(link)
+        return resolve(note_resolver, link)
+
+    monkeypatch.setattr(NoteResolver, "resolve", recorded_resolve)
+
+    return resolved_links
+
+
+def write_notes(vault_path: Path, **notes: str) -> None:
+    vault_path.mkdir(exist_ok=True)
+
+    for name, content in notes.items():
+        (vault_path / f"{name}.md").write_text(content, encoding="UTF-8")
+
+
+def test_only_modified_notes_are_resolved(tmp_path, resolved_links):
+    vault_path: Path = tmp_path / "vault"
+    write_notes(vault_path, A="[[B]] [[C]]", B="[[C]] [[Missing]]", C="")
+    force_graph: ForceGraph = create_force_graph(tmp_path, vault_path)
+    run_async(force_graph.update_force_graph_json())
+    assert sorted(resolved_links) == ["B", "C", "C", "Missing"]
+
+    resolved_links.clear()
+    write_notes(vault_path, A="[[C]] [[Other]] and more text")
+    run_async(force_graph.update_force_graph_json())
+
+    assert sorted(resolved_links) == ["C", "Other"]
+    assert read_graph(tmp_path) == ({"A", "B", "C"}, {("A", "C"), ("B", "C")})
+    assert force_graph.link_index.broken_links("A") == ["Other"]
+    assert force_graph.link_index.broken_links("B") == ["Missing"]
+
+
+@pytest.mark.parametrize(
+    "change",
+    [
+        # A new note can be the target of a broken link
+        lambda vault_path: write_notes(vault_path, Missing=""),
+        # A new alias can be the target of a broken link
+        lambda vault_path: write_notes(vault_path, C="---\naliases: [Missing]\n---\n"),
+        lambda vault_path: (vault_path / "C.md").unlink(),
+        lambda vault_path: (vault_path / "Missing").mkdir()
+        or (vault_path / "Missing" / "Missing.png").write_bytes(b""),
+    ],
+    ids=["added_note", "changed_alias", "removed_note", "added_file"],
+)
+def test_every_note_is_resolved_when_the_files_change(tmp_path, resolved_links, change):
+    vault_path: Path = tmp_path / "vault"
+    write_notes(vault_path, A="[[B]] [[C]]", B="[[C]] [[Missing]]", C="")
+    force_graph: ForceGraph = create_force_graph(tmp_path, vault_path)
+    run_async(force_graph.update_force_graph_json())
+
+    resolved_links.clear()
+    change(vault_path)
+    run_async(force_graph.update_force_graph_json())
+
+    assert "B" in resolved_links
+    # A fresh instance resolves every note of the vault
+    expected_graph = read_graph(tmp_path)
+    (tmp_path / "graph.json").unlink()
+    run_async(
+        create_force_graph(tmp_path / "fresh", vault_path).update_force_graph_json()
+    )
+    assert read_graph(tmp_path / "fresh") == expected_graph
+
+
+def test_scan_vault(tmp_path):
+    vault_path: Path = tmp_path / "vault"
+    write_notes(vault_path, A="[[B]]", Todo="[[A]]")
+    (vault_path / "sub" / "deep").mkdir(parents=True)
+    write_notes(vault_path / "sub" / "deep", B="")
+    (vault_path / "sub" / "image.png").write_bytes(b"png")
+    (vault_path / ".obsidian").mkdir()
+    write_notes(vault_path / ".obsidian", Workspace="")
+    (vault_path / ".DS_Store").write_bytes(b"")
+    utime(vault_path / "sub" / "image.png", (2000000000, 2000000000))
+
+    scan_result = create_force_graph(tmp_path, vault_path)._scan_vault(str(vault_path))
+
+    assert scan_result["md_files"] == {
+        f"{vault_path}/A.md": "A",
+        f"{vault_path}/sub/deep/B.md": "B",
+    }
+    assert scan_result["md_file_stats"][f"{vault_path}/A.md"][1] == len("[[B]]")
+    assert scan_result["other_files"] == {(f"{vault_path}/sub/image.png", "image.png")}
+    assert scan_result["latest_mod_time"] == 2000000000
+
+
+def test_deleted_note_is_detected(tmp_path):
+    vault_path: Path = tmp_path / "vault"
+    write_notes(vault_path, A="[[B]]", B="")
+    force_graph: ForceGraph = create_force_graph(tmp_path, vault_path)
+    run_async(force_graph.update_force_graph_json())
+
+    # Deleting a note does not raise the latest modification time of the vault
+    (vault_path / "A.md").unlink()
+    run_async(force_graph.update_force_graph_json())
+
+    assert read_graph(tmp_path) == ({"B"}, set())
@@ -0,0 +1,175 @@
+"""
+file_name = test_force_graph_routine.py
+Created On: 2026/10/18
+Lasted Updated: 2026/10/18
+Description: Tests of the force graph routine that keeps the force graphs of every vault
+    warm and updates them concurrently.
+Edit Log:
+2026/10/18
+    - Created file
+"""
+
+# STANDARD LIBRARY IMPORTS
+from json import dump
+from os import utime
+from pathlib import Path
+from time import time
+from typing import Any, Dict, List
+
+# THIRD PARTY LIBRARY IMPORTS
+from asyncio import run, sleep
+import pytest
+
+# LOCAL LIBRARY IMPORTS
+from src.routines import state_store
+from src.routines.force_graph_updater import routine as routine_module
+from src.routines.force_graph_updater import vault_config
+from src.routines.force_graph_updater.force_graph import ForceGraph
+from src.routines.force_graph_updater.routine import (
+    get_force_graph_list,
+    get_link_index,
+    routine,
+)
+from src.routines.state_store import StateStore
+
+
+@pytest.fixture(name="vault_json_path")
+def fixture_vault_json_path(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """A vault JSON file with two vaults, read instead of the configured one."""
+    vault_json_path: Path = tmp_path / "obsidian_vaults.json"
+    monkeypatch.setattr(vault_config, "VAULT_JSON_PATH", str(vault_json_path))
+    monkeypatch.setattr(vault_config, "_vault_json_cache", None)
+    monkeypatch.setattr(routine_module, "_force_graph_list_cache", None)
+    monkeypatch.setattr(
+        state_store, "_state_store", StateStore(tmp_path / "state.sqlite3")
+    )
+
+    for name in ("first", "second"):
+        (tmp_path / name).mkdir()
+        (tmp_path / name / "Note.md").write_text(f"[[{name}]]", encoding="UTF-8")
+
+    write_vault_json(
+        vault_json_path,
+        {
+            "data_directory": str(tmp_path / "graphs"),
+            "vaults": [
+                {"save_name": "first", "path": str(tmp_path / "first")},
+                {"save_name": "second", "path": str(tmp_path / "second")},
+            ],
+        },
+    )
+    (tmp_path / "graphs").mkdir()
+
+    return vault_json_path
+
+
+def write_vault_json(vault_json_path: Path, vault_json: Dict[str, Any]) -> None:
+    """Write the vault JSON file with a newer modification time than before."""
+    modified_time: float = (
+        vault_json_path.stat().st_mtime + 1 if vault_json_path.exists() else time()
+    )
+
+    with open(vault_json_path, "w", encoding="UTF-8") as file:
+        dump(vault_json, file)
+
+    utime(vault_json_path, (modified_time, modified_time))
+
+
+def test_force_graphs_are_kept_until_the_file_changes(vault_json_path: Path):
+    force_graphs: List[ForceGraph] = get_force_graph_list()
+
+    assert get_force_graph_list() is force_graphs
+    assert [force_graph.force_graph_json_path for force_graph in force_graphs] == [
+        str(vault_json_path.parent / "graphs" / "first"),
+        str(vault_json_path.parent / "graphs" / "second"),
+    ]
+
+    write_vault_json(
+        vault_json_path,
+        {
+            "data_directory": str(vault_json_path.parent / "graphs"),
+            "vaults": [
+                {"save_name": "first", "path": str(vault_json_path.parent / "first")}
+            ],
+        },
+    )
+
+    assert len(get_force_graph_list()) == 1
+
+
+@pytest.mark.parametrize(
+    "vaults, message",
+    [
+        (
+            [
+                {"save_name": "same", "path": "first"},
+                {"save_name": "same", "path": "b"},
+            ],
+            "Duplicate save path",
+        ),
+        (
+            [{"save_name": "a", "path": "same"}, {"save_name": "b", "path": "same"}],
+            "Duplicate vault path",
+        ),
+    ],
+)
+def test_duplicate_vaults(vault_json_path: Path, vaults, message: str):
+    write_vault_json(vault_json_path, {"data_directory": "graphs", "vaults": vaults})
+
+    with pytest.raises(ValueError, match=message):
+        get_force_graph_list()
+
+
+def test_get_link_index(vault_json_path: Path):
+    run(routine.__wrapped__())
+
+    assert get_link_index("first").broken_links("Note") == ["first"]
+    assert get_link_index("second") is get_force_graph_list()[1].link_index
+
+    with pytest.raises(KeyError):
+        get_link_index("missing")
+
+
+def test_failed_vault_does_not_stop_the_others(
+    vault_json_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    update_force_graph_json = ForceGraph.update_force_graph_json
+
+    async def fail_first_vault(force_graph: ForceGraph) -> None:
+        if force_graph.obsidian_directory_path.endswith("first"):
+            raise OSError("disk full")
+
+        await update_force_graph_json(force_graph)
+
+    monkeypatch.setattr(ForceGraph, "update_force_graph_json", fail_first_vault)
+
+    with pytest.raises(RuntimeError, match="1 of 2 force graphs failed to update"):
+        run(routine.__wrapped__())
+
+    assert (vault_json_path.parent / "graphs" / "second.json").exists()
+    assert not (vault_json_path.parent / "graphs" / "first.json").exists()
+
+
+def test_vault_concurrency(vault_json_path: Path, monkeypatch: pytest.MonkeyPatch):
+    running: List[int] = [0]
+    highest_running: List[int] = [0]
+
+    async def count_running(_: ForceGraph) -> None:
+        running[0] += 1
+        highest_running[0] = max(highest_running[0], running[0])
+        await sleep(0.05)
+        running[0] -= 1
+
+    monkeypatch.setattr(ForceGraph, "update_force_graph_json", count_running)
+    run(routine.__wrapped__())
+
+    assert highest_running == [2]
+
+    write_vault_json(
+        vault_json_path,
+        {**vault_config.get_vault_json(), "vault_concurrency": 1},
+    )
+    highest_running[0] = 0
+    run(routine.__wrapped__())
+
+    assert highest_running == [1]
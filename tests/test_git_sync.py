@@ -0,0 +1,127 @@
+"""
+file_name = test_git_sync.py
+Created On: 2026/10/18
+Lasted Updated: 2026/10/18
+Description: Tests of the asyncio git pull of the vaults.
+Edit Log:
+2026/10/18
+    - Created file
+    - Cover the worktree changes
+"""
+
+# STANDARD LIBRARY IMPORTS
+from pathlib import Path
+from subprocess import run
+from typing import List, Tuple
+
+# THIRD PARTY LIBRARY IMPORTS
+from asyncio import Semaphore, gather
+from asyncio import run as run_async
+import pytest
+
+# LOCAL LIBRARY IMPORTS
+from src.routines.force_graph_updater.git_sync import (
+    GitCommandError,
+    GitPullResult,
+    get_worktree_changes,
+    pull_repository,
+    run_git_command,
+)
+
+
+def git(repository_path: Path, *arguments: str) -> str:
+    return run(
+        ["git", "-C", str(repository_path), *arguments],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout.strip()
+
+
+@pytest.fixture(name="clones")
+def fixture_clones(tmp_path: Path) -> Tuple[Path, Path]:
+    """A clone to pull into and a clone to push from, of the same bare origin."""
+    origin_path: Path = tmp_path / "origin.git"
+    run(["git", "init", "-q", "--bare", str(origin_path)], check=True)
+    writer_path: Path = tmp_path / "writer"
+    run(["git", "clone", "-q", str(origin_path), str(writer_path)], check=True)
+    git(writer_path, "config", "user.email", "test@example.com")
+    git(writer_path, "config", "user.name", "Test")
+    git(writer_path, "commit", "-q", "--allow-empty", "-m", "First")
+    git(writer_path, "push", "-q", "origin", "HEAD")
+    reader_path: Path = tmp_path / "reader"
+    run(["git", "clone", "-q", str(origin_path), str(reader_path)], check=True)
+
+    return reader_path, writer_path
+
+
+def test_pull_without_new_commits(clones):
+    reader_path, _ = clones
+    result: GitPullResult = run_async(pull_repository(str(reader_path)))
+
+    assert result == {
+        "succeeded": True,
+        "head": git(reader_path, "rev-parse", "HEAD"),
+    }
+
+
+def test_pull_new_commit(clones):
+    reader_path, writer_path = clones
+    git(writer_path, "commit", "-q", "--allow-empty", "-m", "Second")
+    git(writer_path, "push", "-q")
+    result: GitPullResult = run_async(pull_repository(str(reader_path)))
+
+    assert result["succeeded"]
+    assert result["head"] == git(writer_path, "rev-parse", "HEAD")
+
+
+def test_pull_outside_a_repository(tmp_path):
+    result: GitPullResult = run_async(pull_repository(str(tmp_path)))
+
+    assert result == {"succeeded": False, "head": None}
+
+
+def test_failed_command_raises(tmp_path):
+    with pytest.raises(GitCommandError, match="rev-parse HEAD returned non-zero"):
+        run_async(run_git_command(str(tmp_path), ["rev-parse", "HEAD"], 10))
+
+
+def test_concurrent_pulls_share_the_semaphore(clones):
+    reader_path, _ = clones
+
+    async def pull_all() -> List[GitPullResult]:
+        semaphore = Semaphore(1)
+
+        return await gather(
+            *(pull_repository(str(reader_path), 10, semaphore) for _ in range(3))
+        )
+
+    assert all(result["succeeded"] for result in run_async(pull_all()))
+
+
+def test_worktree_changes(clones):
+    _, writer_path = clones
+    assert run_async(get_worktree_changes(str(writer_path))) == []
+
+    for name in ("Tracked.md", "Renamed.md", "Deleted.md"):
+        (writer_path / name).write_text(name, encoding="UTF-8")
+
+    (writer_path / ".gitignore").write_text("private/\n", encoding="UTF-8")
+    git(writer_path, "add", ".")
+    git(writer_path, "commit", "-q", "-m", "Notes")
+
+    (writer_path / "Tracked.md").write_text("Edited", encoding="UTF-8")
+    git(writer_path, "mv", "Renamed.md", "New name.md")
+    (writer_path / "Deleted.md").unlink()
+    (writer_path / "folder").mkdir()
+    (writer_path / "folder" / "Untracked.md").write_text("", encoding="UTF-8")
+    (writer_path / "private").mkdir()
+    (writer_path / "private" / "Ignored.md").write_text("", encoding="UTF-8")
+
+    assert sorted(run_async(get_worktree_changes(str(writer_path)))) == [
+        "Deleted.md",
+        "New name.md",
+        "Tracked.md",
+        "folder/",
+        "private/",
+    ]
@@ -0,0 +1,259 @@
+"""
+file_name = test_graph_delta.py
+Created On: 2026/10/18
+Lasted Updated: 2026/10/18
+Description: Tests of the versioned graph deltas, with and without NumPy.
+Edit Log:
+2026/10/18
+    - Created file
+"""
+
+# STANDARD LIBRARY IMPORTS
+from json import load
+from os import listdir
+from os.path import join
+from random import Random
+from typing import Any, Dict, List, Set, Tuple
+
+# THIRD PARTY LIBRARY IMPORTS
+import pytest
+
+# LOCAL LIBRARY IMPORTS
+from src.routines.force_graph_updater import graph_delta
+from src.routines.force_graph_updater.graph_delta import (
+    GraphDelta,
+    GraphDeltaLog,
+    merge_graph_deltas,
+)
+from src.routines.force_graph_updater.graph_writer import write_graph_json
+
+Graph = Tuple[List[str], List[Tuple[str, str]]]
+
+# The nodes by id and the links of a graph as a client keeps them
+ClientGraph = Tuple[Dict[str, Any], Set[Tuple[str, str]]]
+
+
+@pytest.fixture(params=["numpy", "array"])
+def delta_module(request, monkeypatch):
+    """Run every test with NumPy, when it is installed, and with the fallback."""
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(graph_delta, "numpy", None)
+
+    return graph_delta
+
+
+def write_version(delta_log: GraphDeltaLog, snapshot_path: str, graph: Graph) -> int:
+    """Write a version of a graph the way ForceGraph does it."""
+    names, links = graph
+    node_ids: Dict[str, int] = {name: node_id for node_id, name in enumerate(names)}
+    nodes: List[Dict[str, Any]] = [{"id": name, "name": name} for name in names]
+    version: int = delta_log.write_delta(
+        nodes,
+        names,
+        [node_ids[source] for source, _ in links],
+        [node_ids[target] for _, target in links],
+    )
+    write_graph_json(
+        snapshot_path,
+        nodes,
+        ({"source": source, "target": target} for source, target in links),
+        None,
+        version,
+    )
+    delta_log.commit()
+
+    return version
+
+
+def read_manifest(snapshot_path: str) -> Dict[str, Any]:
+    deltas_path: str = snapshot_path + graph_delta.DELTA_DIRECTORY_SUFFIX
+
+    with open(
+        join(deltas_path, graph_delta.DELTA_MANIFEST_NAME), encoding="UTF-8"
+    ) as file:
+        return load(file)
+
+
+def read_delta(snapshot_path: str, version: int) -> Dict[str, Any]:
+    deltas_path: str = snapshot_path + graph_delta.DELTA_DIRECTORY_SUFFIX
+    manifest = read_manifest(snapshot_path)
+    entry = next(entry for entry in manifest["deltas"] if entry["version"] == version)
+
+    with open(join(deltas_path, entry["file"]), encoding="UTF-8") as file:
+        return load(file)
+
+
+def test_graph_without_links(delta_module, tmp_path):
+    snapshot_path: str = str(tmp_path / "graph.json")
+    delta_log = delta_module.GraphDeltaLog(snapshot_path, 10, 2)
+
+    assert write_version(delta_log, snapshot_path, (["A", "B"], [])) == 1
+    assert write_version(delta_log, snapshot_path, (["A", "B", "C"], [])) == 2
+
+    delta = read_delta(snapshot_path, 2)
+    assert [node["id"] for node in delta["nodes"]["upserted"]] == ["C"]
+    assert delta["links"] == {"added": [], "removed": []}
+
+    # A restarted instance loads the snapshot without links
+    restarted_log = delta_module.GraphDeltaLog(snapshot_path, 10, 2)
+    assert write_version(restarted_log, snapshot_path, (["A", "B", "C"], [])) == 3
+
+
+def test_last_link_removed(delta_module, tmp_path):
+    snapshot_path: str = str(tmp_path / "graph.json")
+    delta_log = delta_module.GraphDeltaLog(snapshot_path, 10, 2)
+
+    write_version(delta_log, snapshot_path, (["A", "B"], [("A", "B")]))
+    version: int = write_version(delta_log, snapshot_path, (["A", "B"], []))
+
+    delta = read_delta(snapshot_path, version)
+    assert delta["links"] == {
+        "added": [],
+        "removed": [{"source": "A", "target": "B"}],
+    }
+
+    version = write_version(delta_log, snapshot_path, (["A", "B"], [("B", "A")]))
+    assert read_delta(snapshot_path, version)["links"]["added"] == [
+        {"source": "B", "target": "A"}
+    ]
+
+
+def read_client_graph(snapshot_path: str) -> Tuple[int, ClientGraph]:
+    """The version of the snapshot and its graph."""
+    with open(snapshot_path, encoding="UTF-8") as file:
+        snapshot = load(file)
+
+    return snapshot["version"], (
+        {node["id"]: node for node in snapshot["nodes"]},
+        {(link["source"], link["target"]) for link in snapshot["links"]},
+    )
+
+
+def apply_delta(graph: ClientGraph, delta: GraphDelta) -> ClientGraph:
+    """Patch a graph the way a client does it."""
+    nodes, links = dict(graph[0]), set(graph[1])
+
+    for node in delta["nodes"]["upserted"]:
+        nodes[node["id"]] = node
+
+    for node_id in delta["nodes"]["removed"]:
+        nodes.pop(node_id, None)
+
+    links |= {(link["source"], link["target"]) for link in delta["links"]["added"]}
+    links -= {(link["source"], link["target"]) for link in delta["links"]["removed"]}
+
+    return nodes, links
+
+
+def create_random_graph(random: Random) -> Graph:
+    names: List[str] = random.sample([f"Note {index}" for index in range(12)], 8)
+    links: List[Tuple[str, str]] = [
+        (random.choice(names), random.choice(names))
+        for _ in range(random.randrange(12))
+    ]
+
+    return names, links
+
+
+def test_clients_patch_every_version_in_the_history(delta_module, tmp_path):
+    snapshot_path: str = str(tmp_path / "graph.json")
+    deltas_path: str = snapshot_path + graph_delta.DELTA_DIRECTORY_SUFFIX
+    delta_log = delta_module.GraphDeltaLog(snapshot_path, 8, 3)
+    random = Random(0)
+    client_graphs: Dict[int, ClientGraph] = {}
+
+    for _ in range(40):
+        write_version(delta_log, snapshot_path, create_random_graph(random))
+        version, graph = read_client_graph(snapshot_path)
+        client_graphs[version] = graph
+        manifest = read_manifest(snapshot_path)
+
+        assert manifest["version"] == version
+        # Clients up to the history behind can patch, merged deltas keep a few more
+        assert manifest["oldest_version"] <= max(1, version - 8)
+        assert manifest["oldest_version"] >= version - 8 - 3
+        assert sorted(listdir(deltas_path)) == sorted(
+            [graph_delta.DELTA_MANIFEST_NAME]
+            + [entry["file"] for entry in manifest["deltas"]]
+        )
+
+        for client_version in range(manifest["oldest_version"], version):
+            client_graph: ClientGraph = client_graphs[client_version]
+
+            for entry in manifest["deltas"]:
+                if entry["version"] > client_version:
+                    client_graph = apply_delta(
+                        client_graph, read_delta(snapshot_path, entry["version"])
+                    )
+
+            assert client_graph == graph
+
+    # The oldest single version deltas were merged
+    assert any(
+        entry["version"] - entry["from_version"] == 3
+        for entry in read_manifest(snapshot_path)["deltas"]
+    )
+
+
+def test_snapshot_without_commit_drops_the_history(delta_module, tmp_path):
+    snapshot_path: str = str(tmp_path / "graph.json")
+    delta_log = delta_module.GraphDeltaLog(snapshot_path, 10, 2)
+    write_version(delta_log, snapshot_path, (["A"], []))
+    write_version(delta_log, snapshot_path, (["A", "B"], []))
+
+    # The run failed after writing the snapshot of version 3, before its commit
+    delta_log.write_delta([{"id": "A", "name": "A"}], ["A"], [], [])
+    write_graph_json(snapshot_path, [{"id": "A", "name": "A"}], [], None, 3)
+
+    restarted_log = delta_module.GraphDeltaLog(snapshot_path, 10, 2)
+
+    assert write_version(restarted_log, snapshot_path, (["A", "C"], [])) == 4
+    assert read_manifest(snapshot_path) == {
+        "version": 4,
+        "oldest_version": 4,
+        "deltas": [],
+    }
+    assert listdir(snapshot_path + graph_delta.DELTA_DIRECTORY_SUFFIX) == [
+        graph_delta.DELTA_MANIFEST_NAME
+    ]
+
+
+def test_merge_graph_deltas():
+    def create_delta(version: int, upserted, removed, added, removed_links):
+        return {
+            "from_version": version - 1,
+            "version": version,
+            "nodes": {"upserted": upserted, "removed": removed},
+            "links": {
+                "added": [{"source": s, "target": t} for s, t in added],
+                "removed": [{"source": s, "target": t} for s, t in removed_links],
+            },
+        }
+
+    merged_delta = merge_graph_deltas(
+        [
+            create_delta(2, [{"id": "A", "val": 1}], ["B"], [("A", "B")], [("A", "C")]),
+            create_delta(3, [{"id": "A", "val": 2}, {"id": "B"}], [], [], [("A", "B")]),
+            create_delta(4, [], ["C"], [("A", "C")], []),
+        ]
+    )
+
+    assert merged_delta == {
+        "from_version": 1,
+        "version": 4,
+        "nodes": {"upserted": [{"id": "A", "val": 2}, {"id": "B"}], "removed": ["C"]},
+        "links": {
+            "added": [{"source": "A", "target": "C"}],
+            "removed": [{"source": "A", "target": "B"}],
+        },
+    }
+
+
+def test_invalid_history(tmp_path):
+    with pytest.raises(ValueError, match="must be positive"):
+        GraphDeltaLog(str(tmp_path / "graph.json"), 0)
+
+    with pytest.raises(RuntimeError, match="no delta to commit"):
+        GraphDeltaLog(str(tmp_path / "graph.json")).commit()
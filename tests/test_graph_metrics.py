@@ -0,0 +1,163 @@
+"""
+file_name = test_graph_metrics.py
+Created On: 2026/10/18
+Lasted Updated: 2026/10/18
+Description: Tests of the adjacency of the force graph and its node metrics, with NumPy
+    and with the array fallback.
+Edit Log:
+2026/10/18
+    - Created file
+"""
+
+# STANDARD LIBRARY IMPORTS
+from json import load
+from pathlib import Path
+from random import Random
+from typing import List, Tuple
+
+# THIRD PARTY LIBRARY IMPORTS
+from asyncio import run
+import pytest
+
+# LOCAL LIBRARY IMPORTS
+from src.routines.force_graph_updater import graph_metrics
+from src.routines.force_graph_updater.force_graph import ForceGraph
+from src.routines.force_graph_updater.graph_metrics import (
+    CsrAdjacency,
+    GraphAdjacency,
+)
+from src.routines.state_store import StateStore
+
+
+@pytest.fixture(name="backend", params=["numpy", "array"], autouse=True)
+def fixture_backend(request: pytest.FixtureRequest, monkeypatch: pytest.MonkeyPatch):
+    """Run every test with NumPy, if it is installed, and with the array fallback."""
+    if request.param == "numpy" and graph_metrics.numpy is None:
+        pytest.skip("numpy is not installed")
+
+    if request.param == "array":
+        monkeypatch.setattr(graph_metrics, "numpy", None)
+
+    return request.param
+
+
+def reference_pagerank(
+    node_count: int, links: List[Tuple[int, int]], damping: float = 0.85
+) -> List[float]:
+    """A plain PageRank iteration, the rank of dangling nodes goes to every node."""
+    out_degree: List[int] = [0] * node_count
+
+    for source, _ in links:
+        out_degree[source] += 1
+
+    ranks: List[float] = [1 / node_count] * node_count
+
+    for _ in range(1000):
+        dangling_rank: float = sum(
+            rank for node, rank in enumerate(ranks) if not out_degree[node]
+        )
+        new_ranks: List[float] = [
+            (1 - damping) / node_count + damping * dangling_rank / node_count
+        ] * node_count
+
+        for source, target in links:
+            new_ranks[target] += damping * ranks[source] / out_degree[source]
+
+        ranks = new_ranks
+
+    return ranks
+
+
+def test_csr_adjacency():
+    adjacency = CsrAdjacency(4, [2, 0, 2, 0, 1], [3, 1, 0, 2, 0])
+
+    assert [list(adjacency.neighbours_of(node)) for node in range(4)] == [
+        [1, 2],
+        [0],
+        [3, 0],
+        [],
+    ]
+    assert list(adjacency.degrees()) == [2, 1, 2, 0]
+    assert list(adjacency.sum_neighbours([1.0, 10.0, 100.0, 1000.0])) == [
+        110.0,
+        1.0,
+        1001.0,
+        0.0,
+    ]
+
+
+def test_pagerank_matches_the_reference():
+    random = Random(0)
+    links: List[Tuple[int, int]] = [
+        (random.randrange(50), random.randrange(50)) for _ in range(200)
+    ]
+    ranks = GraphAdjacency(
+        50, [source for source, _ in links], [target for _, target in links]
+    ).pagerank(tolerance=1e-12)
+
+    assert sum(ranks) == pytest.approx(1)
+    assert ranks == pytest.approx(reference_pagerank(50, links), abs=1e-9)
+
+
+def test_node_metrics():
+    # 0 and 1 link to the hub 2, which links back to 0, 3 has no links at all
+    adjacency = GraphAdjacency(4, [0, 1, 2], [2, 2, 0])
+    node_metrics = adjacency.compute_node_metrics()
+
+    assert node_metrics["in_degree"] == [1, 0, 2, 0]
+    assert node_metrics["out_degree"] == [1, 1, 1, 0]
+    assert sum(node_metrics["pagerank"]) == pytest.approx(4, abs=0.01)
+    assert node_metrics["pagerank"][2] > node_metrics["pagerank"][0]
+    assert node_metrics["pagerank"][0] > node_metrics["pagerank"][1]
+    assert node_metrics["pagerank"][1] == node_metrics["pagerank"][3]
+    assert node_metrics["val"] == [
+        max(round(rank * 10), 1) for rank in node_metrics["pagerank"]
+    ]
+
+
+def test_ranks_are_relative_to_an_average_node():
+    # Every node of a cycle is average, however long the cycle is
+    for node_count in (3, 30):
+        node_metrics = GraphAdjacency(
+            node_count,
+            list(range(node_count)),
+            [(node + 1) % node_count for node in range(node_count)],
+        ).compute_node_metrics()
+
+        assert node_metrics["pagerank"] == [1.0] * node_count
+        assert node_metrics["val"] == [10] * node_count
+
+
+def test_empty_graph():
+    adjacency = GraphAdjacency(0, [], [])
+
+    assert adjacency.pagerank() == []
+    assert adjacency.compute_node_metrics() == {
+        "val": [],
+        "in_degree": [],
+        "out_degree": [],
+        "pagerank": [],
+    }
+
+
+def test_force_graph_nodes_carry_the_metrics(tmp_path: Path):
+    (tmp_path / "vault").mkdir()
+
+    for name, content in {"A": "[[Hub]]", "B": "[[Hub]]", "Hub": "[[A]]"}.items():
+        (tmp_path / "vault" / f"{name}.md").write_text(content, encoding="UTF-8")
+
+    force_graph = ForceGraph(
+        str(tmp_path / "graph"),
+        str(tmp_path / "vault"),
+        state_store=StateStore(tmp_path / "state.sqlite3"),
+        delta_history=0,
+    )
+    run(force_graph.update_force_graph_json())
+
+    with open(tmp_path / "graph.json", encoding="UTF-8") as file:
+        nodes = {node["id"]: node for node in load(file)["nodes"]}
+
+    assert (nodes["Hub"]["in_degree"], nodes["Hub"]["out_degree"]) == (2, 1)
+    assert (nodes["B"]["in_degree"], nodes["B"]["out_degree"]) == (0, 1)
+    assert nodes["Hub"]["val"] > nodes["A"]["val"] > nodes["B"]["val"] >= 1
+    assert nodes["Hub"]["pagerank"] > nodes["A"]["pagerank"]
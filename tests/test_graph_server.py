@@ -0,0 +1,183 @@
+"""
+file_name = test_graph_server.py
+Created On: 2026/10/18
+Lasted Updated: 2026/10/18
+Description: Tests of the responses of the graph server.
+Edit Log:
+2026/10/18
+    - Created file
+"""
+
+# STANDARD LIBRARY IMPORTS
+from gzip import decompress
+from os import replace, utime
+from pathlib import Path
+from typing import Awaitable, Callable, Dict
+
+# THIRD PARTY LIBRARY IMPORTS
+from asyncio import open_connection, run
+import pytest
+
+# LOCAL LIBRARY IMPORTS
+from src.routines.graph_server import graph_server as graph_server_module
+from src.routines.graph_server.graph_server import GraphResponse, GraphServer
+
+GRAPH: bytes = b'{"nodes": [{"id": "A"}], "links": []}'
+
+
+def serve(tmp_path: Path, test: Callable[[GraphServer], Awaitable[None]]) -> None:
+    """Run a test against a started graph server of the vault_1 outputs."""
+
+    async def run_test() -> None:
+        graph_server = GraphServer(str(tmp_path), {"vault_1"}, 0)
+        await graph_server.start()
+
+        try:
+            await test(graph_server)
+        finally:
+            await graph_server.close()
+
+    run(run_test())
+
+
+async def get(
+    graph_server: GraphServer, target: str = "/vault_1.json", **headers: str
+) -> GraphResponse:
+    request_headers: Dict[str, str] = {
+        name.replace("_", "-"): value for name, value in headers.items()
+    }
+    response: GraphResponse = await graph_server.get_response(
+        "GET", target, request_headers
+    )
+
+    if response.file is not None:
+        response.file.seek(response.offset)
+        response.body = response.file.read(response.length)
+        response.file.close()
+
+    return response
+
+
+def get_header(response: GraphResponse, name: str) -> str | None:
+    return dict(response.headers).get(name)
+
+
+@pytest.fixture(name="graph_path")
+def fixture_graph_path(tmp_path: Path) -> Path:
+    graph_path: Path = tmp_path / "vault_1.json"
+    graph_path.write_bytes(GRAPH)
+
+    return graph_path
+
+
+def test_unknown_paths(graph_path, tmp_path):
+    async def test(graph_server: GraphServer) -> None:
+        assert (await get(graph_server, "/vault_2.json")).status == "404 Not Found"
+        assert (await get(graph_server, "/vault_1.txt")).status == "404 Not Found"
+        response = await graph_server.get_response("POST", "/vault_1.json", {})
+        assert response.status == "405 Method Not Allowed"
+
+    serve(tmp_path, test)
+
+
+def test_etag_and_gzip(graph_path, tmp_path):
+    async def test(graph_server: GraphServer) -> None:
+        response: GraphResponse = await get(graph_server)
+        assert response.status == "200 OK"
+        assert response.body == GRAPH
+        etag = get_header(response, "ETag")
+
+        gzip_response = await get(graph_server, accept_encoding="gzip, deflate")
+        assert get_header(gzip_response, "Content-Encoding") == "gzip"
+        assert decompress(gzip_response.body) == GRAPH
+        gzip_etag = get_header(gzip_response, "ETag")
+        assert gzip_etag != etag
+
+        not_modified = await get(graph_server, if_none_match=etag)
+        assert not_modified.status == "304 Not Modified"
+        assert not_modified.body == b""
+        not_modified = await get(
+            graph_server, if_none_match=gzip_etag, accept_encoding="gzip"
+        )
+        assert not_modified.status == "304 Not Modified"
+        assert get_header(not_modified, "ETag") == gzip_etag
+
+        identity = await get(graph_server, accept_encoding="gzip;q=0")
+        assert identity.body == GRAPH
+
+    serve(tmp_path, test)
+
+
+@pytest.mark.parametrize("cache_limit", [1024, 1], ids=["cached", "sendfile"])
+def test_ranges(graph_path, tmp_path, monkeypatch, cache_limit):
+    monkeypatch.setattr(graph_server_module, "MEMORY_CACHE_FILE_LIMIT", cache_limit)
+
+    async def test(graph_server: GraphServer) -> None:
+        etag = get_header(await get(graph_server), "ETag")
+
+        response: GraphResponse = await get(graph_server, range="bytes=2-6")
+        assert response.status == "206 Partial Content"
+        assert response.body == GRAPH[2:7]
+        assert get_header(response, "Content-Range") == f"bytes 2-6/{len(GRAPH)}"
+
+        response = await get(graph_server, range="bytes=-4")
+        assert response.body == GRAPH[-4:]
+
+        response = await get(graph_server, range="bytes=1000-")
+        assert response.status == "416 Range Not Satisfiable"
+
+        # A range of an older version gets the whole current file
+        response = await get(graph_server, range="bytes=2-6", if_range='"old"')
+        assert response.status == "200 OK"
+        assert response.body == GRAPH
+
+        response = await get(graph_server, range="bytes=2-6", if_range=etag)
+        assert response.status == "206 Partial Content"
+
+    serve(tmp_path, test)
+
+
+def test_file_replaced_by_another_process(graph_path, tmp_path):
+    new_graph: bytes = b'{"nodes": [{"id": "A"}, {"id": "B"}], "links": []}'
+
+    async def test(graph_server: GraphServer) -> None:
+        etag = get_header(await get(graph_server), "ETag")
+
+        # Written without the output listeners of this process
+        (tmp_path / "vault_1.json.tmp").write_bytes(new_graph)
+        replace(tmp_path / "vault_1.json.tmp", graph_path)
+        response: GraphResponse = await get(graph_server, if_none_match=etag)
+        assert response.status == "200 OK"
+        assert response.body == new_graph
+
+        # Written in place with the same size
+        etag = get_header(response, "ETag")
+        graph_path.write_bytes(new_graph.replace(b"B", b"C"))
+        utime(graph_path, ns=(0, 1))
+        response = await get(graph_server, if_none_match=etag)
+        assert response.body == new_graph.replace(b"B", b"C")
+
+        graph_path.unlink()
+        assert (await get(graph_server)).status == "404 Not Found"
+
+    serve(tmp_path, test)
+
+
+def test_http_keep_alive(graph_path, tmp_path):
+    async def test(graph_server: GraphServer) -> None:
+        assert graph_server._server is not None
+        port: int = graph_server._server.sockets[0].getsockname()[1]
+        reader, writer = await open_connection("127.0.0.1", port)
+
+        for method in ("HEAD", "GET"):
+            writer.write(
+                f"{method} /vault_1.json HTTP/1.1\r\nHost: localhost\r\n\r\n".encode()
+            )
+            head: bytes = await reader.readuntil(b"\r\n\r\n")
+            assert head.startswith(b"HTTP/1.1 200 OK\r\n")
+            assert f"Content-Length: {len(GRAPH)}".encode() in head
+
+        assert await reader.readexactly(len(GRAPH)) == GRAPH
+        writer.close()
+
+    serve(tmp_path, test)
@@ -0,0 +1,132 @@
+"""
+file_name = test_graph_writer.py
+Created On: 2026/10/18
+Lasted Updated: 2026/10/18
+Description: Tests of the streamed force graph JSON and the atomic replace of outputs.
+Edit Log:
+2026/10/18
+    - Created file
+"""
+
+# STANDARD LIBRARY IMPORTS
+from gzip import decompress
+from json import loads
+from os import listdir, stat
+from pathlib import Path
+from typing import Iterator, List
+
+# THIRD PARTY LIBRARY IMPORTS
+import pytest
+
+# LOCAL LIBRARY IMPORTS
+from src.routines.force_graph_updater import graph_writer
+from src.routines.force_graph_updater.graph_writer import (
+    add_output_listener,
+    open_atomic,
+    remove_output_listener,
+    write_graph_json,
+)
+
+NODES = [{"id": "A", "name": "A", "val": 2}, {"id": "B", "name": "B", "val": 1}]
+LINKS = [{"source": "A", "target": "B"}]
+
+
+def test_write_graph_json(tmp_path: Path):
+    output_path = tmp_path / "graph.json"
+    write_graph_json(str(output_path), iter(NODES), iter(LINKS))
+
+    assert loads(output_path.read_text(encoding="UTF-8")) == {
+        "nodes": NODES,
+        "links": LINKS,
+    }
+    assert stat(output_path).st_mode & 0o777 == 0o644
+    assert listdir(tmp_path) == ["graph.json"]
+
+
+def test_version_and_empty_graph(tmp_path: Path):
+    output_path = tmp_path / "graph.json"
+    write_graph_json(str(output_path), [], [], version=7)
+
+    assert output_path.read_text(encoding="UTF-8").startswith('{"version": 7,')
+    assert loads(output_path.read_text(encoding="UTF-8")) == {
+        "version": 7,
+        "nodes": [],
+        "links": [],
+    }
+
+
+def test_batches(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(graph_writer, "WRITE_BATCH_SIZE", 2)
+    nodes = [{"id": str(index), "name": str(index), "val": 1} for index in range(5)]
+    output_path = tmp_path / "graph.json"
+    write_graph_json(str(output_path), nodes, [])
+
+    assert loads(output_path.read_text(encoding="UTF-8"))["nodes"] == nodes
+
+
+def test_gzip_sibling(tmp_path: Path):
+    output_path = tmp_path / "graph.json"
+    write_graph_json(str(output_path), NODES, LINKS, compression="gzip")
+
+    assert (tmp_path / "graph.json.gz").exists()
+    assert decompress((tmp_path / "graph.json.gz").read_bytes()) == (
+        output_path.read_bytes()
+    )
+
+
+def test_unsupported_compression(tmp_path: Path):
+    with pytest.raises(ValueError, match="Unsupported compression"):
+        write_graph_json(str(tmp_path / "graph.json"), NODES, LINKS, "brotli")
+
+    if graph_writer.zstandard is None:
+        with pytest.raises(ValueError, match="zstandard"):
+            write_graph_json(str(tmp_path / "graph.json"), NODES, LINKS, "zstd")
+
+
+def test_failed_write_keeps_the_previous_output(tmp_path: Path):
+    output_path = tmp_path / "graph.json"
+    write_graph_json(str(output_path), NODES, LINKS)
+    previous_output = output_path.read_bytes()
+
+    def failing_nodes() -> Iterator[dict]:
+        yield NODES[0]
+        raise RuntimeError("Failed to read the vault")
+
+    with pytest.raises(RuntimeError):
+        write_graph_json(str(output_path), failing_nodes(), LINKS, "gzip")
+
+    assert output_path.read_bytes() == previous_output
+    assert sorted(listdir(tmp_path)) == ["graph.json"]
+
+
+def test_replace_keeps_the_mode(tmp_path: Path):
+    output_path = tmp_path / "graph.json"
+    output_path.write_bytes(b"old")
+    output_path.chmod(0o600)
+
+    with open_atomic(str(output_path)) as output_file:
+        output_file.write(b"new")
+
+    assert output_path.read_bytes() == b"new"
+    assert stat(output_path).st_mode & 0o777 == 0o600
+
+
+def test_output_listeners(tmp_path: Path):
+    changed_paths: List[str] = []
+    add_output_listener(changed_paths.append)
+
+    try:
+        write_graph_json(str(tmp_path / "graph.json"), NODES, LINKS, "gzip")
+
+        with pytest.raises(RuntimeError):
+            with open_atomic(str(tmp_path / "failed.json")):
+                raise RuntimeError("Failed to write")
+    finally:
+        remove_output_listener(changed_paths.append)
+
+    write_graph_json(str(tmp_path / "graph.json"), NODES, LINKS)
+
+    assert sorted(changed_paths) == [
+        str(tmp_path / "graph.json"),
+        str(tmp_path / "graph.json.gz"),
+    ]
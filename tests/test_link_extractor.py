@@ -0,0 +1,133 @@
+"""
+file_name = test_link_extractor.py
+Created On: 2026/10/18
+Lasted Updated: 2026/10/18
+Description: Tests of the serial and process pool extraction of the notes.
+Edit Log:
+2026/10/18
+    - Created file
+    - Cover the link and alias patterns
+    - Cover lines with an unclosed link
+"""
+
+# STANDARD LIBRARY IMPORTS
+from pathlib import Path
+from time import monotonic, sleep
+from typing import Dict, List
+
+# THIRD PARTY LIBRARY IMPORTS
+from asyncio import CancelledError, create_task, run
+from asyncio import sleep as async_sleep
+import pytest
+
+# LOCAL LIBRARY IMPORTS
+from src.routines.force_graph_updater import link_extractor
+from src.routines.force_graph_updater.file_index import ExtractedNoteData
+from src.routines.force_graph_updater.link_extractor import (
+    extract_aliases,
+    extract_links,
+    extract_notes,
+)
+
+
+def slow_extract_notes_batch(paths: List[str]) -> Dict[str, ExtractedNoteData]:
+    """A shard that takes a second, imported by the worker processes by name."""
+    sleep(1)
+
+    return {path: {"links": set(), "aliases": set()} for path in paths}
+
+
+def write_notes(tmp_path: Path) -> List[str]:
+    paths: List[str] = []
+
+    for index in range(20):
+        path: Path = tmp_path / f"{index}.md"
+        path.write_text(
+            f"---\naliases: [Alias {index}]\n---\n[[{index + 1}#Heading|Text]] [[B]]",
+            encoding="UTF-8",
+        )
+        paths.append(str(path))
+
+    return paths
+
+
+def test_process_pool_matches_serial_extraction(tmp_path):
+    paths: List[str] = write_notes(tmp_path)
+    serial = run(extract_notes(paths, workers=1))
+    parallel = run(extract_notes(paths, workers=2, parallel_threshold=1))
+
+    assert parallel == serial
+    assert serial[paths[0]] == {"links": {"1", "B"}, "aliases": {"Alias 0"}}
+
+
+def test_cancel_does_not_block_the_event_loop(tmp_path, monkeypatch):
+    monkeypatch.setattr(link_extractor, "extract_notes_batch", slow_extract_notes_batch)
+    paths: List[str] = write_notes(tmp_path)
+
+    async def cancel_extraction() -> float:
+        task = create_task(extract_notes(paths, workers=2, parallel_threshold=1))
+        await async_sleep(0.3)
+        task.cancel()
+        longest_tick: float = 0
+        last_tick: float = monotonic()
+
+        while not task.done():
+            await async_sleep(0.01)
+            longest_tick = max(longest_tick, monotonic() - last_tick)
+            last_tick = monotonic()
+
+        try:
+            await task
+        except CancelledError:
+            pass
+
+        return longest_tick
+
+    # The shards that already started run to their end off the event loop
+    assert run(cancel_extraction()) < 0.5
+
+
+@pytest.mark.parametrize(
+    "content, links",
+    [
+        ("[[Note]]", {"Note"}),
+        ("[[Ghaz's Notes#Table Of Contents | Contents]]", {"Ghaz's Notes"}),
+        ("[[ Spaced ]] and [[Other|Alias]]", {"Spaced", "Other"}),
+        ("| [[Table\\|Alias]] |", {"Table"}),
+        ("[[C\\#Sharp]]", {"C\\#Sharp"}),
+        ("[[Nested]Bracket]]", {"Nested]Bracket"}),
+        ("![[image.png]] [[folder/Note]]", {"image.png", "folder/Note"}),
+        ("[[#Heading only]] [[]]", set()),
+        ("[[Not\nclosed]] [[Closed]]", {"Closed"}),
+        ("[[First]] [[First]]", {"First"}),
+    ],
+)
+def test_extract_links(content, links):
+    assert extract_links(content) == links
+
+
+@pytest.mark.parametrize(
+    "content, aliases",
+    [
+        ("---\naliases: [One, 'Two']\n---\n", {"One", "Two"}),
+        ('---\nalias: "Single"\n---\n', {"Single"}),
+        ("---\ntags: x\naliases:\n  - One\n  - Two\ntitle: y\n---\n", {"One", "Two"}),
+        ("---\naliases: []\n---\n", set()),
+        ("No frontmatter\naliases: [One]\n", set()),
+        ("---\naliases: [Unclosed]\n", set()),
+    ],
+)
+def test_extract_aliases(content, aliases):
+    assert extract_aliases(content) == aliases
+
+
+@pytest.mark.parametrize(
+    "content",
+    ["[[" + "x" * 32000, "[[x " * 1000, "[[a\\#" * 2000, "[[a]" * 2000],
+)
+def test_unclosed_links_do_not_backtrack(content):
+    start: float = monotonic()
+
+    assert extract_links(content + "\n[[Closed]]") == {"Closed"}
+    # Backtracking took from seconds to minutes on these lines
+    assert monotonic() - start < 0.5
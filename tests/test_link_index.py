@@ -0,0 +1,173 @@
+"""
+file_name = test_link_index.py
+Created On: 2026/10/18
+Lasted Updated: 2026/10/18
+Description: Tests of the in-memory link index of a vault and the diffs that patch it.
+Edit Log:
+2026/10/18
+    - Created file
+"""
+
+# STANDARD LIBRARY IMPORTS
+from random import Random
+from typing import Dict, List, Tuple
+
+# THIRD PARTY LIBRARY IMPORTS
+import pytest
+
+# LOCAL LIBRARY IMPORTS
+from src.routines.force_graph_updater.link_index import LinkIndex
+
+# A resolved graph as the arguments of load and diff
+ResolvedGraph = Tuple[List[str], int, List[int], List[int], Dict[int, List[str]]]
+
+
+def create_graph(
+    notes: List[str], files: List[str], links: List[Tuple[str, str]], **broken_links
+) -> ResolvedGraph:
+    node_names: List[str] = notes + files
+    node_ids: Dict[str, int] = {
+        name: node_id for node_id, name in enumerate(node_names)
+    }
+
+    return (
+        node_names,
+        len(notes),
+        [node_ids[source] for source, _ in links],
+        [node_ids[target] for _, target in links],
+        {node_ids[name]: targets for name, targets in broken_links.items()},
+    )
+
+
+def create_random_graph(random: Random) -> ResolvedGraph:
+    names: List[str] = random.sample([f"Note {index}" for index in range(30)], 20)
+    notes: List[str] = names[:15]
+    links: List[Tuple[str, str]] = [
+        (random.choice(notes), random.choice(names))
+        for _ in range(random.randrange(40))
+    ]
+    broken_links: Dict[str, List[str]] = {
+        note: [f"Missing {random.randrange(5)}"]
+        for note in random.sample(notes, random.randrange(4))
+    }
+
+    return create_graph(notes, names[15:], links, **broken_links)
+
+
+def get_state(link_index: LinkIndex, node_names: List[str]):
+    """Everything the queries of the index answer."""
+    return (
+        len(link_index),
+        {
+            name: (
+                link_index.links(name),
+                link_index.backlinks(name),
+                link_index.broken_links(name),
+            )
+            for name in node_names
+        },
+        link_index.all_broken_links(),
+        link_index.orphans(),
+    )
+
+
+@pytest.fixture(name="link_index")
+def fixture_link_index() -> LinkIndex:
+    link_index = LinkIndex()
+    link_index.load(
+        *create_graph(
+            ["A", "B", "C", "Orphan"],
+            ["image.png"],
+            [("A", "B"), ("A", "B"), ("A", "image.png"), ("B", "A"), ("C", "A")],
+            C=["Missing", "Gone"],
+        )
+    )
+
+    return link_index
+
+
+def test_queries(link_index: LinkIndex):
+    assert link_index.is_loaded
+    assert len(link_index) == 5
+    assert "image.png" in link_index and "Missing" not in link_index
+    assert link_index.links("A") == ["B", "image.png"]
+    assert link_index.backlinks("A") == ["B", "C"]
+    assert link_index.backlinks("image.png") == ["A"]
+    assert link_index.broken_links("C") == ["Gone", "Missing"]
+    assert link_index.all_broken_links() == {"C": ["Gone", "Missing"]}
+    assert link_index.orphans() == ["Orphan"]
+
+    with pytest.raises(KeyError):
+        link_index.links("Missing")
+
+
+def test_diff_only_holds_the_changes(link_index: LinkIndex):
+    diff = link_index.diff(
+        *create_graph(
+            ["A", "B", "C", "Orphan", "D"],
+            ["image.png"],
+            [("A", "image.png"), ("A", "B"), ("B", "A"), ("C", "D"), ("D", "C")],
+            C=["Missing", "Gone"],
+        )
+    )
+
+    assert diff == {
+        "updated_nodes": {"D": True},
+        "removed_nodes": set(),
+        "changed_links": {"C": ["D"], "D": ["C"]},
+        "changed_broken_links": {},
+    }
+
+
+def test_apply(link_index: LinkIndex):
+    link_index.apply(
+        link_index.diff(
+            *create_graph(
+                ["A", "Orphan", "image.png"],
+                [],
+                [("A", "image.png"), ("Orphan", "A")],
+                A=["B"],
+            )
+        )
+    )
+
+    assert len(link_index) == 3
+    assert "B" not in link_index and "C" not in link_index
+    assert link_index.links("A") == ["image.png"]
+    assert link_index.backlinks("A") == ["Orphan"]
+    assert link_index.all_broken_links() == {"A": ["B"]}
+    assert link_index.orphans() == []
+
+    with pytest.raises(KeyError):
+        link_index.backlinks("B")
+
+
+def test_applied_diffs_match_a_load():
+    random = Random(0)
+    patched_link_index = LinkIndex()
+    patched_link_index.load(*create_random_graph(random))
+
+    for _ in range(200):
+        graph: ResolvedGraph = create_random_graph(random)
+        patched_link_index.apply(patched_link_index.diff(*graph))
+        loaded_link_index = LinkIndex()
+        loaded_link_index.load(*graph)
+
+        assert get_state(patched_link_index, graph[0]) == get_state(
+            loaded_link_index, graph[0]
+        )
+        # Applying the diff of the same graph again changes nothing
+        assert patched_link_index.diff(*graph) == {
+            "updated_nodes": {},
+            "removed_nodes": set(),
+            "changed_links": {},
+            "changed_broken_links": {},
+        }
+
+
+def test_unload(link_index: LinkIndex):
+    link_index.unload()
+
+    assert not link_index.is_loaded
+    assert len(link_index) == 0
+    assert link_index.orphans() == []
@@ -0,0 +1,71 @@
+"""
+file_name = test_note_resolver.py
+Created On: 2026/10/18
+Lasted Updated: 2026/10/18
+Description: Tests of the resolution of obsidian links to the notes of a vault.
+Edit Log:
+2026/10/18
+    - Created file
+"""
+
+# STANDARD LIBRARY IMPORTS
+from os.path import join
+
+# THIRD PARTY LIBRARY IMPORTS
+import pytest
+
+# LOCAL LIBRARY IMPORTS
+from src.routines.force_graph_updater.note_resolver import NoteResolver
+
+VAULT_PATH: str = "/vault"
+
+
+@pytest.fixture(name="note_resolver")
+def fixture_note_resolver() -> NoteResolver:
+    note_resolver = NoteResolver(VAULT_PATH)
+    note_resolver.add_note(join(VAULT_PATH, "Home.md"), "Home")
+    note_resolver.add_note(
+        join(VAULT_PATH, "projects", "deep", "Plan.md"),
+        "Plan",
+        ["The Plan", "road map"],
+    )
+    note_resolver.add_note(join(VAULT_PATH, "Plan.md"), "Plan")
+    note_resolver.add_note(join(VAULT_PATH, "notes", "home.md"), "home")
+
+    return note_resolver
+
+
+@pytest.mark.parametrize(
+    "link, note_name",
+    [
+        ("Home", "Home"),
+        # An exact name wins over a case-insensitive match
+        ("home", "home"),
+        ("HOME", "Home"),
+        ("Plan", "Plan"),
+        ("deep/Plan", "Plan"),
+        ("projects/deep/plan.md", "Plan"),
+        ("./projects/deep/Plan", "Plan"),
+        ("projects\\deep\\Plan", "Plan"),
+        ("the plan", "Plan"),
+        ("Road Map", "Plan"),
+        (" Home ", "Home"),
+    ],
+)
+def test_resolve(note_resolver, link, note_name):
+    assert note_resolver.resolve(link) == note_name
+    assert link in note_resolver
+
+
+@pytest.mark.parametrize("link", ["Missing", "deep/Home", "projects/Plan", ""])
+def test_unresolved_links(note_resolver, link):
+    assert note_resolver.resolve(link) is None
+    assert link not in note_resolver
+
+
+def test_first_note_keeps_an_alias():
+    note_resolver = NoteResolver(VAULT_PATH)
+    note_resolver.add_note(join(VAULT_PATH, "A.md"), "A", ["Shared"])
+    note_resolver.add_note(join(VAULT_PATH, "B.md"), "B", ["shared"])
+
+    assert note_resolver.resolve("SHARED") == "A"
@@ -0,0 +1,118 @@
+"""
+file_name = test_restart_engine.py
+Created On: 2026/10/18
+Lasted Updated: 2026/10/18
+Description: Tests of the restart engine and the restart routine against a stub of the
+    service manager command.
+Edit Log:
+2026/10/18
+    - Created file
+"""
+
+# STANDARD LIBRARY IMPORTS
+from pathlib import Path
+from typing import List
+
+# THIRD PARTY LIBRARY IMPORTS
+from asyncio import run
+import pytest
+
+# LOCAL LIBRARY IMPORTS
+from src.routines.restart_services import routine as restart_routine
+from src.routines.restart_services.restart_engine import (
+    RestartEngine,
+    RestartResult,
+    parse_service_waves,
+)
+
+# Restarting a service starting with "bad" fails, a service starting with "inactive"
+# never becomes active. Every call is appended to the calls file.
+STUB_COMMAND: str = """#!/bin/sh
+echo "$@" >> "$(dirname "$0")/calls.txt"
+case "$1" in
+restart) case "$2" in bad*) echo "no such unit"; exit 5;; esac;;
+is-active) case "$3" in inactive*) exit 3;; esac;;
+esac
+exit 0
+"""
+
+
+@pytest.fixture(name="command")
+def fixture_command(tmp_path: Path) -> List[str]:
+    command_path: Path = tmp_path / "systemctl"
+    command_path.write_text(STUB_COMMAND, encoding="UTF-8")
+    command_path.chmod(0o755)
+
+    return [str(command_path)]
+
+
+def read_calls(tmp_path: Path) -> List[str]:
+    calls_path: Path = tmp_path / "calls.txt"
+
+    return (
+        calls_path.read_text(encoding="UTF-8").splitlines()
+        if calls_path.exists()
+        else []
+    )
+
+
+def test_parse_service_waves():
+    assert parse_service_waves("# database first\ndb\n---\n\napi\nweb\n---\n") == [
+        ["db"],
+        ["api", "web"],
+    ]
+
+
+def test_restart_waves(command, tmp_path):
+    results: List[RestartResult] = run(
+        RestartEngine(command).restart_waves([["db"], ["api", "bad_web"]])
+    )
+
+    assert [(result["service"], result["succeeded"]) for result in results] == [
+        ("db", True),
+        ("api", True),
+        ("bad_web", False),
+    ]
+    assert "no such unit" in str(results[2]["error"])
+    assert read_calls(tmp_path)[:2] == ["restart db", "is-active --quiet db"]
+
+
+def test_stop_on_failure(command, tmp_path):
+    results: List[RestartResult] = run(
+        RestartEngine(command, stop_on_failure=True).restart_waves(
+            [["bad_db"], ["api"]]
+        )
+    )
+
+    assert [result["service"] for result in results] == ["bad_db"]
+    assert "restart api" not in read_calls(tmp_path)
+
+
+def test_inactive_service(command, tmp_path):
+    engine = RestartEngine(command, health_check_timeout=0.3, health_check_interval=0.1)
+    result: RestartResult = run(engine.restart_service("inactive_api"))
+
+    assert not result["succeeded"]
+    assert "is not active 0.3 seconds after the restart" in str(result["error"])
+    assert read_calls(tmp_path).count("is-active --quiet inactive_api") >= 2
+
+
+def test_no_health_check_after_the_deadline(command, tmp_path):
+    engine = RestartEngine(command, health_check_timeout=0)
+    result: RestartResult = run(engine.restart_service("api"))
+
+    # The check is not started with a timeout of 0 and killed right away
+    assert "is not active 0 seconds after the restart" in str(result["error"])
+    assert read_calls(tmp_path) == ["restart api"]
+
+
+def test_routine_fails_after_trying_every_service(command, tmp_path, monkeypatch):
+    monkeypatch.setattr(restart_routine, "RESTART_COMMAND", command)
+    monkeypatch.setattr(
+        restart_routine, "get_service_waves", lambda: [["bad_db", "api"], ["web"]]
+    )
+
+    with pytest.raises(RuntimeError, match="1 of 3 services failed to restart: bad_db"):
+        run(restart_routine.routine.__wrapped__())
+
+    assert "restart web" in read_calls(tmp_path)
@@ -0,0 +1,134 @@
+"""
+file_name = test_routine_logging.py
+Created On: 2026/10/18
+Lasted Updated: 2026/10/18
+Description: Tests of the log files of the routines and the queued logging thread.
+Edit Log:
+2026/10/18
+    - Created file
+"""
+
+# STANDARD LIBRARY IMPORTS
+from json import loads
+from logging import INFO, Logger, getLogger
+from pathlib import Path
+from threading import get_ident
+
+# THIRD PARTY LIBRARY IMPORTS
+import pytest
+
+# LOCAL LIBRARY IMPORTS
+from src.routines import routine_logging
+from src.routines.routine_logging import QueuedRoutineLogging, create_log_file_handler
+
+
+@pytest.fixture(name="logs_directory", autouse=True)
+def fixture_logs_directory(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    logs_directory: Path = tmp_path / "logs"
+    monkeypatch.setattr(routine_logging, "LOGS_DIRECTORY_PATH", logs_directory)
+
+    return logs_directory
+
+
+def get_routine_logger(name: str, handler) -> Logger:
+    logger: Logger = getLogger(name)
+    logger.setLevel(INFO)
+    logger.propagate = False
+    logger.handlers = [handler]
+
+    return logger
+
+
+def test_log_file_handler(logs_directory: Path):
+    handler = create_log_file_handler("direct_logging_test_routine")
+    logger = get_routine_logger("direct_logging_test_routine", handler)
+    logger.info("Updated %d graphs", 2)
+    handler.close()
+
+    log_text = (logs_directory / "direct_logging_test_routine.log").read_text(
+        encoding="UTF-8"
+    )
+    assert " - direct_logging_test_routine - INFO - Updated 2 graphs" in log_text
+
+
+def test_queued_logging_writes_every_routine_file(logs_directory: Path):
+    queued_logging = QueuedRoutineLogging()
+    queued_logging.start()
+    first_logger = get_routine_logger(
+        "first_queued_test_routine", queued_logging.handler
+    )
+    second_logger = get_routine_logger(
+        "second_queued_test_routine", queued_logging.handler
+    )
+
+    for index in range(100):
+        first_logger.info("Run %d", index)
+
+    second_logger.warning("Slow run")
+    # Every queued record is written before stop returns
+    queued_logging.stop()
+
+    first_lines = (
+        (logs_directory / "first_queued_test_routine.log")
+        .read_text(encoding="UTF-8")
+        .splitlines()
+    )
+    assert len(first_lines) == 100
+    assert first_lines[-1].endswith("INFO - Run 99")
+    assert "WARNING - Slow run" in (
+        logs_directory / "second_queued_test_routine.log"
+    ).read_text(encoding="UTF-8")
+
+
+def test_records_are_frozen_when_logged(logs_directory: Path):
+    queued_logging = QueuedRoutineLogging()
+    get_routine_logger("frozen_queued_test_routine", queued_logging.handler)
+    arguments = ["before"]
+
+    # Records are only written once the thread starts, after the argument changed
+    getLogger("frozen_queued_test_routine").info("Argument %s", arguments)
+    arguments[0] = "after"
+    queued_logging.start()
+    queued_logging.stop()
+
+    assert "Argument ['before']" in (
+        logs_directory / "frozen_queued_test_routine.log"
+    ).read_text(encoding="UTF-8")
+
+
+def test_json_lines(logs_directory: Path):
+    queued_logging = QueuedRoutineLogging(json_lines=True)
+    queued_logging.start()
+    logger = get_routine_logger("json_queued_test_routine", queued_logging.handler)
+
+    try:
+        raise ValueError("Broken note")
+    except ValueError:
+        logger.exception("Failed to read %s", "A.md")
+
+    queued_logging.stop()
+
+    log_line = loads(
+        (logs_directory / "json_queued_test_routine.jsonl").read_text(encoding="UTF-8")
+    )
+    assert log_line["name"] == "json_queued_test_routine"
+    assert log_line["level"] == "ERROR"
+    assert log_line["message"] == "Failed to read A.md"
+    assert "ValueError: Broken note" in log_line["exception"]
+
+
+def test_files_are_written_by_the_listener_thread(monkeypatch: pytest.MonkeyPatch):
+    writing_threads = set()
+    create_handler = routine_logging.create_log_file_handler
+
+    def record_thread(*arguments, **keyword_arguments):
+        writing_threads.add(get_ident())
+        return create_handler(*arguments, **keyword_arguments)
+
+    monkeypatch.setattr(routine_logging, "create_log_file_handler", record_thread)
+    queued_logging = QueuedRoutineLogging()
+    queued_logging.start()
+    get_routine_logger("thread_queued_test_routine", queued_logging.handler).info("Run")
+    queued_logging.stop()
+
+    assert writing_threads and get_ident() not in writing_threads
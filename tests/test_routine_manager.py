@@ -0,0 +1,463 @@
+"""
+file_name = test_routine_manager.py
+Created On: 2026/10/18
+Lasted Updated: 2026/10/18
+Description: Tests of the dispatcher of the routine manager.
+Edit Log:
+2026/10/18
+    - Created file
+    - Overlapping profiled async routines both run
+    - The run history is written off the event loop
+"""
+
+# STANDARD LIBRARY IMPORTS
+from os import environ, getpid
+from pathlib import Path
+from threading import current_thread
+from time import monotonic, sleep as blocking_sleep
+from typing import Callable, List, Tuple, cast
+
+# THIRD PARTY LIBRARY IMPORTS
+from asyncio import run, sleep, to_thread
+import pytest
+
+# LOCAL LIBRARY IMPORTS
+from src.routine_manager import RoutineManager, ScheduledRoutine
+from src.routines import routine_logging, routine_profiling, state_store
+from src.routines.routine_decorator import OverlapPolicy, RoutineDecorator, Seconds
+from src.routines.routine_scheduler import RoutineScheduler
+from src.routines.state_store import StateStore
+
+
+@pytest.fixture(name="state_store", autouse=True)
+def fixture_state_store(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> StateStore:
+    """Record the runs of the routines in a temporary state store."""
+    temporary_state_store = StateStore(tmp_path / "state.sqlite3")
+    monkeypatch.setattr(state_store, "_state_store", temporary_state_store)
+
+    return temporary_state_store
+
+
+@pytest.fixture(name="logs_directory", autouse=True)
+def fixture_logs_directory(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Write the log files of the routines into a temporary directory."""
+    logs_directory: Path = tmp_path / "logs"
+    monkeypatch.setattr(routine_logging, "LOGS_DIRECTORY_PATH", logs_directory)
+
+    return logs_directory
+
+
+def interval(seconds: float) -> Seconds:
+    return cast(Seconds, seconds)
+
+
+@RoutineDecorator(
+    task_name="process_test_routine",
+    routine_metadata={"interval": interval(3600), "execution": "process"},
+)
+def process_routine() -> None:
+    """Write the process id to the file of the PROCESS_ROUTINE_OUTPUT variable."""
+    Path(environ["PROCESS_ROUTINE_OUTPUT"]).write_text(str(getpid()), encoding="UTF-8")
+
+
+def test_unschedulable_routine_does_not_stop_the_dispatcher(monkeypatch):
+    scheduler: RoutineScheduler = RoutineScheduler.from_cron("* * * * *")
+    broken_runs: List[int] = []
+    healthy_runs: List[int] = []
+
+    def fail_to_schedule() -> int:
+        raise ValueError("The cron expression never fires")
+
+    monkeypatch.setattr(scheduler, "seconds_till_next_run", fail_to_schedule)
+
+    @RoutineDecorator(
+        task_name="unschedulable_test_routine",
+        routine_metadata={"interval": scheduler},
+    )
+    async def broken_routine() -> None:
+        broken_runs.append(1)
+
+    @RoutineDecorator(
+        task_name="healthy_test_routine",
+        routine_metadata={"interval": cast(Seconds, 0.01)},
+    )
+    async def healthy_routine() -> None:
+        healthy_runs.append(1)
+
+    async def run_routines() -> None:
+        async with RoutineManager() as routine_manager:
+            await routine_manager.register_tasks([broken_routine, healthy_routine])
+            await sleep(0.2)
+
+            # The routine that could not be scheduled is not scheduled again
+            assert [
+                upcoming_run["task_name"]
+                for upcoming_run in routine_manager.upcoming_runs()
+            ] == ["healthy_test_routine"]
+
+    run(run_routines())
+
+    assert len(broken_runs) == 1
+    assert len(healthy_runs) > 5
+
+
+def test_fixed_rate_deadlines():
+    @RoutineDecorator(
+        task_name="fixed_rate_test_routine", routine_metadata={"interval": interval(5)}
+    )
+    async def fixed_rate_routine() -> None:
+        pass
+
+    routine_manager = RoutineManager()
+    scheduled_routine = ScheduledRoutine("fixed_rate_test_routine")
+    scheduled_routine.routine_decorator = fixed_rate_routine.routine_decorator
+    scheduled_routine.deadline = 10
+
+    # The runtime of the run does not push the next deadline back
+    assert routine_manager._next_deadline(scheduled_routine, 11) == 15
+    # Missed runs are skipped instead of running back to back
+    assert routine_manager._next_deadline(scheduled_routine, 27) == 30
+
+
+def test_interval_routines_run_at_a_fixed_rate():
+    run_times: List[float] = []
+
+    @RoutineDecorator(
+        task_name="fixed_rate_run_test_routine",
+        routine_metadata={"interval": interval(0.05)},
+    )
+    async def slow_routine() -> None:
+        run_times.append(monotonic())
+        await sleep(0.03)
+
+    async def run_routines() -> None:
+        async with RoutineManager() as routine_manager:
+            await routine_manager.register_tasks([slow_routine])
+            await sleep(0.52)
+
+    run(run_routines())
+
+    # Scheduling from the end of every run would only fit 6 runs
+    assert len(run_times) >= 9
+    assert run_times[-1] - run_times[0] == pytest.approx(
+        (len(run_times) - 1) * 0.05, abs=0.04
+    )
+
+
+def test_trigger_and_upcoming_runs(state_store: StateStore):
+    @RoutineDecorator(
+        task_name="hourly_test_routine", routine_metadata={"interval": interval(3600)}
+    )
+    async def hourly_routine() -> None:
+        pass
+
+    @RoutineDecorator(
+        task_name="half_hourly_test_routine",
+        routine_metadata={"interval": interval(1800)},
+    )
+    async def half_hourly_routine() -> None:
+        pass
+
+    async def run_routines() -> None:
+        async with RoutineManager() as routine_manager:
+            await routine_manager.register_tasks([hourly_routine, half_hourly_routine])
+            await sleep(0.1)
+
+            upcoming_runs = routine_manager.upcoming_runs()
+            assert [upcoming_run["task_name"] for upcoming_run in upcoming_runs] == [
+                "half_hourly_test_routine",
+                "hourly_test_routine",
+            ]
+            assert upcoming_runs[1]["run_at"] - upcoming_runs[0]["run_at"] == (
+                pytest.approx(1800, abs=1)
+            )
+            assert len(routine_manager.upcoming_runs(limit=1)) == 1
+
+            routine_manager.trigger("hourly_test_routine")
+            await sleep(0.1)
+
+            with pytest.raises(KeyError):
+                routine_manager.trigger("unknown_test_routine")
+
+    run(run_routines())
+
+    assert len(state_store.get_run_history("hourly_test_routine")) == 2
+    assert len(state_store.get_run_history("half_hourly_test_routine")) == 1
+
+
+def test_register_routines_twice():
+    async def register() -> None:
+        async with RoutineManager() as routine_manager:
+            routine_entry = {
+                "name": "registered_twice_test_routine",
+                "entry_point": "tests.missing:routine",
+            }
+            await routine_manager.register_routines([routine_entry])
+
+            with pytest.raises(ValueError, match="already exists"):
+                await routine_manager.register_routines([routine_entry])
+
+    run(register())
+
+
+def test_thread_routines_run_off_the_event_loop():
+    thread_names: List[str] = []
+    ticks: List[float] = []
+
+    @RoutineDecorator(
+        task_name="thread_test_routine",
+        routine_metadata={"interval": interval(3600), "execution": "thread"},
+    )
+    def thread_routine() -> None:
+        thread_names.append(current_thread().name)
+        blocking_sleep(0.2)
+
+    @RoutineDecorator(
+        task_name="to_thread_test_routine",
+        routine_metadata={"interval": interval(3600)},
+    )
+    async def async_routine() -> None:
+        thread_names.append(await to_thread(lambda: current_thread().name))
+
+    async def tick() -> None:
+        while True:
+            ticks.append(monotonic())
+            await sleep(0.01)
+
+    async def run_routines() -> None:
+        async with RoutineManager(max_thread_workers=2) as routine_manager:
+            await routine_manager.register_tasks([thread_routine, async_routine, tick])
+            await sleep(0.3)
+
+    run(run_routines())
+
+    # The thread executor of the manager is also the default executor of to_thread
+    assert len(thread_names) == 2
+    assert all(name.startswith("routine") for name in thread_names)
+    # The event loop kept running while the thread routine blocked
+    assert len(ticks) > 15
+
+
+def test_run_history_is_written_off_the_event_loop(
+    state_store: StateStore, monkeypatch: pytest.MonkeyPatch
+):
+    thread_names: List[str] = []
+    record_run = state_store.record_run
+
+    def record_run_thread(*args, **kwargs) -> None:
+        thread_names.append(current_thread().name)
+        record_run(*args, **kwargs)
+
+    monkeypatch.setattr(state_store, "record_run", record_run_thread)
+
+    @RoutineDecorator(
+        task_name="history_test_routine",
+        routine_metadata={"interval": interval(3600)},
+    )
+    async def succeeding_routine() -> None:
+        pass
+
+    @RoutineDecorator(
+        task_name="failing_history_test_routine",
+        routine_metadata={"interval": interval(3600)},
+    )
+    async def failing_routine() -> None:
+        raise ValueError("Failed")
+
+    async def run_routines() -> None:
+        async with RoutineManager() as routine_manager:
+            await routine_manager.register_tasks([succeeding_routine, failing_routine])
+            await sleep(0.2)
+
+    run(run_routines())
+
+    assert len(thread_names) == 2
+    assert current_thread().name not in thread_names
+    assert state_store.get_run_history("history_test_routine")[0]["succeeded"]
+    assert not state_store.get_run_history("failing_history_test_routine")[0][
+        "succeeded"
+    ]
+
+
+def test_process_routines_run_in_another_process(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, state_store: StateStore
+):
+    output_path: Path = tmp_path / "pid.txt"
+    monkeypatch.setenv("PROCESS_ROUTINE_OUTPUT", str(output_path))
+
+    async def run_routines() -> None:
+        async with RoutineManager(max_process_workers=1) as routine_manager:
+            await routine_manager.register_tasks([process_routine])
+
+            for _ in range(100):
+                if state_store.get_run_history("process_test_routine"):
+                    break
+
+                await sleep(0.05)
+
+    run(run_routines())
+
+    assert state_store.get_run_history("process_test_routine")[0]["succeeded"]
+    assert int(output_path.read_text(encoding="UTF-8")) != getpid()
+
+
+def test_execution_mode_has_to_match_the_function():
+    with pytest.raises(TypeError, match="must be an async function"):
+
+        @RoutineDecorator(
+            task_name="sync_async_test_routine",
+            routine_metadata={"interval": interval(1)},
+        )
+        def sync_routine() -> None:
+            pass
+
+    with pytest.raises(TypeError, match="must be an async function"):
+
+        @RoutineDecorator(
+            task_name="async_thread_test_routine",
+            routine_metadata={"interval": interval(1), "execution": "thread"},
+        )
+        async def async_routine() -> None:
+            pass
+
+
+def max_concurrency(runs: List[Tuple[float, float]]) -> int:
+    """The most runs that were going at the same time."""
+    # A run that ends when another starts is not counted as overlapping it
+    events = sorted([(start, 1) for start, _ in runs] + [(end, -1) for _, end in runs])
+    concurrency: int = 0
+    highest_concurrency: int = 0
+
+    for _, change in events:
+        concurrency += change
+        highest_concurrency = max(highest_concurrency, concurrency)
+
+    return highest_concurrency
+
+
+def test_timeout(state_store: StateStore, caplog: pytest.LogCaptureFixture):
+    @RoutineDecorator(
+        task_name="timeout_test_routine",
+        routine_metadata={"interval": interval(3600), "timeout": interval(0.05)},
+    )
+    async def slow_routine() -> None:
+        await sleep(10)
+
+    async def run_routines() -> None:
+        async with RoutineManager() as routine_manager:
+            await routine_manager.register_tasks([slow_routine])
+            await sleep(0.2)
+
+    run(run_routines())
+
+    assert not state_store.get_run_history("timeout_test_routine")[0]["succeeded"]
+    assert "Routine timed out after 0.05 seconds" in caplog.text
+
+
+def test_overlapping_profiled_routines(
+    state_store: StateStore,
+    caplog: pytest.LogCaptureFixture,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    monkeypatch.setattr(routine_profiling, "PROFILES_DIRECTORY_PATH", tmp_path)
+
+    def profiled_routine(task_name: str) -> Callable:
+        @RoutineDecorator(
+            task_name=task_name,
+            routine_metadata={"interval": interval(3600), "profile": "cprofile"},
+        )
+        async def routine() -> None:
+            await sleep(0.1)
+
+        return routine
+
+    routines = [
+        profiled_routine("first_profiled_test_routine"),
+        profiled_routine("second_profiled_test_routine"),
+    ]
+
+    async def run_routines() -> None:
+        async with RoutineManager() as routine_manager:
+            await routine_manager.register_tasks(routines)
+            await sleep(0.3)
+
+    run(run_routines())
+
+    for task_name in ("first_profiled_test_routine", "second_profiled_test_routine"):
+        assert state_store.get_run_history(task_name)[0]["succeeded"]
+
+    assert len(list(tmp_path.glob("*.prof"))) == 1
+    assert "another cProfile profile is running" in caplog.text
+
+
+@pytest.mark.parametrize("overlap_policy", ["skip", "queue", "allow"])
+def test_overlap_policies(overlap_policy: str, caplog: pytest.LogCaptureFixture):
+    runs: List[Tuple[float, float]] = []
+
+    @RoutineDecorator(
+        task_name=f"{overlap_policy}_overlap_test_routine",
+        routine_metadata={
+            "interval": interval(0.05),
+            "overlap": cast(OverlapPolicy, overlap_policy),
+        },
+    )
+    async def slow_routine() -> None:
+        start: float = monotonic()
+        await sleep(0.12)
+        runs.append((start, monotonic()))
+
+    async def run_routines() -> None:
+        async with RoutineManager() as routine_manager:
+            await routine_manager.register_tasks([slow_routine])
+            await sleep(0.45)
+
+    run(run_routines())
+    runs.sort()
+
+    if overlap_policy == "allow":
+        assert max_concurrency(runs) >= 2
+        return
+
+    assert max_concurrency(runs) == 1
+    assert len(runs) >= 2
+
+    if overlap_policy == "skip":
+        assert "Previous run is still going, skipping this run" in caplog.text
+    else:
+        assert "Previous run is still going, queueing this run" in caplog.text
+
+        # A queued run starts as soon as the previous run finished
+        for (_, previous_end), (next_start, _) in zip(runs, runs[1:]):
+            assert next_start - previous_end < 0.03
+
+
+@pytest.mark.parametrize("limit", [1, 2])
+def test_resource_groups(limit: int):
+    runs: List[Tuple[float, float]] = []
+
+    def create_routine(task_name: str):
+        @RoutineDecorator(
+            task_name=task_name,
+            routine_metadata={"interval": interval(3600), "resource_group": "disk"},
+        )
+        async def disk_routine() -> None:
+            start: float = monotonic()
+            await sleep(0.1)
+            runs.append((start, monotonic()))
+
+        return disk_routine
+
+    routines = [
+        create_routine(f"disk_test_routine_{limit}_{index}") for index in range(3)
+    ]
+
+    async def run_routines() -> None:
+        async with RoutineManager(resource_group_limits={"disk": limit}) as manager:
+            await manager.register_tasks(routines)
+            await sleep(0.4)
+
+    run(run_routines())
+
+    assert len(runs) == 3
+    assert max_concurrency(runs) == limit
@@ -0,0 +1,137 @@
+"""
+file_name = test_routine_metrics.py
+Created On: 2026/10/18
+Lasted Updated: 2026/10/18
+Description: Tests of the run metrics of the routines and their Prometheus endpoint.
+Edit Log:
+2026/10/18
+    - Created file
+"""
+
+# STANDARD LIBRARY IMPORTS
+from typing import List
+
+# THIRD PARTY LIBRARY IMPORTS
+from asyncio import open_connection, run
+import pytest
+
+# LOCAL LIBRARY IMPORTS
+from src.routines.routine_metrics import (
+    DURATION_BUCKETS,
+    PROMETHEUS_CONTENT_TYPE,
+    MetricsRegistry,
+    MetricsServer,
+)
+
+
+@pytest.fixture(name="metrics_registry")
+def fixture_metrics_registry() -> MetricsRegistry:
+    metrics_registry = MetricsRegistry()
+    metrics_registry.record_run("routine", 0.05, True, 100)
+    metrics_registry.record_run("routine", 7, True, 200)
+    metrics_registry.record_run("routine", 5000, False, 300)
+    metrics_registry.record_schedule_lag("routine", 0.25)
+
+    return metrics_registry
+
+
+def test_snapshot(metrics_registry: MetricsRegistry):
+    expected_buckets: List[int] = [0] * (len(DURATION_BUCKETS) + 1)
+    expected_buckets[0] = 1
+    expected_buckets[DURATION_BUCKETS.index(10)] = 1
+    expected_buckets[-1] = 1
+
+    assert metrics_registry.snapshot() == {
+        "routine": {
+            "runs_succeeded": 2,
+            "runs_failed": 1,
+            "duration_count": 3,
+            "duration_sum": 5007.05,
+            "duration_buckets": expected_buckets,
+            "last_run_timestamp": 300,
+            "last_success_timestamp": 200,
+            "schedule_lag": 0.25,
+        }
+    }
+
+
+def test_bucket_bounds_are_inclusive():
+    metrics_registry = MetricsRegistry()
+    metrics_registry.record_run("routine", 1, True, 0)
+
+    duration_buckets = metrics_registry.snapshot()["routine"]["duration_buckets"]
+
+    assert duration_buckets[DURATION_BUCKETS.index(1)] == 1
+
+
+def test_render_prometheus(metrics_registry: MetricsRegistry):
+    lines: List[str] = metrics_registry.render_prometheus().splitlines()
+
+    assert "# TYPE routine_runs_total counter" in lines
+    assert 'routine_runs_total{routine="routine",result="success"} 2' in lines
+    assert 'routine_runs_total{routine="routine",result="failure"} 1' in lines
+    assert "# TYPE routine_run_duration_seconds histogram" in lines
+    # The histogram buckets are cumulative
+    assert 'routine_run_duration_seconds_bucket{routine="routine",le="0.1"} 1' in lines
+    assert 'routine_run_duration_seconds_bucket{routine="routine",le="10"} 2' in lines
+    assert 'routine_run_duration_seconds_bucket{routine="routine",le="+Inf"} 3' in lines
+    assert 'routine_run_duration_seconds_count{routine="routine"} 3' in lines
+    assert 'routine_last_success_timestamp_seconds{routine="routine"} 200' in lines
+    assert 'routine_schedule_lag_seconds{routine="routine"} 0.25' in lines
+
+
+def test_labels_are_escaped():
+    metrics_registry = MetricsRegistry()
+    metrics_registry.record_run('back\\slash "quoted"\nroutine', 1, True, 0)
+
+    assert (
+        'routine_runs_total{routine="back\\\\slash \\"quoted\\"\\nroutine",'
+        'result="success"} 1'
+    ) in metrics_registry.render_prometheus().splitlines()
+
+
+def test_gauges_without_values_are_left_out():
+    metrics_registry = MetricsRegistry()
+    metrics_registry.record_run("routine", 1, False, 0)
+
+    assert "routine_last_success_timestamp_seconds{" not in (
+        metrics_registry.render_prometheus()
+    )
+
+
+def test_metrics_server(metrics_registry: MetricsRegistry):
+    async def request(port: int, request_line: str) -> bytes:
+        reader, writer = await open_connection("127.0.0.1", port)
+        writer.write(f"{request_line}\r\nHost: localhost\r\n\r\n".encode("latin-1"))
+        response: bytes = await reader.read()
+        writer.close()
+
+        return response
+
+    async def run_server() -> None:
+        metrics_server = MetricsServer(metrics_registry, 0)
+        await metrics_server.start()
+        assert metrics_server._server is not None
+        port: int = metrics_server._server.sockets[0].getsockname()[1]
+
+        try:
+            response = await request(port, "GET /metrics?name=routine HTTP/1.1")
+            head, body = response.split(b"\r\n\r\n", 1)
+            assert head.startswith(b"HTTP/1.1 200 OK")
+            assert f"Content-Type: {PROMETHEUS_CONTENT_TYPE}".encode() in head
+            assert body == metrics_registry.render_prometheus().encode("utf-8")
+
+            head, body = (await request(port, "HEAD /metrics HTTP/1.1")).split(
+                b"\r\n\r\n", 1
+            )
+            assert head.startswith(b"HTTP/1.1 200 OK") and body == b""
+
+            response = await request(port, "GET /other HTTP/1.1")
+            assert response.startswith(b"HTTP/1.1 404 Not Found")
+
+            response = await request(port, "POST /metrics HTTP/1.1")
+            assert response.startswith(b"HTTP/1.1 405 Method Not Allowed")
+        finally:
+            await metrics_server.close()
+
+    run(run_server())
@@ -0,0 +1,154 @@
+"""
+file_name = test_routine_profiling.py
+Created On: 2026/10/18
+Lasted Updated: 2026/10/18
+Description: Tests of the phase timer and of overlapping routine profiles.
+Edit Log:
+2026/10/18
+    - Created file
+    - Overlapping cProfile profiles are skipped
+"""
+
+# STANDARD LIBRARY IMPORTS
+from pathlib import Path
+from threading import Barrier, Thread
+import tracemalloc
+from typing import List
+
+# THIRD PARTY LIBRARY IMPORTS
+
+# LOCAL LIBRARY IMPORTS
+from src.routines.routine_profiling import PhaseTimer, profile_run, summarize_phases
+
+
+def test_phases_add_up():
+    phase_timer = PhaseTimer()
+
+    for name in ("scan", "write", "scan"):
+        with phase_timer.phase(name):
+            pass
+
+    assert list(phase_timer.durations) == ["scan", "write"]
+    assert phase_timer.summary().endswith(
+        f"total {sum(phase_timer.durations.values()):.3f}s"
+    )
+    assert summarize_phases({"scan": 1.5, "write": 0.25}) == (
+        "scan 1.500s, write 0.250s, total 1.750s"
+    )
+
+
+def read_dump(dump_path: Path) -> str:
+    return dump_path.read_text(encoding="UTF-8")
+
+
+def test_overlapping_tracemalloc_profiles(tmp_path):
+    first_path: Path = tmp_path / "first.txt"
+    second_path: Path = tmp_path / "second.txt"
+
+    first_profile = profile_run("tracemalloc", first_path)
+    second_profile = profile_run("tracemalloc", second_path)
+    first_profile.__enter__()
+    second_profile.__enter__()
+    allocations: List[bytes] = [bytes(1024) for _ in range(100)]
+
+    # The first profile ends first, the second one is still tracing
+    first_profile.__exit__(None, None, None)
+    assert tracemalloc.is_tracing()
+    second_profile.__exit__(None, None, None)
+    assert not tracemalloc.is_tracing()
+
+    assert read_dump(first_path).startswith("Traced memory: ")
+    assert read_dump(second_path).startswith("Traced memory: ")
+    assert "test_routine_profiling.py" in read_dump(second_path)
+    del allocations
+
+
+def test_profiles_on_threads(tmp_path):
+    barrier = Barrier(4)
+    errors: List[BaseException] = []
+
+    def profile(index: int) -> None:
+        try:
+            with profile_run("tracemalloc", tmp_path / f"{index}.txt"):
+                barrier.wait()
+                _ = [bytes(256) for _ in range(100)]
+                barrier.wait()
+        except BaseException as e:  # pylint: disable=broad-exception-caught
+            errors.append(e)
+
+    threads: List[Thread] = [Thread(target=profile, args=(i,)) for i in range(4)]
+
+    for thread in threads:
+        thread.start()
+
+    for thread in threads:
+        thread.join()
+
+    assert not errors
+    assert not tracemalloc.is_tracing()
+    assert len(list(tmp_path.glob("*.txt"))) == 4
+
+
+def test_tracing_started_elsewhere_keeps_going(tmp_path):
+    tracemalloc.start()
+
+    try:
+        with profile_run("tracemalloc", tmp_path / "profile.txt"):
+            pass
+
+        assert tracemalloc.is_tracing()
+    finally:
+        tracemalloc.stop()
+
+
+def test_dump_when_the_block_raises(tmp_path):
+    try:
+        with profile_run("cprofile", tmp_path / "profile.prof"):
+            raise ValueError
+    except ValueError:
+        pass
+
+    assert (tmp_path / "profile.prof").stat().st_size > 0
+
+
+def test_overlapping_cprofile_profiles_are_skipped(tmp_path):
+    with profile_run("cprofile", tmp_path / "first.prof") as is_first_profiled:
+        with profile_run("cprofile", tmp_path / "second.prof") as is_second_profiled:
+            pass
+
+    assert is_first_profiled
+    assert not is_second_profiled
+    assert (tmp_path / "first.prof").exists()
+    assert not (tmp_path / "second.prof").exists()
+
+    # The next profile runs once the first one ended
+    with profile_run("cprofile", tmp_path / "third.prof") as is_third_profiled:
+        pass
+
+    assert is_third_profiled
+
+
+def test_cprofile_profiles_on_threads(tmp_path):
+    barrier = Barrier(4)
+    errors: List[BaseException] = []
+    profiled: List[bool] = []
+
+    def profile(index: int) -> None:
+        try:
+            with profile_run("cprofile", tmp_path / f"{index}.prof") as is_profiled:
+                profiled.append(is_profiled)
+                barrier.wait()
+        except BaseException as e:  # pylint: disable=broad-exception-caught
+            errors.append(e)
+
+    threads: List[Thread] = [Thread(target=profile, args=(i,)) for i in range(4)]
+
+    for thread in threads:
+        thread.start()
+
+    for thread in threads:
+        thread.join()
+
+    assert not errors
+    assert sorted(profiled) == [False, False, False, True]
+    assert len(list(tmp_path.glob("*.prof"))) == 1
@@ -0,0 +1,122 @@
+"""
+file_name = test_routine_registry.py
+Created On: 2026/10/18
+Lasted Updated: 2026/10/18
+Description: Tests of the selection and deferred import of the declared routines.
+Edit Log:
+2026/10/18
+    - Created file
+"""
+
+# STANDARD LIBRARY IMPORTS
+from subprocess import run
+import sys
+from typing import List
+
+# THIRD PARTY LIBRARY IMPORTS
+import pytest
+
+# LOCAL LIBRARY IMPORTS
+from src.routines.routine_registry import RoutineEntry, load_routine, select_routines
+
+GRAPH_SERVER_ENTRY: RoutineEntry = {
+    "name": "graph_server_routine",
+    "entry_point": "src.routines.graph_server.routine:routine",
+}
+
+ROUTINE_ENTRIES: List[RoutineEntry] = [
+    {"name": "first", "entry_point": "first:routine"},
+    {"name": "second", "entry_point": "second:routine", "enabled": False},
+    {"name": "third", "entry_point": "third:routine", "enabled": True},
+]
+
+
+def get_names(routine_entries: List[RoutineEntry]) -> List[str]:
+    return [routine_entry["name"] for routine_entry in routine_entries]
+
+
+def test_select_enabled_routines():
+    assert get_names(select_routines(ROUTINE_ENTRIES)) == ["first", "third"]
+
+
+def test_select_only_named_routines():
+    selected: List[RoutineEntry] = select_routines(ROUTINE_ENTRIES, ["third", "second"])
+
+    # The declared order is kept, disabled routines included
+    assert get_names(selected) == ["second", "third"]
+
+
+def test_select_unknown_routine():
+    with pytest.raises(ValueError, match="Unknown routines fourth"):
+        select_routines(ROUTINE_ENTRIES, ["first", "fourth"])
+
+
+def test_select_duplicate_names():
+    with pytest.raises(ValueError, match="first already exists"):
+        select_routines(ROUTINE_ENTRIES + [ROUTINE_ENTRIES[0]])
+
+
+@pytest.mark.parametrize(
+    "entry_point", ["src.routines.graph_server.routine", ":routine", "module:"]
+)
+def test_load_malformed_entry_point(entry_point):
+    with pytest.raises(ValueError, match="module:attribute"):
+        load_routine({"name": "graph_server_routine", "entry_point": entry_point})
+
+
+def test_load_undecorated_function():
+    with pytest.raises(TypeError, match="not decorated"):
+        load_routine(
+            {
+                "name": "graph_server_routine",
+                "entry_point": "src.routines.graph_server.graph_server:GraphServer",
+            }
+        )
+
+
+def test_load_routine_with_other_name():
+    with pytest.raises(ValueError, match="is the routine graph_server_routine"):
+        load_routine({**GRAPH_SERVER_ENTRY, "name": "other_routine"})
+
+
+def test_load_routine():
+    routine = load_routine(GRAPH_SERVER_ENTRY)
+
+    assert routine.routine_decorator.task_name == "graph_server_routine"
+
+
+def test_selection_imports_no_routine():
+    result = run(
+        [
+            sys.executable,
+            "-c",
+            "import sys\n"
+            "from src.routines.routine_list import routine_list\n"
+            "from src.routines.routine_registry import select_routines\n"
+            "select_routines(routine_list)\n"
+            "print(any(name.endswith('.routine') for name in sys.modules))",
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    assert result.stdout.strip() == "False"
+
+
+def test_graph_server_does_not_import_the_force_graph():
+    result = run(
+        [
+            sys.executable,
+            "-c",
+            "import sys\n"
+            "import src.routines.graph_server.routine\n"
+            "print(sorted({'numpy', 'src.routines.force_graph_updater.force_graph',"
+            " 'src.routines.force_graph_updater.routine'} & set(sys.modules)))",
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    assert result.stdout.strip() == "[]"
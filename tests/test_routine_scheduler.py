@@ -0,0 +1,286 @@
+"""
+file_name = test_routine_scheduler.py
+Created On: 2026/10/18
+Lasted Updated: 2026/10/18
+Description: Property tests of the cron schedules against stepping through every
+    minute, across DST transitions, and tests of the weekday schedule.
+Edit Log:
+2026/10/18
+    - Created file
+    - Stepped wildcard day fields and ranges without an end
+"""
+
+# STANDARD LIBRARY IMPORTS
+from datetime import datetime, timedelta, timezone
+from random import Random
+from typing import Callable, List, Set
+from zoneinfo import ZoneInfo
+
+# THIRD PARTY LIBRARY IMPORTS
+import pytest
+
+# LOCAL LIBRARY IMPORTS
+from src.routines.routine_scheduler import (
+    MONTH_NAMES,
+    WEEKDAY_NAMES,
+    RoutineScheduler,
+    WeekdayMapper,
+)
+
+TIMEZONES: List[str] = [
+    "UTC",
+    "America/New_York",
+    "Europe/London",
+    # Moves its clock by 30 minutes
+    "Australia/Lord_Howe",
+]
+
+# The brute force search gives up after this many minutes
+SEARCH_MINUTES: int = 8 * 24 * 60
+
+
+def parse_field(field: str, lowest: int, highest: int, names: List[str]) -> Set[int]:
+    """The values of a cron field, parsed without the bitsets of the scheduler."""
+    values: Set[int] = set()
+
+    for part in field.split(","):
+        value_range, _, step = part.partition("/")
+
+        if value_range == "*":
+            bounds: List[int] = [lowest, highest]
+        else:
+            bounds = [
+                names.index(bound) + lowest if bound in names else int(bound)
+                for bound in value_range.split("-")
+            ]
+
+            if len(bounds) == 1:
+                bounds.append(highest if step else bounds[0])
+
+        values.update(range(bounds[0], bounds[1] + 1, int(step or 1)))
+
+    return values
+
+
+def get_matcher(cron_expression: str) -> Callable[[datetime], bool]:
+    """Whether a wall clock minute matches a cron expression, as cron defines it."""
+    minute, hour, day, month, weekday = cron_expression.split()
+    minutes: Set[int] = parse_field(minute, 0, 59, [])
+    hours: Set[int] = parse_field(hour, 0, 23, [])
+    days: Set[int] = parse_field(day, 1, 31, [])
+    months: Set[int] = parse_field(month, 1, 12, MONTH_NAMES)
+    weekdays: Set[int] = {
+        value % 7 for value in parse_field(weekday, 0, 7, WEEKDAY_NAMES)
+    }
+    # A day field starting with "*" does not restrict the day
+    is_either_day: bool = not day.startswith("*") and not weekday.startswith("*")
+
+    def matches(wall_clock: datetime) -> bool:
+        if (
+            wall_clock.minute not in minutes
+            or wall_clock.hour not in hours
+            or wall_clock.month not in months
+        ):
+            return False
+
+        matches_day: bool = wall_clock.day in days
+        matches_weekday: bool = (wall_clock.weekday() + 1) % 7 in weekdays
+
+        if is_either_day:
+            return matches_day or matches_weekday
+
+        return matches_day and matches_weekday
+
+    return matches
+
+
+def brute_force_next_run(
+    cron_expression: str, after: datetime, zone: ZoneInfo
+) -> datetime | None:
+    """
+    Step through every wall clock minute after a date. A minute inside a DST gap runs
+    at its instant with the offset before the gap, a repeated minute only runs on its
+    first occurrence.
+    """
+
+    matches: Callable[[datetime], bool] = get_matcher(cron_expression)
+    after_timestamp: float = after.timestamp()
+    wall_clock: datetime = after.astimezone(zone).replace(
+        tzinfo=None, second=0, microsecond=0
+    )
+
+    for _ in range(SEARCH_MINUTES):
+        wall_clock += timedelta(minutes=1)
+        if not matches(wall_clock):
+            continue
+
+        run_date: datetime = wall_clock.replace(tzinfo=zone)
+
+        if run_date.timestamp() > after_timestamp:
+            return run_date
+
+    return None
+
+
+def random_field(
+    random: Random, lowest: int, highest: int, names: List[str] | None = None
+) -> str:
+    """A random cron field of any of the supported forms."""
+    start: int = random.randint(lowest, highest)
+    end: int = random.randint(start, highest)
+    forms: List[str] = [
+        "*",
+        str(start),
+        f"{start}-{end}",
+        f"*/{random.randint(1, 12)}",
+        f"{start}/{random.randint(1, 12)}",
+        f"{start}-{end}/{random.randint(1, 4)}",
+        f"{start},{end}",
+    ]
+
+    if names:
+        forms.append(names[start - lowest] if start - lowest < len(names) else "*")
+
+    return random.choice(forms)
+
+
+def random_cron_expression(random: Random) -> str:
+    return " ".join(
+        [
+            random_field(random, 0, 59),
+            random_field(random, 0, 23),
+            random.choice(["*", "*", random_field(random, 1, 31)]),
+            random.choice(["*", "*", "*", random_field(random, 1, 12, MONTH_NAMES)]),
+            random.choice(["*", random_field(random, 0, 7, WEEKDAY_NAMES)]),
+        ]
+    )
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_cron_against_brute_force(seed):
+    random = Random(seed)
+    cron_expression: str = random_cron_expression(random)
+    zone = ZoneInfo(random.choice(TIMEZONES))
+    # Around the DST transitions of both hemispheres
+    after: datetime = datetime(
+        2026, random.choice([3, 4, 10, 11]), 1, tzinfo=timezone.utc
+    ) + timedelta(minutes=random.randint(0, 14 * 24 * 60), seconds=random.random())
+    scheduler: RoutineScheduler = RoutineScheduler.from_cron(cron_expression, zone)
+    expected: datetime | None = brute_force_next_run(cron_expression, after, zone)
+    next_run: datetime = scheduler.get_next_run_date(after)
+
+    if expected is None:
+        assert next_run.timestamp() > after.timestamp() + SEARCH_MINUTES * 60
+    else:
+        assert next_run.timestamp() == expected.timestamp(), cron_expression
+        assert next_run.replace(tzinfo=None) == expected.replace(tzinfo=None)
+
+
+@pytest.mark.parametrize("timezone_name", TIMEZONES)
+@pytest.mark.parametrize(
+    "cron_expression", ["*/7 * * * *", "30 1,2 * * *", "0 2 * * sun", "15 0-3 8 * 0"]
+)
+def test_consecutive_runs_across_dst(cron_expression, timezone_name):
+    zone = ZoneInfo(timezone_name)
+    scheduler: RoutineScheduler = RoutineScheduler.from_cron(cron_expression, zone)
+
+    for month in (3, 10, 11):
+        after: datetime = datetime(2026, month, 1, tzinfo=timezone.utc)
+
+        for _ in range(20):
+            next_run: datetime = scheduler.get_next_run_date(after)
+            expected: datetime | None = brute_force_next_run(
+                cron_expression, after, zone
+            )
+            assert expected is not None
+            assert next_run.timestamp() == expected.timestamp()
+            after = next_run
+
+
+def test_dst_gap_runs_once_the_clock_jumped():
+    zone = ZoneInfo("America/New_York")
+    scheduler: RoutineScheduler = RoutineScheduler.from_cron("30 2 * * *", zone)
+    next_run: datetime = scheduler.get_next_run_date(datetime(2026, 3, 8, tzinfo=zone))
+
+    # 02:30 does not exist on 2026/03/08, the run is at 03:30 EDT
+    assert (
+        next_run.timestamp()
+        == datetime(2026, 3, 8, 7, 30, tzinfo=timezone.utc).timestamp()
+    )
+
+
+def test_repeated_hour_runs_once():
+    zone = ZoneInfo("America/New_York")
+    scheduler: RoutineScheduler = RoutineScheduler.from_cron("30 1 * * *", zone)
+    first_run: datetime = scheduler.get_next_run_date(
+        datetime(2026, 11, 1, tzinfo=zone)
+    )
+
+    assert (
+        first_run.timestamp()
+        == datetime(2026, 11, 1, 5, 30, tzinfo=timezone.utc).timestamp()
+    )
+    # 01:30 EST repeats the hour an hour later, the next run is the next day
+    assert scheduler.get_next_run_date(first_run) == datetime(
+        2026, 11, 2, 1, 30, tzinfo=zone
+    )
+
+
+@pytest.mark.parametrize("weekday", list(WeekdayMapper))
+def test_weekday_schedule(weekday):
+    zone = ZoneInfo("Europe/London")
+    scheduler = RoutineScheduler(weekday.value, 3, timezone=zone)
+    after: datetime = datetime(2026, 10, 18, 12, tzinfo=zone)
+
+    for _ in range(10):
+        next_run: datetime = scheduler.get_next_run_date(after)
+        assert next_run.weekday() == weekday.value
+        assert (next_run.hour, next_run.minute) == (3, 0)
+        assert timedelta(0) < next_run - after <= timedelta(days=7)
+        after = next_run
+
+
+@pytest.mark.parametrize(
+    "cron_expression", ["0 0 30 2 *", "0 0 31 4,6,9,11 *", "0 0 31 feb-apr/2 *"]
+)
+def test_expression_that_never_fires(cron_expression):
+    with pytest.raises(ValueError, match="never fires"):
+        RoutineScheduler.from_cron(cron_expression)
+
+
+@pytest.mark.parametrize(
+    "cron_expression",
+    [
+        "0 0 * *",
+        "60 * * * *",
+        "* * 0 * *",
+        "*/0 * * * *",
+        "a * * * *",
+        "1- * * * *",
+        "0 0 1-/2 * *",
+        "0 0 * * mon-",
+    ],
+)
+def test_invalid_expression(cron_expression):
+    with pytest.raises(ValueError):
+        RoutineScheduler.from_cron(cron_expression)
+
+
+def test_stepped_wildcard_day_fields_are_anded():
+    # Odd days of the month that are also Mondays, not odd days or Mondays
+    scheduler: RoutineScheduler = RoutineScheduler.from_cron("0 0 */2 * mon", "UTC")
+    run_date: datetime = datetime(2026, 10, 18, tzinfo=timezone.utc)
+
+    for _ in range(5):
+        run_date = scheduler.get_next_run_date(run_date)
+
+        assert run_date.day % 2 == 1
+        assert run_date.weekday() == 0
+
+
+def test_leap_day():
+    scheduler: RoutineScheduler = RoutineScheduler.from_cron("0 0 29 2 *", "UTC")
+
+    assert scheduler.get_next_run_date(
+        datetime(2026, 10, 18, tzinfo=timezone.utc)
+    ) == datetime(2028, 2, 29, tzinfo=ZoneInfo("UTC"))
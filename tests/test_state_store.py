@@ -0,0 +1,111 @@
+"""
+file_name = test_state_store.py
+Created On: 2026/10/18
+Lasted Updated: 2026/10/18
+Description: Tests of the sqlite state store shared by the routines.
+Edit Log:
+2026/10/18
+    - Created file
+"""
+
+# STANDARD LIBRARY IMPORTS
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from sqlite3 import connect
+
+# THIRD PARTY LIBRARY IMPORTS
+import pytest
+
+# LOCAL LIBRARY IMPORTS
+from src.routines import state_store as state_store_module
+from src.routines.state_store import StateStore
+
+
+@pytest.fixture(name="state_store")
+def fixture_state_store(tmp_path: Path) -> StateStore:
+    return StateStore(tmp_path / "state" / "state.sqlite3")
+
+
+def test_values(state_store: StateStore):
+    assert state_store.get_value("routine", "key") is None
+    assert state_store.get_value("routine", "key", {}) == {}
+
+    state_store.set_value("routine", "key", {"head": "abc", "runs": [1, 2]})
+    state_store.set_value("other", "key", 1)
+    state_store.set_value("routine", "key", {"head": "def"})
+
+    assert state_store.get_value("routine", "key") == {"head": "def"}
+    assert state_store.get_value("other", "key") == 1
+
+
+def test_values_persist(tmp_path: Path, state_store: StateStore):
+    state_store.set_value("routine", "key", "value")
+    state_store.close()
+
+    reopened_state_store = StateStore(tmp_path / "state" / "state.sqlite3")
+
+    assert reopened_state_store.get_value("routine", "key") == "value"
+
+
+def test_wal_mode(tmp_path: Path, state_store: StateStore):
+    state_store.set_value("routine", "key", "value")
+
+    with connect(tmp_path / "state" / "state.sqlite3") as connection:
+        assert connection.execute("PRAGMA journal_mode").fetchone() == ("wal",)
+
+
+def test_file_index(state_store: StateStore):
+    state_store.update_file_index(
+        "vault",
+        {
+            "A.md": {"mtime": 1.0, "size": 10, "data": {"links": ["B"]}},
+            "B.md": {"mtime": 2.0, "size": 20, "data": {"links": []}},
+        },
+    )
+    state_store.update_file_index("other", {"A.md": {"mtime": 1, "size": 1, "data": 1}})
+    state_store.update_file_index(
+        "vault", {"A.md": {"mtime": 3.0, "size": 30, "data": {"links": []}}}, ["B.md"]
+    )
+
+    assert state_store.load_file_index("vault") == {
+        "A.md": {"mtime": 3.0, "size": 30, "data": {"links": []}}
+    }
+
+    state_store.clear_file_index("vault")
+
+    assert state_store.load_file_index("vault") == {}
+    assert list(state_store.load_file_index("other")) == ["A.md"]
+
+
+def test_run_history(state_store: StateStore, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(state_store_module, "RUN_HISTORY_LIMIT", 3)
+
+    for index in range(4):
+        state_store.record_run("routine", index, 0.5, True)
+
+    state_store.record_run("routine", 4, 0.5, False, "Failed")
+
+    state_store.record_run("other", 0, 1, True)
+
+    assert state_store.get_run_history("routine") == [
+        {"started_at": 4, "duration": 0.5, "succeeded": False, "error": "Failed"},
+        {"started_at": 3, "duration": 0.5, "succeeded": True, "error": None},
+        {"started_at": 2, "duration": 0.5, "succeeded": True, "error": None},
+    ]
+    assert len(state_store.get_run_history("routine", limit=1)) == 1
+    assert len(state_store.get_run_history("other")) == 1
+
+
+def test_threads_write_concurrently(state_store: StateStore):
+    def write(index: int) -> None:
+        for run_index in range(20):
+            state_store.set_value("threads", f"{index}-{run_index}", run_index)
+            state_store.record_run(f"routine-{index}", run_index, 0, True)
+
+        state_store.close()
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        list(executor.map(write, range(4)))
+
+    assert state_store.get_value("threads", "3-19") == 19
+    assert len(state_store.get_run_history("routine-0", limit=100)) == 20